@@ -0,0 +1,3 @@
+# backtester/__init__.py
+
+__version__ = "1.0.0"
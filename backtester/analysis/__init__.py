@@ -1,5 +1,22 @@
 # backtester/analysis/__init__.py
+from .compare import Divergence, RunDiff, compare_cached, compare_runs
 from .metrics import compute_metrics
 from .plots import plot_equity_and_drawdown
+from .report import ReportData, build_report, render_report, render_report_async
+from .run_cache import CachedRun, RunCache, run_key
 
-__all__ = ["compute_metrics", "plot_equity_and_drawdown"]
+__all__ = [
+    "Divergence",
+    "RunDiff",
+    "compare_cached",
+    "compare_runs",
+    "compute_metrics",
+    "plot_equity_and_drawdown",
+    "ReportData",
+    "build_report",
+    "render_report",
+    "render_report_async",
+    "CachedRun",
+    "RunCache",
+    "run_key",
+]
@@ -0,0 +1,407 @@
+# backtester/analysis/compare.py
+
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from backtester.analysis.metrics import BacktestMetrics
+from backtester.analysis.run_cache import CachedRun, RunCache, as_ns
+from backtester.core.journal import JournalReader
+from backtester.events import to_iso
+
+_EVENT_FIELDS = (
+    "ts",
+    "type",
+    "side",
+    "order_type",
+    "symbol_id",
+    "f0",
+    "f1",
+    "f2",
+    "f3",
+    "f4",
+)
+
+
+@dataclass(frozen=True, slots=True)
+class Divergence:
+    """
+    The first point where two runs disagree:
+    - "equity": a column differs on a bar both runs have (`field` names the column)
+    - "bars": the bar timestamps differ (one run has a bar the other lacks)
+    - "trade": a ledger row differs, or one ledger has more fills
+    - "event": a journal record differs (the signal/order/fill that set it off)
+    index is the row in run a; ts is epoch ns.
+    """
+
+    kind: str
+    index: int
+    ts: int | None
+    field: str
+    a: Any
+    b: Any
+
+    def __str__(self) -> str:
+        when = "-" if self.ts is None else to_iso(self.ts)
+        return f"{self.kind} #{self.index} @ {when}: {self.field} a={self.a!r} b={self.b!r}"
+
+
+@dataclass
+class RunDiff:
+    """
+    compare_runs() result: the first divergence per layer (None = no difference there).
+    """
+
+    equity: Divergence | None = None
+    trade: Divergence | None = None
+    event: Divergence | None = None
+    # differing metrics only
+    metrics: dict[str, tuple[float, float]] = field(default_factory=dict)
+    only_a: int = 0  # equity rows outside the runs' common time range
+    only_b: int = 0
+    chunks_total: int = 0
+    chunks_skipped: int = 0  # equal by stored fingerprint, never compared
+
+    @property
+    def identical(self) -> bool:
+        return (
+            self.equity is None
+            and self.trade is None
+            and self.event is None
+            and not self.metrics
+            and not self.only_a
+            and not self.only_b
+        )
+
+    @property
+    def cause(self) -> Divergence | None:
+        """
+        The earliest event / trade divergence at or before the first divergent bar
+        (an event wins a tie: its order precedes the fill).
+        """
+        found = [
+            d for d in (self.event, self.trade) if d is not None and d.ts is not None
+        ]
+        if self.equity is not None and self.equity.ts is not None:
+            found = [d for d in found if d.ts <= self.equity.ts] or found
+        return min(found, key=lambda d: d.ts, default=None)
+
+    def report(self) -> str:
+        if self.identical:
+            return f"identical ({self.chunks_skipped}/{self.chunks_total} equity chunks matched by fingerprint)"
+        lines = []
+        if self.equity is not None:
+            lines.append(f"first divergent bar: {self.equity}")
+        if self.cause is not None:
+            lines.append(f"caused by:           {self.cause}")
+        for d in (self.trade, self.event):
+            if d is not None and d is not self.cause:
+                lines.append(f"first divergent {d.kind}: {d}")
+        if self.only_a or self.only_b:
+            lines.append(
+                f"rows outside the common range: a={self.only_a} b={self.only_b}"
+            )
+        for k, (x, y) in self.metrics.items():
+            lines.append(f"{k}: {x:.6g} -> {y:.6g} ({y - x:+.3g})")
+        if self.chunks_total:
+            lines.append(
+                f"equity chunks skipped by fingerprint: {self.chunks_skipped}/{self.chunks_total}"
+            )
+        return "\n".join(lines)
+
+
+def _differs(a: np.ndarray, b: np.ndarray, rtol: float, atol: float) -> np.ndarray:
+    if a.dtype.kind == "f" or b.dtype.kind == "f":
+        return ~np.isclose(a, b, rtol=rtol, atol=atol, equal_nan=True)
+    return a != b
+
+
+def _first(mask: np.ndarray) -> int:
+    # index of the first True, or -1
+    if not len(mask):
+        return -1
+    i = int(np.argmax(mask))
+    return i if mask[i] else -1
+
+
+def _item(x: Any) -> Any:
+    return x.item() if isinstance(x, np.generic) else x
+
+
+def _fingerprint_rows(fp_a: dict | None, fp_b: dict | None) -> tuple[int, int]:
+    # leading rows whose chunk hashes match: (rows, chunks)
+    if fp_a is None or fp_b is None or fp_a["chunk"] != fp_b["chunk"]:
+        return 0, 0
+    same = 0
+    for x, y in zip(fp_a["equity"], fp_b["equity"], strict=False):
+        if x != y:
+            break
+        same += 1
+    return same * fp_a["chunk"], same
+
+
+def equity_divergence(
+    a: pd.DataFrame,
+    b: pd.DataFrame,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+    fingerprints: tuple[dict | None, dict | None] = (None, None),
+) -> tuple[Divergence | None, int, int, int]:
+    """
+    First divergent bar of two equity curves, aligned on their common time range
+    and then row by row (runs append rows in the same order, several per timestamp
+    for per-symbol feeds). Returns (divergence, rows only in a, rows only in b,
+    chunks skipped). With both runs' stored fingerprints, leading chunks whose
+    hashes match are skipped without comparing them.
+    """
+    ts_a, ts_b = as_ns(a.index.to_numpy()), as_ns(b.index.to_numpy())
+    if not len(ts_a) or not len(ts_b):
+        return None, len(ts_a), len(ts_b), 0
+
+    lo, hi = max(ts_a[0], ts_b[0]), min(ts_a[-1], ts_b[-1])
+    a0, a1 = np.searchsorted(ts_a, lo, "left"), np.searchsorted(ts_a, hi, "right")
+    b0, b1 = np.searchsorted(ts_b, lo, "left"), np.searchsorted(ts_b, hi, "right")
+    only_a, only_b = len(ts_a) - (a1 - a0), len(ts_b) - (b1 - b0)
+
+    skip, skipped = _fingerprint_rows(*fingerprints) if a0 == b0 == 0 else (0, 0)
+    n = min(a1 - a0, b1 - b0)
+    skip = min(skip, n)
+    sa, sb = slice(a0 + skip, a0 + n), slice(b0 + skip, b0 + n)
+
+    k_ts = _first(ts_a[sa] != ts_b[sb])
+    m = n - skip if k_ts < 0 else k_ts
+    best, col = m, None
+    columns = [c for c in a.columns if c in b.columns]
+    columns.sort(key=lambda c: c != "equity")  # equity wins a tie
+    for c in columns:
+        k = _first(
+            _differs(a[c].to_numpy()[sa][:best], b[c].to_numpy()[sb][:best], rtol, atol)
+        )
+        if k >= 0:
+            best, col = k, c
+
+    if col is not None:
+        i, j = a0 + skip + best, b0 + skip + best
+        div = Divergence(
+            "equity", i, int(ts_a[i]), col, _item(a[col].iloc[i]), _item(b[col].iloc[j])
+        )
+    elif k_ts >= 0:
+        i, j = a0 + skip + k_ts, b0 + skip + k_ts
+        div = Divergence(
+            "bars",
+            i,
+            int(min(ts_a[i], ts_b[j])),
+            "ts",
+            to_iso(int(ts_a[i])),
+            to_iso(int(ts_b[j])),
+        )
+    elif a1 - a0 != b1 - b0:
+        i = a0 + n
+        extra = ts_a[i] if a1 - a0 > n else ts_b[b0 + n]
+        div = Divergence("bars", i, int(extra), "rows", int(a1 - a0), int(b1 - b0))
+    else:
+        div = None
+    return div, int(only_a), int(only_b), skipped
+
+
+def trade_divergence(
+    a: dict[str, np.ndarray] | None,
+    b: dict[str, np.ndarray] | None,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> Divergence | None:
+    """
+    First differing fill of two ledgers (TradeLedger.to_arrays() columns).
+    """
+    if a is None or b is None:
+        return None
+    columns = [c for c in a if c in b]
+    if not columns:
+        return None
+    na, nb = len(a[columns[0]]), len(b[columns[0]])
+    best, col = min(na, nb), None
+    for c in columns:
+        k = _first(_differs(a[c][:best], b[c][:best], rtol, atol))
+        if k >= 0:
+            best, col = k, c
+
+    if col is not None:
+        ts = int(a["ts"][best]) if "ts" in a else None
+        return Divergence(
+            "trade", best, ts, col, _item(a[col][best]), _item(b[col][best])
+        )
+    if na != nb:
+        longer = a if na > nb else b
+        ts = int(longer["ts"][best]) if "ts" in longer else None
+        return Divergence("trade", best, ts, "rows", na, nb)
+    return None
+
+
+def _reader(journal: str | Path | JournalReader) -> JournalReader:
+    return journal if isinstance(journal, JournalReader) else JournalReader(journal)
+
+
+def event_divergence(
+    a: str | Path | JournalReader,
+    b: str | Path | JournalReader,
+    end=None,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> Divergence | None:
+    """
+    First differing record of two event journals with ts < end (None = all).
+    Symbols are compared by name, so the journals' symbol ids need not agree.
+    """
+    a, b = _reader(a), _reader(b)
+    ra, rb = a.query(end=end), b.query(end=end)
+    n = min(len(ra), len(rb))
+
+    # b's symbol ids in a's id space (-1 = unknown to a)
+    remap = np.array(
+        [a.symbols.index(s) if s in a.symbols else -1 for s in b.symbols] or [-1],
+        dtype=np.int64,
+    )
+    best, col = n, None
+    for c in _EVENT_FIELDS:
+        x, y = ra[c][:best], rb[c][:best]
+        if c == "symbol_id":
+            x, y = x.astype(np.int64), remap[y]
+        k = _first(_differs(x, y, rtol, atol))
+        if k >= 0:
+            best, col = k, c
+
+    if col is None and len(ra) == len(rb):
+        return None
+    ev_a = next(a.events(ra[best : best + 1]), None)
+    ev_b = next(b.events(rb[best : best + 1]), None)
+    ts = (ev_a or ev_b).ts
+    return Divergence(
+        "event",
+        best,
+        int(ts),
+        "symbol" if col == "symbol_id" else col or "rows",
+        ev_a,
+        ev_b,
+    )
+
+
+def metric_deltas(
+    a: BacktestMetrics,
+    b: BacktestMetrics,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> dict[str, tuple[float, float]]:
+    mb = asdict(b)
+    return {
+        k: (x, mb[k])
+        for k, x in asdict(a).items()
+        if not np.isclose(x, mb[k], rtol=rtol, atol=atol, equal_nan=True)
+    }
+
+
+def compare_runs(
+    a: CachedRun,
+    b: CachedRun,
+    journal_a: str | Path | JournalReader | None = None,
+    journal_b: str | Path | JournalReader | None = None,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+    fingerprints: tuple[dict | None, dict | None] = (None, None),
+) -> RunDiff:
+    """
+    Diff two runs: equity curves (first divergent bar), trade ledgers, metrics and,
+    with both journals, the events, looked up only up to the first divergent bar.
+    """
+    div, only_a, only_b, skipped = equity_divergence(
+        a.equity_curve, b.equity_curve, rtol, atol, fingerprints
+    )
+    diff = RunDiff(
+        equity=div,
+        trade=trade_divergence(a.trades, b.trades, rtol, atol),
+        metrics=metric_deltas(a.metrics, b.metrics, rtol, atol),
+        only_a=only_a,
+        only_b=only_b,
+        chunks_total=len(fingerprints[0]["equity"]) if fingerprints[0] else 0,
+        chunks_skipped=skipped,
+    )
+    if journal_a is not None and journal_b is not None:
+        end = None if div is None or div.ts is None else div.ts + 1
+        diff.event = event_divergence(journal_a, journal_b, end, rtol, atol)
+    return diff
+
+
+def compare_cached(
+    cache: RunCache,
+    key_a: str,
+    key_b: str,
+    cache_b: RunCache | None = None,
+    journal_a: str | Path | JournalReader | None = None,
+    journal_b: str | Path | JournalReader | None = None,
+    rtol: float = 1e-9,
+    atol: float = 1e-9,
+) -> RunDiff:
+    """
+    compare_runs() on two RunCache entries. When the stored fingerprints (equity
+    chunks + trades) and metrics all match, neither run's arrays are loaded.
+    """
+    cache_b = cache if cache_b is None else cache_b
+    for c, key in ((cache, key_a), (cache_b, key_b)):
+        if key not in c:
+            raise FileNotFoundError(f"No cached run {key!r} under {c.root}")
+    fp_a, fp_b = cache.fingerprints(key_a), cache_b.fingerprints(key_b)
+    deltas = metric_deltas(cache.metrics(key_a), cache_b.metrics(key_b), rtol, atol)
+
+    if fp_a is not None and fp_a == fp_b and not deltas:
+        n = len(fp_a["equity"])
+        diff = RunDiff(chunks_total=n, chunks_skipped=n)
+        if journal_a is not None and journal_b is not None:
+            diff.event = event_divergence(journal_a, journal_b, None, rtol, atol)
+        return diff
+
+    return compare_runs(
+        cache.get(key_a),
+        cache_b.get(key_b),
+        journal_a,
+        journal_b,
+        rtol,
+        atol,
+        fingerprints=(fp_a, fp_b),
+    )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Compare two cached runs; exit status 1 if they diverge."
+    )
+    ap.add_argument("a", help="run directory (<cache root>/<run key>)")
+    ap.add_argument("b")
+    ap.add_argument("--journal-a", default=None)
+    ap.add_argument("--journal-b", default=None)
+    ap.add_argument("--rtol", type=float, default=1e-9)
+    ap.add_argument("--atol", type=float, default=1e-9)
+    args = ap.parse_args()
+
+    a, b = Path(args.a), Path(args.b)
+    diff = compare_cached(
+        RunCache(a.parent),
+        a.name,
+        b.name,
+        cache_b=RunCache(b.parent),
+        journal_a=args.journal_a,
+        journal_b=args.journal_b,
+        rtol=args.rtol,
+        atol=args.atol,
+    )
+    print(diff.report())
+    sys.exit(0 if diff.identical else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# backtester/analysis/downsample.py
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Indices of a min/max decimation of y to ~n_out points.
+
+    Interior points are split into equal buckets and each bucket keeps its min and
+    its max (in time order), so spikes and drawdown troughs survive; the first and
+    last points are always kept. Fully vectorized.
+    """
+    y = np.asarray(y)
+    n = len(y)
+    if n <= n_out or n_out < 4:
+        return np.arange(n)
+
+    n_buckets = (n_out - 2) // 2
+    width = -(-(n - 2) // n_buckets)
+    # pad the last bucket by repeating the final interior index
+    idx = np.minimum(np.arange(1, 1 + n_buckets * width), n - 2).reshape(
+        n_buckets, width
+    )
+    vals = y[idx]
+    rows = np.arange(n_buckets)
+    lo = idx[rows, np.argmin(vals, axis=1)]
+    hi = idx[rows, np.argmax(vals, axis=1)]
+    return np.unique(np.concatenate(([0], lo, hi, [n - 1])))
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: per bucket, keep the point forming the largest
+    triangle with the previously kept point and the next bucket's average.
+    One vectorized step per output point.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n <= n_out or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)  # n_out - 2 buckets
+    out = np.empty(n_out, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            avg_x, avg_y = x[nxt].mean(), y[nxt].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def downsample_indices(
+    x: np.ndarray, y: np.ndarray, n_out: int, method: str = "minmax"
+) -> np.ndarray:
+    if method == "minmax":
+        return minmax_indices(y, n_out)
+    if method == "lttb":
+        return lttb_indices(x, y, n_out)
+    raise ValueError(f"Unknown downsample method: {method!r} (use 'minmax' or 'lttb').")
+
+
+def downsample_series(s: pd.Series, n_out: int, method: str = "minmax") -> pd.Series:
+    """
+    Display copy of a time-indexed series with at most ~n_out points.
+    """
+    if len(s) <= n_out:
+        return s
+    x = np.arange(len(s)) if method == "minmax" else s.index.asi8
+    return s.iloc[downsample_indices(x, s.to_numpy(), n_out, method)]
@@ -1,8 +1,10 @@
 # backtester/analysis/metrics.py
 from dataclasses import dataclass
+
 import numpy as np
 import pandas as pd
 
+
 @dataclass
 class BacktestMetrics:
     total_return: float
@@ -10,15 +12,22 @@ class BacktestMetrics:
     volatility: float
     sharpe: float
 
+
 def compute_drawdown(equity: pd.Series) -> pd.Series:
     running_max = equity.cummax()
     drawdown = equity / running_max - 1.0
     return drawdown
 
-def compute_metrics(equity_curve: pd.DataFrame, periods_per_year: int = 252) -> BacktestMetrics:
+
+def compute_metrics(
+    equity_curve: pd.DataFrame,
+    periods_per_year: int = 252,
+    drawdown: pd.Series | None = None,
+) -> BacktestMetrics:
     """
     equity_curve: DataFrame indexed by timestamp with column 'equity'
     periods_per_year: for daily bars use 252; for minute bars use ~252*390
+    drawdown: precomputed compute_drawdown(equity), to skip recomputing it
     """
     equity = equity_curve["equity"].astype(float)
 
@@ -29,7 +38,7 @@ def compute_metrics(equity_curve: pd.DataFrame, periods_per_year: int = 252) ->
     total_return = float(equity.iloc[-1] / equity.iloc[0] - 1.0)
 
     # drawdown
-    dd = compute_drawdown(equity)
+    dd = compute_drawdown(equity) if drawdown is None else drawdown
     max_drawdown = float(dd.min())  # negative number, e.g., -0.23
 
     # volatility (annualized)
@@ -1,10 +1,26 @@
 # backtester/analysis/plots.py
 import matplotlib.pyplot as plt
+import pandas as pd
+
+from .downsample import downsample_series
 from .metrics import compute_drawdown
 
-def plot_equity_and_drawdown(equity_curve, out_dir: str = "outputs"):
+
+def plot_equity_and_drawdown(
+    equity_curve,
+    out_dir: str = "outputs",
+    drawdown: pd.Series | None = None,
+    max_points: int | None = 4_000,
+):
+    """
+    max_points: series longer than this are min/max-decimated before plotting
+    (None plots every point). drawdown: precomputed, to skip recomputing it.
+    """
     equity = equity_curve["equity"]
-    dd = compute_drawdown(equity)
+    dd = compute_drawdown(equity) if drawdown is None else drawdown
+    if max_points is not None:
+        equity = downsample_series(equity, max_points)
+        dd = downsample_series(dd, max_points)
 
     # Equity curve
     plt.figure()
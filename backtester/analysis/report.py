@@ -0,0 +1,278 @@
+# backtester/analysis/report.py
+
+from __future__ import annotations
+
+import base64
+import html
+import multiprocessing
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtester.analysis.downsample import downsample_indices
+from backtester.analysis.metrics import BacktestMetrics, compute_metrics
+from backtester.portfolio.ledger import TradeLedger
+
+
+@dataclass(frozen=True)
+class ReportData:
+    """
+    Every derived series of a run, computed once (all bar-aligned with ts, epoch ns).
+    Plain arrays, so it pickles cheaply to a rendering process.
+    """
+
+    ts: np.ndarray
+    equity: np.ndarray
+    drawdown: np.ndarray
+    rolling_sharpe: np.ndarray
+    exposure: np.ndarray  # (equity - cash) / equity
+    metrics: BacktestMetrics
+    price: np.ndarray | None = None
+    fill_ts: np.ndarray | None = None
+    fill_price: np.ndarray | None = None
+    fill_side: np.ndarray | None = None  # +1 BUY, -1 SELL
+    trade_pnl: np.ndarray | None = None  # closed round trips, net of fees
+    sharpe_window: int = 390
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def downsampled(self, max_points: int, method: str = "minmax") -> ReportData:
+        """
+        Display copy: bar-aligned series decimated on the equity curve's extremes,
+        with the drawdown trough kept as well. Fills and trade PnL are untouched.
+        """
+        if len(self) <= max_points:
+            return self
+        idx = downsample_indices(self.ts, self.equity, max_points // 2, method)
+        idx = np.union1d(
+            idx, downsample_indices(self.ts, self.drawdown, max_points // 2, method)
+        )
+        pick = {
+            name: getattr(self, name)[idx]
+            for name in ("ts", "equity", "drawdown", "rolling_sharpe", "exposure")
+        }
+        if self.price is not None:
+            pick["price"] = self.price[idx]
+        return replace(self, **pick)
+
+
+def rolling_sharpe(
+    equity: np.ndarray, window: int, periods_per_year: float
+) -> np.ndarray:
+    """
+    Annualized Sharpe of the trailing `window` bar returns (NaN until filled), via cumsums.
+    """
+    out = np.full(len(equity), np.nan)
+    if window < 2 or len(equity) <= window:
+        return out
+    r = equity[1:] / equity[:-1] - 1.0
+    c1 = np.cumsum(np.r_[0.0, r])
+    c2 = np.cumsum(np.r_[0.0, r * r])
+    s1 = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    mean = s1 / window
+    var = np.maximum((s2 - s1 * mean) / (window - 1), 0.0)
+    sd = np.sqrt(var)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out[window:] = np.where(sd > 1e-15, mean / sd * np.sqrt(periods_per_year), 0.0)
+    return out
+
+
+def build_report(
+    equity_curve: pd.DataFrame,
+    periods_per_year: float = 252,
+    ledger: TradeLedger | None = None,
+    price: pd.Series | np.ndarray | None = None,
+    sharpe_window: int = 390,
+) -> ReportData:
+    """
+    One vectorized pass over a run's outputs (Portfolio.equity_curve_df() + ledger).
+    price: bar-aligned close series for the trade-marker chart (optional).
+    """
+    equity = equity_curve["equity"].to_numpy(dtype=np.float64)
+    ts = (
+        equity_curve.index.as_unit("ns").asi8
+        if isinstance(equity_curve.index, pd.DatetimeIndex)
+        else (np.arange(len(equity), dtype=np.int64))
+    )
+
+    peak = np.maximum.accumulate(equity)
+    drawdown = equity / peak - 1.0
+    metrics = compute_metrics(
+        equity_curve,
+        periods_per_year=periods_per_year,
+        drawdown=pd.Series(drawdown, index=equity_curve.index),
+    )
+
+    if "cash" in equity_curve:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            exposure = (
+                equity - equity_curve["cash"].to_numpy(dtype=np.float64)
+            ) / equity
+    else:
+        exposure = np.full(len(equity), np.nan)
+
+    fills = {}
+    trade_pnl = None
+    if ledger is not None:
+        cols = ledger.to_arrays()
+        fills = {
+            "fill_ts": cols["ts"].copy(),
+            "fill_price": cols["price"].copy(),
+            "fill_side": cols["side"].copy(),
+        }
+        trade_pnl = ledger.round_trips()["pnl"]
+
+    px = None
+    if price is not None:
+        px = np.asarray(price, dtype=np.float64)
+        if len(px) != len(equity):
+            raise ValueError(
+                "build_report: price must be bar-aligned with the equity curve."
+            )
+
+    return ReportData(
+        ts=ts,
+        equity=equity,
+        drawdown=drawdown,
+        rolling_sharpe=rolling_sharpe(equity, sharpe_window, periods_per_year),
+        exposure=exposure,
+        metrics=metrics,
+        price=px,
+        trade_pnl=trade_pnl,
+        sharpe_window=sharpe_window,
+        **fills,
+    )
+
+
+def _render_png(data: ReportData, path: Path, bins: int) -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    t = data.ts.astype("datetime64[ns]")
+    panels = 4 + (data.price is not None)
+    fig, axes = plt.subplots(panels, 1, figsize=(11, 2.6 * panels))
+
+    axes[0].plot(t, data.equity, lw=0.8)
+    axes[0].set_title("Equity")
+    axes[1].fill_between(t, data.drawdown, 0.0, color="tab:red", alpha=0.5, lw=0)
+    axes[1].set_title("Drawdown")
+    axes[2].plot(t, data.exposure, lw=0.8, color="tab:green")
+    axes[2].set_title("Exposure (position value / equity)")
+    axes[3].plot(t, data.rolling_sharpe, lw=0.8, color="tab:purple")
+    axes[3].set_title(f"Rolling Sharpe ({data.sharpe_window} bars)")
+
+    if data.price is not None:
+        ax = axes[4]
+        ax.plot(t, data.price, lw=0.8, color="0.3")
+        ax.set_title("Price and fills")
+        if data.fill_ts is not None and len(data.fill_ts):
+            ft = data.fill_ts.astype("datetime64[ns]")
+            buy = data.fill_side > 0
+            ax.scatter(
+                ft[buy],
+                data.fill_price[buy],
+                marker="^",
+                color="tab:green",
+                s=18,
+                zorder=3,
+            )
+            ax.scatter(
+                ft[~buy],
+                data.fill_price[~buy],
+                marker="v",
+                color="tab:red",
+                s=18,
+                zorder=3,
+            )
+
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+
+    if data.trade_pnl is not None and len(data.trade_pnl):
+        fig, ax = plt.subplots(figsize=(7, 3.5))
+        ax.hist(data.trade_pnl, bins=bins, color="tab:blue", alpha=0.8)
+        ax.set_title("Trade PnL distribution")
+        fig.tight_layout()
+        fig.savefig(path.with_name("pnl_hist.png"), dpi=120)
+        plt.close(fig)
+
+
+def _render_html(data: ReportData, path: Path, images: list[Path]) -> None:
+    rows = "".join(
+        f"<tr><th>{html.escape(k)}</th><td>{v:.4f}</td></tr>"
+        for k, v in asdict(data.metrics).items()
+    )
+    n_trades = 0 if data.trade_pnl is None else len(data.trade_pnl)
+    imgs = "".join(
+        f'<img src="data:image/png;base64,{base64.b64encode(p.read_bytes()).decode()}" alt="{p.stem}"/>'
+        for p in images
+        if p.exists()
+    )
+    path.write_text(
+        "<!doctype html><html><head><meta charset='utf-8'><title>Backtest report</title>"
+        "<style>body{font-family:sans-serif;margin:2em}td,th{padding:2px 12px;text-align:left}"
+        "img{max-width:100%;display:block;margin:1em 0}</style></head><body>"
+        f"<h1>Backtest report</h1><table>{rows}"
+        f"<tr><th>bars</th><td>{len(data)}</td></tr><tr><th>round trips</th><td>{n_trades}</td></tr>"
+        f"</table>{imgs}</body></html>",
+        encoding="utf-8",
+    )
+
+
+def render_report(
+    data: ReportData,
+    out_dir: str | Path = "outputs",
+    max_points: int | None = 4_000,
+    formats: tuple[str, ...] = ("png", "html"),
+    bins: int = 30,
+    legacy_plots: bool = True,
+) -> list[Path]:
+    """
+    Write report.png (+ pnl_hist.png) and/or a self-contained report.html, plus the
+    v1 equity_curve.png / drawdown_curve.png. Long series are min/max-decimated to
+    max_points for display first.
+    """
+    out = Path(out_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    view = data.downsampled(max_points) if max_points is not None else data
+
+    png = out / "report.png"
+    written: list[Path] = []
+    if "png" in formats or "html" in formats:
+        _render_png(view, png, bins)
+        written += [p for p in (png, out / "pnl_hist.png") if p.exists()]
+    if "html" in formats:
+        _render_html(view, out / "report.html", [png, out / "pnl_hist.png"])
+        written.append(out / "report.html")
+    if legacy_plots:
+        from backtester.analysis.plots import plot_equity_and_drawdown
+
+        idx = pd.DatetimeIndex(view.ts.astype("datetime64[ns]"), name="ts")
+        plot_equity_and_drawdown(
+            pd.DataFrame({"equity": view.equity}, index=idx),
+            out_dir=str(out),
+            drawdown=pd.Series(view.drawdown, index=idx),
+            max_points=None,
+        )
+        written += [out / "equity_curve.png", out / "drawdown_curve.png"]
+    return written
+
+
+def render_report_async(
+    data: ReportData, out_dir: str | Path = "outputs", **kwargs
+) -> multiprocessing.Process:
+    """
+    render_report() in a child process; returns the started process (join() to wait).
+    """
+    proc = multiprocessing.Process(
+        target=render_report, args=(data, out_dir), kwargs=kwargs
+    )
+    proc.start()
+    return proc
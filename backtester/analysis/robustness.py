@@ -0,0 +1,260 @@
+# backtester/analysis/robustness.py
+
+from __future__ import annotations
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from backtester.execution.execution_handler import SlippageModel
+
+METRIC_NAMES = ("total_return", "max_drawdown", "volatility", "sharpe")
+
+
+@dataclass(frozen=True)
+class RobustnessResult:
+    """
+    Per-path BacktestMetrics fields (arrays of length n_paths).
+    """
+
+    metrics: dict[str, np.ndarray]
+
+    @property
+    def n_paths(self) -> int:
+        return len(self.metrics["sharpe"])
+
+    def ci(self, name: str, level: float = 0.95) -> tuple[float, float]:
+        a = (1.0 - level) / 2.0
+        lo, hi = np.quantile(self.metrics[name], [a, 1.0 - a])
+        return float(lo), float(hi)
+
+    def summary(self, level: float = 0.95) -> dict[str, tuple[float, float, float]]:
+        """
+        name -> (lower, median, upper)
+        """
+        out = {}
+        for name in METRIC_NAMES:
+            lo, hi = self.ci(name, level)
+            out[name] = (lo, float(np.median(self.metrics[name])), hi)
+        return out
+
+
+def path_metrics(
+    equity: np.ndarray, periods_per_year: int = 252
+) -> dict[str, np.ndarray]:
+    """
+    compute_metrics() over every row of an (n_paths, n_bars) equity matrix at once.
+    """
+    eq = np.asarray(equity, dtype=np.float64)
+    rets = eq[:, 1:] / eq[:, :-1] - 1.0
+    ann = np.sqrt(periods_per_year)
+
+    total_return = eq[:, -1] / eq[:, 0] - 1.0
+    max_drawdown = (eq / np.maximum.accumulate(eq, axis=1) - 1.0).min(axis=1)
+    sd = rets.std(axis=1, ddof=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(sd == 0, 0.0, rets.mean(axis=1) / sd * ann)
+
+    return {
+        "total_return": total_return,
+        "max_drawdown": max_drawdown,
+        "volatility": sd * ann,
+        "sharpe": sharpe,
+    }
+
+
+# ----- path generators: (rng, n_paths, **inputs) -> (n_paths, n_bars) equity -----
+
+
+def _bootstrap_paths(rng, n_paths, equity, block) -> np.ndarray:
+    # circular block bootstrap of bar returns
+    rets = equity[1:] / equity[:-1] - 1.0
+    m = len(rets)
+    n_blocks = -(-m // block)
+    starts = rng.integers(0, m, size=(n_paths, n_blocks))
+    idx = (starts[:, :, None] + np.arange(block)).reshape(n_paths, -1)[:, :m] % m
+    growth = np.cumprod(1.0 + rets[idx], axis=1)
+    out = np.empty((n_paths, m + 1))
+    out[:, 0] = equity[0]
+    out[:, 1:] = equity[0] * growth
+    return out
+
+
+def _slippage_paths(
+    rng, n_paths, equity, traded_qty, price, model, spread_sd
+) -> np.ndarray:
+    # redraw slippage per trade around the model's parameter, clipped at zero
+    trades = np.flatnonzero(traded_qty)
+    q = np.abs(traded_qty[trades])
+    noise = rng.normal(0.0, spread_sd, size=(n_paths, len(trades)))
+    if model.model == "spread":
+        base = float(model.half_spread)
+        extra = (np.maximum(base + noise, 0.0) - base) * q
+    else:
+        base = float(model.bps)
+        extra = (np.maximum(base + noise, 0.0) - base) / 10_000.0 * q * price[trades]
+
+    cost = np.zeros((n_paths, len(equity)))
+    cost[:, trades] = extra
+    return equity[None, :] - np.cumsum(cost, axis=1)
+
+
+def _jitter_paths(rng, n_paths, close, positions, start_equity, max_lag) -> np.ndarray:
+    # shift the whole position schedule by a random lag per path (entries/exits early or late)
+    n = len(close)
+    lags = rng.integers(-max_lag, max_lag + 1, size=n_paths)
+    idx = np.clip(np.arange(n)[None, :] - lags[:, None], 0, n - 1)
+    held = positions[idx]
+    pnl = np.zeros((n_paths, n))
+    pnl[:, 1:] = held[:, :-1] * np.diff(close)[None, :]
+    return start_equity + np.cumsum(pnl, axis=1)
+
+
+_GENERATORS: dict[str, Callable[..., np.ndarray]] = {
+    "bootstrap": _bootstrap_paths,
+    "slippage": _slippage_paths,
+    "jitter": _jitter_paths,
+}
+
+
+def _run_chunk(kind: str, seed_seq, n_paths: int, periods_per_year: int, inputs: dict):
+    rng = np.random.default_rng(seed_seq)
+    paths = _GENERATORS[kind](rng, n_paths, **inputs)
+    return path_metrics(paths, periods_per_year)
+
+
+def _simulate(
+    kind: str,
+    inputs: dict,
+    n_paths: int,
+    seed: int,
+    periods_per_year: int,
+    chunk_paths: int,
+    n_jobs: int,
+) -> RobustnessResult:
+    """
+    Paths are generated in fixed-size chunks, each with its own child of
+    SeedSequence(seed), so results are identical for any n_jobs.
+    """
+    sizes = [min(chunk_paths, n_paths - i) for i in range(0, n_paths, chunk_paths)]
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    args = [
+        (kind, s, k, periods_per_year, inputs)
+        for s, k in zip(seeds, sizes, strict=True)
+    ]
+
+    if n_jobs > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            parts = list(pool.map(_run_chunk, *zip(*args, strict=True)))
+    else:
+        parts = [_run_chunk(*a) for a in args]
+
+    return RobustnessResult(
+        {m: np.concatenate([p[m] for p in parts]) for m in METRIC_NAMES}
+    )
+
+
+def bootstrap_metrics(
+    equity: np.ndarray,
+    n_paths: int = 1_000,
+    block: int = 390,
+    seed: int = 42,
+    periods_per_year: int = 252,
+    chunk_paths: int = 256,
+    n_jobs: int = 1,
+) -> RobustnessResult:
+    """
+    Block-bootstrapped equity paths from a run's bar returns (block ~ one session by default).
+    """
+    eq = np.asarray(equity, dtype=np.float64)
+    if len(eq) < 3:
+        raise ValueError("bootstrap_metrics needs at least 3 equity points.")
+    if block < 1:
+        raise ValueError(f"block must be >= 1, got {block}.")
+    inputs = {"equity": eq, "block": int(block)}
+    return _simulate(
+        "bootstrap", inputs, n_paths, seed, periods_per_year, chunk_paths, n_jobs
+    )
+
+
+def slippage_metrics(
+    equity: np.ndarray,
+    traded_qty: np.ndarray,
+    price: np.ndarray,
+    slippage: SlippageModel,
+    spread_sd: float,
+    n_paths: int = 1_000,
+    seed: int = 42,
+    periods_per_year: int = 252,
+    chunk_paths: int = 256,
+    n_jobs: int = 1,
+) -> RobustnessResult:
+    """
+    Re-price a run's trades with slippage drawn around the SlippageModel parameter
+    (N(param, spread_sd), clipped at zero).
+
+    traded_qty[t] / price[t]: quantity traded and fill reference price on bar t
+    (bar-aligned with equity). spread_sd is in bps for "bps" models, dollars for "spread".
+    """
+    eq = np.asarray(equity, dtype=np.float64)
+    qty = np.asarray(traded_qty, dtype=np.float64)
+    px = np.asarray(price, dtype=np.float64)
+    if not (len(eq) == len(qty) == len(px)):
+        raise ValueError(
+            "equity, traded_qty and price must be bar-aligned (same length)."
+        )
+    inputs = {
+        "equity": eq,
+        "traded_qty": qty,
+        "price": px,
+        "model": slippage,
+        "spread_sd": float(spread_sd),
+    }
+    return _simulate(
+        "slippage", inputs, n_paths, seed, periods_per_year, chunk_paths, n_jobs
+    )
+
+
+def timing_jitter_metrics(
+    close: np.ndarray,
+    positions: np.ndarray,
+    start_equity: float,
+    max_lag: int = 5,
+    n_paths: int = 1_000,
+    seed: int = 42,
+    periods_per_year: int = 252,
+    chunk_paths: int = 256,
+    n_jobs: int = 1,
+) -> RobustnessResult:
+    """
+    Mark-to-market paths with the position schedule shifted by up to +/- max_lag bars.
+    positions[t] is the quantity held after bar t (costs are not re-applied).
+    """
+    c = np.asarray(close, dtype=np.float64)
+    pos = np.asarray(positions, dtype=np.float64)
+    if len(c) != len(pos):
+        raise ValueError("close and positions must be bar-aligned (same length).")
+    inputs = {
+        "close": c,
+        "positions": pos,
+        "start_equity": float(start_equity),
+        "max_lag": int(max_lag),
+    }
+    return _simulate(
+        "jitter", inputs, n_paths, seed, periods_per_year, chunk_paths, n_jobs
+    )
+
+
+def fills_per_bar(bar_ts: np.ndarray, fill_ts: np.ndarray, signed_qty: np.ndarray):
+    """
+    Align ledger fills to bars: returns (traded_qty per bar, position after each bar).
+    """
+    bar_ts = np.asarray(bar_ts, dtype=np.int64)
+    at = np.searchsorted(bar_ts, np.asarray(fill_ts, dtype=np.int64), side="right") - 1
+    at = np.clip(at, 0, len(bar_ts) - 1)
+    sq = np.asarray(signed_qty, dtype=np.float64)
+    net = np.bincount(at, weights=sq, minlength=len(bar_ts))
+    traded = np.bincount(at, weights=np.abs(sq), minlength=len(bar_ts))
+    return traded, np.cumsum(net)
@@ -0,0 +1,252 @@
+# backtester/analysis/run_cache.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from collections.abc import Callable, Mapping
+from dataclasses import asdict, dataclass, is_dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from backtester import __version__
+from backtester.analysis.metrics import BacktestMetrics, compute_metrics
+
+# rows per equity fingerprint chunk
+FINGERPRINT_CHUNK = 4_096
+
+
+def file_fingerprint(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """
+    sha256 of a data file's bytes (use Bars.fingerprint() for in-memory/cached bars).
+    """
+    h = hashlib.sha256()
+    with Path(path).open("rb") as f:
+        while block := f.read(chunk_size):
+            h.update(block)
+    return h.hexdigest()
+
+
+def as_ns(ts: np.ndarray) -> np.ndarray:
+    """
+    datetime64 (any unit) or int epoch-ns timestamps -> contiguous int64 ns.
+    """
+    ts = np.asarray(ts)
+    if ts.dtype.kind == "M":
+        ts = ts.astype("datetime64[ns]")
+    return np.ascontiguousarray(ts).view(np.int64)
+
+
+def chunk_fingerprints(
+    ts: np.ndarray, columns: Mapping[str, np.ndarray], chunk: int = FINGERPRINT_CHUNK
+) -> list[str]:
+    """
+    One short hash per `chunk` rows of (ts as int64 ns, every column by name), so two
+    runs can be compared chunk by chunk without loading either series; equal hashes
+    mean every stored column is equal over the chunk, not just equity.
+    """
+    ts = as_ns(ts)
+    cols = [(name, np.ascontiguousarray(columns[name])) for name in sorted(columns)]
+    out = []
+    for lo in range(0, len(ts), chunk):
+        h = hashlib.sha256(ts[lo : lo + chunk].tobytes())
+        for name, values in cols:
+            h.update(name.encode())
+            h.update(values.dtype.str.encode())
+            h.update(values[lo : lo + chunk].tobytes())
+        out.append(h.hexdigest()[:16])
+    return out
+
+
+def trades_fingerprint(trades: dict[str, np.ndarray] | None) -> str | None:
+    if trades is None:
+        return None
+    h = hashlib.sha256()
+    for k in sorted(trades):
+        h.update(k.encode())
+        h.update(np.ascontiguousarray(trades[k]).tobytes())
+    return h.hexdigest()[:16]
+
+
+def _qualname(obj: Any) -> str:
+    if isinstance(obj, str):
+        return obj
+    cls = obj if isinstance(obj, type) else type(obj)
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def run_key(
+    data_fingerprint: str,
+    strategy: type | str,
+    params: dict[str, Any],
+    commission: Any = None,
+    slippage: Any = None,
+    extra: dict[str, Any] | None = None,
+    engine_version: str = __version__,
+) -> str:
+    """
+    Content address of a backtest run: same inputs -> same key.
+    commission/slippage may be the model dataclasses or their config dicts.
+    """
+    payload = {
+        "data": data_fingerprint,
+        "strategy": _qualname(strategy),
+        "params": params,
+        "commission": asdict(commission) if is_dataclass(commission) else commission,
+        "slippage": asdict(slippage) if is_dataclass(slippage) else slippage,
+        "extra": extra or {},
+        "engine": engine_version,
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+@dataclass
+class CachedRun:
+    metrics: BacktestMetrics
+    equity_curve: pd.DataFrame
+    trades: dict[str, np.ndarray] | None = None
+
+    @classmethod
+    def from_engine(cls, engine, periods_per_year: int) -> CachedRun:
+        """
+        Snapshot a finished engine's equity curve, metrics and trade ledger.
+        periods_per_year must match the bar frequency (RunPlan.periods_per_year),
+        or the annualized metrics are off.
+        """
+        portfolio = engine.portfolio
+        curve = portfolio.equity_curve_df()
+        trades = {k: v.copy() for k, v in portfolio.ledger.to_arrays().items()}
+        return cls(
+            compute_metrics(curve, periods_per_year=periods_per_year), curve, trades
+        )
+
+
+class RunCache:
+    """
+    On-disk store of finished runs, one directory per run key:
+
+      <root>/<key>/metrics.json
+      <root>/<key>/equity.npz     columnar: ts (datetime64) + one array per column
+      <root>/<key>/trades.npz     optional columnar trade list
+      <root>/<key>/fingerprint.json  per-chunk hashes of the equity table + trades hash
+                                     (see compare.py)
+
+    Directory mtime is the LRU clock; put() evicts least recently used runs
+    until the store fits in max_bytes.
+    """
+
+    def __init__(self, root: str | Path, max_bytes: int = 1 << 30) -> None:
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _dir(self, key: str) -> Path:
+        return self.root / key
+
+    def __contains__(self, key: str) -> bool:
+        return (self._dir(key) / "metrics.json").exists()
+
+    def metrics(self, key: str) -> BacktestMetrics | None:
+        try:
+            return BacktestMetrics(
+                **json.loads((self._dir(key) / "metrics.json").read_text("utf-8"))
+            )
+        except FileNotFoundError:
+            return None
+
+    def fingerprints(self, key: str) -> dict[str, Any] | None:
+        """
+        {"chunk": rows per chunk, "rows": n, "equity": [chunk hashes], "trades": hash | None},
+        or None for runs stored without one. Chunk hashes cover every equity-curve column.
+        """
+        try:
+            return json.loads((self._dir(key) / "fingerprint.json").read_text("utf-8"))
+        except FileNotFoundError:
+            return None
+
+    def get(self, key: str) -> CachedRun | None:
+        d = self._dir(key)
+        try:
+            metrics = BacktestMetrics(
+                **json.loads((d / "metrics.json").read_text("utf-8"))
+            )
+            with np.load(d / "equity.npz") as z:
+                cols = {k: z[k] for k in z.files if k != "ts"}
+                idx = pd.DatetimeIndex(z["ts"], name="ts")
+            trades = None
+            if (d / "trades.npz").exists():
+                with np.load(d / "trades.npz") as z:
+                    trades = {k: z[k] for k in z.files}
+        except FileNotFoundError:
+            return None
+
+        os.utime(d)  # LRU touch
+        return CachedRun(metrics, pd.DataFrame(cols, index=idx), trades)
+
+    def put(
+        self,
+        key: str,
+        metrics: BacktestMetrics,
+        equity_curve: pd.DataFrame,
+        trades: dict[str, np.ndarray] | None = None,
+    ) -> None:
+        final = self._dir(key)
+        tmp = self.root / f".tmp-{uuid.uuid4().hex}"
+        tmp.mkdir()
+
+        (tmp / "metrics.json").write_text(json.dumps(asdict(metrics)), encoding="utf-8")
+        ts = np.asarray(equity_curve.index.to_numpy(), dtype="datetime64")
+        cols = {c: equity_curve[c].to_numpy() for c in equity_curve.columns}
+        np.savez(tmp / "equity.npz", ts=ts, **cols)
+        if trades is not None:
+            np.savez(tmp / "trades.npz", **trades)
+        fp = {
+            "chunk": FINGERPRINT_CHUNK,
+            "rows": len(ts),
+            "equity": chunk_fingerprints(ts, cols) if len(ts) else [],
+            "trades": trades_fingerprint(trades),
+        }
+        (tmp / "fingerprint.json").write_text(json.dumps(fp), encoding="utf-8")
+
+        try:
+            os.replace(tmp, final)
+        except OSError:
+            shutil.rmtree(tmp, ignore_errors=True)  # another writer got there first
+        self.evict()
+
+    def get_or_run(self, key: str, run: Callable[[], CachedRun]) -> CachedRun:
+        hit = self.get(key)
+        if hit is not None:
+            return hit
+        res = run()
+        self.put(key, res.metrics, res.equity_curve, res.trades)
+        return res
+
+    def size_bytes(self) -> int:
+        return sum(self._entry_size(d) for d in self._entries())
+
+    def _entries(self) -> list[Path]:
+        return [
+            d for d in self.root.iterdir() if d.is_dir() and not d.name.startswith(".")
+        ]
+
+    @staticmethod
+    def _entry_size(d: Path) -> int:
+        return sum(f.stat().st_size for f in d.iterdir())
+
+    def evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda d: d.stat().st_mtime)
+        sizes = {d: self._entry_size(d) for d in entries}
+        total = sum(sizes.values())
+        for d in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(d, ignore_errors=True)
+            total -= sizes[d]
@@ -0,0 +1,124 @@
+# backtester/core/chunked.py
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtester.core.engine import BacktestEngine
+from backtester.data.bar_store import Bars, to_ns_array
+from backtester.data.chunked import prefetch
+
+
+class SpillWriter:
+    """
+    Writes per-chunk outputs as numbered part files:
+      <out_dir>/equity-00000.npz   ts (int64 ns) + every Portfolio.history column
+      <out_dir>/fills-00000.npz    TradeLedger columns
+      <out_dir>/pnl-00000.npz      ts, names, values (n_rows x n_names); only when
+                                   the portfolio records pnl_attribution
+    """
+
+    def __init__(self, out_dir: str | Path) -> None:
+        self.out_dir = Path(out_dir)
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        self.parts = 0
+
+    def write(
+        self,
+        history: list[dict],
+        fills: dict[str, np.ndarray],
+        pnl_history: list[dict[str, float]] | None = None,
+    ) -> None:
+        name = f"{self.parts:05d}.npz"
+        ts = to_ns_array([row["ts"] for row in history])
+        cols = {
+            k: np.fromiter((row[k] for row in history), float, len(history))
+            for k in (history[0] if history else ())
+            if k != "ts"
+        }
+        np.savez(self.out_dir / f"equity-{name}", ts=ts, **cols)
+        np.savez(self.out_dir / f"fills-{name}", **fills)
+        if pnl_history is not None:
+            # keys vary by row (a symbol/strategy shows up once it has PnL), so the
+            # names travel as data rather than as npz keys
+            names = list(dict.fromkeys(k for row in pnl_history for k in row))
+            values = np.array(
+                [[row.get(k, 0.0) for k in names] for row in pnl_history], dtype=float
+            ).reshape(len(pnl_history), len(names))
+            np.savez(
+                self.out_dir / f"pnl-{name}",
+                ts=ts,
+                names=np.array(names, dtype=str),
+                values=values,
+            )
+        self.parts += 1
+
+
+def _concat_parts(out_dir: Path, prefix: str) -> dict[str, np.ndarray]:
+    parts = sorted(Path(out_dir).glob(f"{prefix}-*.npz"))
+    cols: dict[str, list[np.ndarray]] = {}
+    for p in parts:
+        with np.load(p) as z:
+            for k in z.files:
+                cols.setdefault(k, []).append(z[k])
+    return {k: np.concatenate(v) for k, v in cols.items()}
+
+
+def load_equity(out_dir: str | Path) -> pd.DataFrame:
+    """
+    Reassemble spilled equity parts into Portfolio.equity_curve_df() form.
+    """
+    cols = _concat_parts(Path(out_dir), "equity")
+    idx = pd.DatetimeIndex(cols.pop("ts").astype("datetime64[ns]"), name="ts")
+    return pd.DataFrame(cols, index=idx).sort_index()
+
+
+def load_fills(out_dir: str | Path) -> dict[str, np.ndarray]:
+    return _concat_parts(Path(out_dir), "fills")
+
+
+def load_pnl_attribution(out_dir: str | Path) -> pd.DataFrame:
+    """
+    Reassemble spilled attribution parts into Portfolio.pnl_attribution_df() form.
+    """
+    frames = []
+    for p in sorted(Path(out_dir).glob("pnl-*.npz")):
+        with np.load(p) as z:
+            idx = pd.DatetimeIndex(z["ts"].astype("datetime64[ns]"), name="ts")
+            frames.append(pd.DataFrame(z["values"], index=idx, columns=z["names"]))
+    if not frames:
+        raise ValueError(f"no pnl attribution parts in {out_dir}.")
+    return pd.concat(frames).fillna(0.0).sort_index()
+
+
+def run_chunked(
+    engine: BacktestEngine,
+    chunks: Iterable[Bars],
+    out_dir: str | Path,
+    prefetch_depth: int = 1,
+) -> int:
+    """
+    Drive the engine chunk by chunk. Only strategy/portfolio/execution state is
+    carried across chunk boundaries; each chunk's equity rows, fills and (if enabled)
+    pnl attribution rows are spilled to out_dir and dropped from memory, so peak RSS
+    tracks chunk size, not history length.
+    Returns bars processed.
+    """
+    spill = SpillWriter(out_dir)
+    portfolio = engine.portfolio
+    attribution = bool(portfolio.pnl_attribution)
+    n = 0
+    for chunk in prefetch(chunks, depth=prefetch_depth):
+        n += engine.run(chunk.market_events())
+        spill.write(
+            portfolio.history,
+            portfolio.ledger.drain(),
+            portfolio.pnl_history if attribution else None,
+        )
+        portfolio.history.clear()
+        portfolio.pnl_history.clear()
+    return n
@@ -0,0 +1,562 @@
+# backtester/core/config.py
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import importlib
+import json
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import asdict, dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from backtester.analysis.run_cache import run_key
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.core.journal import EventJournal
+from backtester.data.bar_store import BarStore
+from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.data.parquet_data_handler import ParquetDataHandler
+from backtester.events import MarketEvent, ValidationLevel, to_epoch_ns
+from backtester.execution.execution_handler import (
+    CommissionModel,
+    ExecutionHandler,
+    SlippageModel,
+)
+from backtester.portfolio.lots import LOT_METHODS
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.router import StrategyRouter
+
+DEFAULT_STRATEGY = (
+    "backtester.strategy.moving_average_crossover:MovingAverageCrossStrategy"
+)
+
+_COMMISSION_MODELS = ("per_trade", "percent", "per_share")
+_SLIPPAGE_MODELS = ("bps", "spread")
+_SECTIONS = (
+    "data",
+    "universe",
+    "strategy",
+    "costs",
+    "portfolio",
+    "window",
+    "seed",
+    "periods_per_year",
+)
+
+# flat keys of configs/momentum_spy.yaml style files
+_FLAT_KEYS = (
+    "symbol",
+    "starting_cash",
+    "order_type",
+    "order_size",
+    "fee_per_fill",
+    "slippage_bps",
+    "data_path",
+    "timestamp_col",
+    "price_cols",
+    "start_date",
+    "end_date",
+)
+
+
+def resolve_strategy(path: str):
+    """
+    "package.module:ClassName" -> class
+    """
+    mod_name, _, cls_name = path.partition(":")
+    if not cls_name:
+        raise ValueError(f"Strategy path must look like 'module:Class', got {path!r}")
+    return getattr(importlib.import_module(mod_name), cls_name)
+
+
+@dataclass(frozen=True)
+class DataSpec:
+    """
+    Where bars come from:
+    - csv: one CSVDataHandler file (single-symbol universe)
+    - store: a BarStore root, one entry per universe symbol
+    - parquet: a (partitioned) Parquet dataset; window and symbols are pushed down
+    """
+
+    source: str = "csv"  # "csv" | "store" | "parquet"
+    path: str | None = None
+    ts_col: str = "timestamp"
+    open_col: str = "open"
+    high_col: str = "high"
+    low_col: str = "low"
+    close_col: str = "close"
+    volume_col: str = "volume"
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    path: str = DEFAULT_STRATEGY
+    # sorted (name, value) pairs, so the spec stays hashable
+    params: tuple[tuple[str, Any], ...] = ()
+
+    @property
+    def kwargs(self) -> dict[str, Any]:
+        return dict(self.params)
+
+
+@dataclass(frozen=True)
+class PortfolioSpec:
+    """
+    Portfolio kwargs; est_fee_per_trade=None follows the commission's per_trade_fee.
+    """
+
+    starting_cash: float = 10_000.0
+    target_qty: float = 100.0
+    max_qty: float = 200.0
+    est_fee_per_trade: float | None = None
+    lot_method: str = "fifo"  # "fifo" | "average"
+    allow_short: bool = False
+    pnl_attribution: str | None = None  # None | "symbol" | "strategy"
+
+
+@dataclass(frozen=True)
+class RunPlan:
+    """
+    Validated, immutable description of one backtest run.
+
+    Parsed once (load_run_plan / parse_run_plan); cheap to pickle and ship to
+    workers, and plan.hash() is a stable content address for result caching.
+    """
+
+    data: DataSpec
+    universe: tuple[str, ...]
+    strategy: StrategySpec = field(default_factory=StrategySpec)
+    commission: CommissionModel = field(default_factory=CommissionModel)
+    slippage: SlippageModel = field(default_factory=SlippageModel)
+    portfolio: PortfolioSpec = field(default_factory=PortfolioSpec)
+    start: str | None = None
+    end: str | None = None
+    seed: int | None = None
+    periods_per_year: int = 252 * 390
+
+    @property
+    def symbol(self) -> str:
+        return self.universe[0]
+
+    def to_dict(self) -> dict[str, Any]:
+        d = asdict(self)
+        d["universe"] = list(self.universe)
+        d["strategy"] = {"path": self.strategy.path, "params": self.strategy.kwargs}
+        return d
+
+    def hash(self) -> str:
+        raw = json.dumps(self.to_dict(), sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def cache_key(self, data_fingerprint: str) -> str:
+        """
+        RunCache key for this plan over a specific dataset.
+        """
+        return run_key(
+            data_fingerprint,
+            self.strategy.path,
+            self.strategy.kwargs,
+            self.commission,
+            self.slippage,
+            extra={"plan": self.hash()},
+        )
+
+    def with_params(self, **params: Any) -> RunPlan:
+        merged = {**self.strategy.kwargs, **params}
+        return replace(
+            self, strategy=replace(self.strategy, params=tuple(sorted(merged.items())))
+        )
+
+    def with_window(self, start: str | None, end: str | None) -> RunPlan:
+        return replace(self, start=start, end=end)
+
+    # ----- building -----
+
+    def market_events(self, store: BarStore | None = None) -> Iterator[MarketEvent]:
+        """
+        Bars for the plan's universe and window, in timestamp order.
+        """
+        if self.data.source == "csv":
+            d = self.data
+            feed = CSVDataHandler(
+                csv_path=d.path,
+                symbol=self.symbol,
+                ts_col=d.ts_col,
+                open_col=d.open_col,
+                high_col=d.high_col,
+                low_col=d.low_col,
+                close_col=d.close_col,
+                volume_col=d.volume_col,
+            )
+            return _windowed(feed.stream_market_events(), self.start, self.end)
+
+        if self.data.source == "parquet":
+            d = self.data
+            streams = [
+                ParquetDataHandler(
+                    path=d.path,
+                    symbol=s,
+                    start=self.start,
+                    end=self.end,
+                    ts_col=d.ts_col,
+                    open_col=d.open_col,
+                    high_col=d.high_col,
+                    low_col=d.low_col,
+                    close_col=d.close_col,
+                    volume_col=d.volume_col,
+                )
+                .load()
+                .market_events()
+                for s in self.universe
+            ]
+        else:
+            store = store or BarStore(self.data.path)
+            streams = [
+                store.get(s).window(self.start, self.end).market_events()
+                for s in self.universe
+            ]
+        if len(streams) == 1:
+            return streams[0]
+        return heapq.merge(*streams, key=lambda e: e.ts)
+
+    def build(
+        self,
+        events: EventQueue | None = None,
+        on_bar: Callable[[BacktestEngine, MarketEvent], None] | None = None,
+        journal: EventJournal | None = None,
+        validation: ValidationLevel | str | None = None,
+    ) -> BacktestEngine:
+        """
+        Fresh strategy/portfolio/execution wired into a BacktestEngine
+        (one strategy per universe symbol, fanned out by a StrategyRouter).
+        """
+        events = events if events is not None else EventQueue()
+        strategy_cls = resolve_strategy(self.strategy.path)
+        params = self.strategy.kwargs
+
+        p = self.portfolio
+        est_fee = (
+            self.commission.per_trade_fee
+            if p.est_fee_per_trade is None
+            else p.est_fee_per_trade
+        )
+        portfolio = Portfolio(
+            events=events,
+            starting_cash=p.starting_cash,
+            target_qty=p.target_qty,
+            max_qty=p.max_qty,
+            est_fee_per_trade=float(est_fee),
+            lot_method=p.lot_method,
+            allow_short=p.allow_short,
+            pnl_attribution=p.pnl_attribution,
+        )
+        execution = ExecutionHandler(
+            events=events, slippage=self.slippage, commission=self.commission
+        )
+
+        if len(self.universe) == 1:
+            strategy = strategy_cls(events=events, symbol=self.symbol, **params)
+        else:
+            # subscribe() needs the router's netting portfolio: every symbol trades into this one
+            strategy = StrategyRouter(
+                events=events, portfolio=portfolio, execution=execution
+            )
+            for s in self.universe:
+                strategy.subscribe(strategy_cls(events=events, symbol=s, **params), [s])
+        return BacktestEngine(
+            events,
+            strategy,
+            portfolio,
+            execution,
+            on_bar=on_bar,
+            journal=journal,
+            validation=validation,
+        )
+
+
+def _windowed(stream: Iterator[MarketEvent], start, end) -> Iterator[MarketEvent]:
+    if start is None and end is None:
+        yield from stream
+        return
+    lo = None if start is None else to_epoch_ns(start)
+    hi = None if end is None else to_epoch_ns(end)
+    for ev in stream:
+        t = to_epoch_ns(ev.ts)
+        if lo is not None and t < lo:
+            continue
+        if hi is not None and t >= hi:
+            break
+        yield ev
+
+
+# ----- parsing / validation -----
+
+
+def _merge(base: Mapping[str, Any], over: Mapping[str, Any]) -> dict[str, Any]:
+    out = dict(base)
+    for k, v in over.items():
+        if isinstance(v, Mapping) and isinstance(out.get(k), Mapping):
+            out[k] = _merge(out[k], v)
+        else:
+            out[k] = v
+    return out
+
+
+def _section(spec: Mapping[str, Any], name: str) -> dict[str, Any]:
+    raw = spec.get(name) or {}
+    if not isinstance(raw, Mapping):
+        raise ValueError(f"RunPlan.{name} must be a mapping, got {type(raw).__name__}.")
+    return dict(raw)
+
+
+def _only(raw: Mapping[str, Any], allowed, where: str) -> None:
+    unknown = sorted(set(raw) - set(allowed))
+    if unknown:
+        raise ValueError(
+            f"{where} has unknown keys {unknown}; allowed: {sorted(allowed)}."
+        )
+
+
+def _number(
+    raw: Mapping[str, Any], key: str, where: str, default: float, minimum: float = 0.0
+) -> float:
+    v = raw.get(key, default)
+    try:
+        v = float(v)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}.{key} must be a number, got {v!r}.") from None
+    if v < minimum:
+        raise ValueError(f"{where}.{key} must be >= {minimum}, got {v}.")
+    return v
+
+
+def _from_flat(spec: Mapping[str, Any]) -> dict[str, Any]:
+    # configs/momentum_spy.yaml -> sectioned spec
+    out: dict[str, Any] = {k: v for k, v in spec.items() if k not in _FLAT_KEYS}
+    if "symbol" in spec:
+        out["universe"] = [spec["symbol"]]
+    if spec.get("order_type", "MKT") != "MKT":
+        raise ValueError(
+            f"RunPlan.order_type: only 'MKT' is supported, got {spec['order_type']!r}."
+        )
+
+    data = dict(out.get("data") or {})
+    if "data_path" in spec:
+        data["path"] = spec["data_path"]
+    if "timestamp_col" in spec:
+        data["ts_col"] = spec["timestamp_col"]
+    for name, col in (spec.get("price_cols") or {}).items():
+        data[f"{name}_col"] = col
+    if data:
+        out["data"] = data
+
+    portfolio = dict(out.get("portfolio") or {})
+    if "starting_cash" in spec:
+        portfolio["starting_cash"] = spec["starting_cash"]
+    if "order_size" in spec:
+        portfolio["target_qty"] = spec["order_size"]
+        portfolio["max_qty"] = spec["order_size"]
+    if portfolio:
+        out["portfolio"] = portfolio
+
+    costs = dict(out.get("costs") or {})
+    if "fee_per_fill" in spec:
+        costs["commission"] = {
+            "model": "per_trade",
+            "per_trade_fee": spec["fee_per_fill"],
+        }
+    if "slippage_bps" in spec:
+        costs["slippage"] = {"model": "bps", "bps": spec["slippage_bps"]}
+    if costs:
+        out["costs"] = costs
+
+    if "start_date" in spec or "end_date" in spec:
+        out["window"] = {"start": spec.get("start_date"), "end": spec.get("end_date")}
+    return out
+
+
+def parse_run_plan(
+    spec: Mapping[str, Any], base: Mapping[str, Any] | None = None
+) -> RunPlan:
+    """
+    Validate a run spec (sectioned, or the flat momentum_spy.yaml keys) into a RunPlan.
+    `base` supplies defaults that `spec` overrides key by key.
+    """
+    if not isinstance(spec, Mapping):
+        raise ValueError(f"Run spec must be a mapping, got {type(spec).__name__}.")
+    if any(k in spec for k in _FLAT_KEYS):
+        spec = _from_flat(spec)
+    if base is not None:
+        if any(k in base for k in _FLAT_KEYS):
+            base = _from_flat(base)
+        spec = _merge(base, spec)
+    _only(spec, _SECTIONS, "Run spec")
+
+    # data
+    data_raw = _section(spec, "data")
+    _only(data_raw, DataSpec.__dataclass_fields__, "RunPlan.data")
+    data = DataSpec(**data_raw)
+    if data.source not in ("csv", "store", "parquet"):
+        raise ValueError(
+            f"RunPlan.data.source must be 'csv', 'store' or 'parquet', got {data.source!r}."
+        )
+    if data.source in ("csv", "parquet") and not data.path:
+        raise ValueError(f"RunPlan.data.path is required for {data.source} data.")
+
+    # universe
+    universe = spec.get("universe") or ()
+    if isinstance(universe, str):
+        universe = [universe]
+    universe = tuple(str(s) for s in universe)
+    if not universe:
+        raise ValueError("RunPlan.universe must list at least one symbol.")
+    if len(set(universe)) != len(universe):
+        raise ValueError(f"RunPlan.universe has duplicate symbols: {list(universe)}.")
+    if data.source == "csv" and len(universe) != 1:
+        raise ValueError(
+            "RunPlan.universe must be a single symbol for csv data (use a BarStore)."
+        )
+
+    # strategy (resolved now, so a typo fails at load time rather than in a worker)
+    strat_raw = _section(spec, "strategy")
+    _only(strat_raw, ("class", "params"), "RunPlan.strategy")
+    path = str(strat_raw.get("class", DEFAULT_STRATEGY))
+    try:
+        resolve_strategy(path)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(
+            f"RunPlan.strategy.class {path!r} cannot be imported: {e}"
+        ) from e
+    params = strat_raw.get("params") or {}
+    if not isinstance(params, Mapping):
+        raise ValueError("RunPlan.strategy.params must be a mapping.")
+    strategy = StrategySpec(path=path, params=tuple(sorted(params.items())))
+
+    # costs
+    costs = _section(spec, "costs")
+    _only(costs, ("commission", "slippage"), "RunPlan.costs")
+    comm_raw = dict(costs.get("commission") or {})
+    slip_raw = dict(costs.get("slippage") or {})
+    _only(comm_raw, CommissionModel.__dataclass_fields__, "RunPlan.costs.commission")
+    _only(slip_raw, SlippageModel.__dataclass_fields__, "RunPlan.costs.slippage")
+    comm_model = comm_raw.get("model", "per_trade")
+    slip_model = slip_raw.get("model", "bps")
+    if comm_model not in _COMMISSION_MODELS:
+        raise ValueError(
+            f"RunPlan.costs.commission.model must be one of {_COMMISSION_MODELS}, got {comm_model!r}."
+        )
+    if slip_model not in _SLIPPAGE_MODELS:
+        raise ValueError(
+            f"RunPlan.costs.slippage.model must be one of {_SLIPPAGE_MODELS}, got {slip_model!r}."
+        )
+    where = "RunPlan.costs.commission"
+    commission = CommissionModel(
+        model=comm_model,
+        per_trade_fee=_number(comm_raw, "per_trade_fee", where, 1.0),
+        percent_rate=_number(comm_raw, "percent_rate", where, 0.0),
+        per_share_fee=_number(comm_raw, "per_share_fee", where, 0.0),
+    )
+    where = "RunPlan.costs.slippage"
+    slippage = SlippageModel(
+        model=slip_model,
+        bps=_number(slip_raw, "bps", where, 0.0),
+        half_spread=_number(slip_raw, "half_spread", where, 0.0),
+    )
+
+    # portfolio limits
+    port_raw = _section(spec, "portfolio")
+    _only(port_raw, PortfolioSpec.__dataclass_fields__, "RunPlan.portfolio")
+    where = "RunPlan.portfolio"
+    est_fee = port_raw.get("est_fee_per_trade")
+    portfolio = PortfolioSpec(
+        starting_cash=_number(port_raw, "starting_cash", where, 10_000.0, minimum=1e-9),
+        target_qty=_number(port_raw, "target_qty", where, 100.0),
+        max_qty=_number(port_raw, "max_qty", where, 200.0),
+        est_fee_per_trade=(
+            None
+            if est_fee is None
+            else _number(port_raw, "est_fee_per_trade", where, 0.0)
+        ),
+        lot_method=port_raw.get("lot_method", "fifo"),
+        allow_short=port_raw.get("allow_short", False),
+        pnl_attribution=port_raw.get("pnl_attribution"),
+    )
+    if portfolio.lot_method not in LOT_METHODS:
+        raise ValueError(
+            f"RunPlan.portfolio.lot_method must be one of {LOT_METHODS}, got {portfolio.lot_method!r}."
+        )
+    if not isinstance(portfolio.allow_short, bool):
+        raise ValueError(
+            f"RunPlan.portfolio.allow_short must be true/false, got {portfolio.allow_short!r}."
+        )
+    if portfolio.pnl_attribution not in (None, "symbol", "strategy"):
+        raise ValueError(
+            f"RunPlan.portfolio.pnl_attribution must be 'symbol' or 'strategy', got {portfolio.pnl_attribution!r}."
+        )
+    if portfolio.target_qty > portfolio.max_qty:
+        raise ValueError(
+            f"RunPlan.portfolio.target_qty ({portfolio.target_qty}) must be <= max_qty ({portfolio.max_qty})."
+        )
+
+    # date window
+    window = _section(spec, "window")
+    _only(window, ("start", "end"), "RunPlan.window")
+    start = window.get("start")
+    end = window.get("end")
+    bounds = []
+    for name, v in (("start", start), ("end", end)):
+        if v is None:
+            bounds.append(None)
+            continue
+        try:
+            bounds.append(to_epoch_ns(str(v)))
+        except ValueError:
+            raise ValueError(
+                f"RunPlan.window.{name} is not a timestamp: {v!r}."
+            ) from None
+    if None not in bounds and bounds[0] >= bounds[1]:
+        raise ValueError(f"RunPlan.window.start ({start}) must be before end ({end}).")
+
+    seed = spec.get("seed")
+    if seed is not None:
+        try:
+            seed = int(seed)
+        except (TypeError, ValueError):
+            raise ValueError(f"RunPlan.seed must be an int, got {seed!r}.") from None
+    ppy = spec.get("periods_per_year", 252 * 390)
+    if not isinstance(ppy, int) or ppy <= 0:
+        raise ValueError(
+            f"RunPlan.periods_per_year must be a positive int, got {ppy!r}."
+        )
+
+    return RunPlan(
+        data=data,
+        universe=universe,
+        strategy=strategy,
+        commission=commission,
+        slippage=slippage,
+        portfolio=portfolio,
+        start=None if start is None else str(start),
+        end=None if end is None else str(end),
+        seed=seed,
+        periods_per_year=ppy,
+    )
+
+
+def load_run_plan(path: str | Path, base: Mapping[str, Any] | None = None) -> RunPlan:
+    """
+    Read a YAML run spec and validate it (see parse_run_plan).
+    """
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(f"Run config not found: {p}")
+    with p.open("r", encoding="utf-8") as f:
+        spec = yaml.safe_load(f) or {}
+    try:
+        return parse_run_plan(spec, base=base)
+    except ValueError as e:
+        raise ValueError(f"{p}: {e}") from e
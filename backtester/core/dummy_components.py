@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-from datetime import datetime, timezone
+import time
 
 from backtester.core.event_queue import EventQueue
-from backtester.events import MarketEvent, SignalEvent, OrderEvent, FillEvent
+from backtester.events import FillEvent, MarketEvent, OrderEvent, SignalEvent
 
 
 class DummyDataHandler:
@@ -19,7 +19,7 @@ class DummyDataHandler:
 
     def stream_next(self, i: int) -> None:
         # Deterministic dummy bar (respects MarketEvent constraints)
-        ts = datetime.now(timezone.utc).isoformat()
+        ts = time.time_ns()
 
         close = 100.0 + float(i)
         open_ = close
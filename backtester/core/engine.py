@@ -0,0 +1,244 @@
+# backtester/core/engine.py
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from typing import Protocol
+
+from backtester.core.event_queue import EventQueue
+from backtester.core.journal import EventJournal
+from backtester.data.calendar import SessionIndex
+from backtester.data.ring_buffer import BarHistory
+from backtester.events import (
+    CorporateActionEvent,
+    EventType,
+    FillEvent,
+    MarketBatchEvent,
+    MarketEvent,
+    OrderEvent,
+    RiskEvent,
+    SignalEvent,
+    ValidationLevel,
+    to_epoch_ns,
+    validation,
+)
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.portfolio.risk import RiskEngine
+
+
+class MarketConsumer(Protocol):
+    def on_market(self, event: MarketEvent) -> None: ...
+
+
+def deliver_batch(consumer, batch: MarketBatchEvent) -> None:
+    # consumers without an on_market_batch hook get the per-symbol events
+    handler = getattr(consumer, "on_market_batch", None)
+    if handler is not None:
+        handler(batch)
+    else:
+        for event in batch.market_events():
+            consumer.on_market(event)
+
+
+class BacktestEngine:
+    """
+    Single-threaded FIFO event loop: Market -> Signal -> Order -> Fill.
+
+    Per MarketEvent:
+      - portfolio + execution see the new close (mark-to-market)
+      - one equity row is recorded
+      - strategy reacts and may emit SignalEvent(s), drained in the same bar
+
+    CorporateActionEvents (raw-price feeds) go to the portfolio, then to execution and
+    strategy if they define on_corporate_action.
+
+    With a SessionIndex built from the replayed bars, strategy.on_session_end(ts)
+    runs after the last bar of each session (its signals fill on that bar).
+
+    A MarketBatchEvent (all symbols at one timestamp) goes through the same steps
+    once per timestamp via the on_market_batch hooks, and counts as one bar.
+    With a shared BarHistory, each bar is written to it once, before the strategy runs.
+    With a RiskEngine, every order is checked before it reaches execution; a breach
+    drops the order and dispatches a RiskEvent (strategy.on_risk, if defined).
+    If a journal is attached (off by default), every dispatched event is recorded
+    to it first.
+    With validation="trusted", run() builds every event (feed, signals, orders, fills)
+    under ValidationLevel.TRUSTED; None keeps the process-wide level.
+    """
+
+    def __init__(
+        self,
+        events: EventQueue,
+        strategy: MarketConsumer,
+        portfolio: Portfolio,
+        execution: ExecutionHandler,
+        on_bar: Callable[[BacktestEngine, MarketEvent], None] | None = None,
+        journal: EventJournal | None = None,
+        sessions: SessionIndex | None = None,
+        history: BarHistory | None = None,
+        risk: RiskEngine | None = None,
+        validation: ValidationLevel | str | None = None,
+    ) -> None:
+        self.events = events
+        self.strategy = strategy
+        self.portfolio = portfolio
+        self.execution = execution
+        self.on_bar = on_bar
+        self.journal = journal
+        self.history = history
+        self.risk = risk
+        self.validation = validation
+        if risk is not None:
+            risk.attach(portfolio)
+        self.bars_seen = 0
+        # looked up by bar ts, so a feed that starts mid-index (or skips bars) still
+        # hits the right session ends; several symbols' bars at one ts fire it once
+        self._session_end = (
+            set(sessions.ts[sessions.is_session_end].tolist())
+            if sessions is not None
+            else None
+        )
+        self._session_end_fired: int | None = None
+
+    def on_market(self, event: MarketEvent | MarketBatchEvent) -> None:
+        self.events.put(event)
+        self.drain()
+
+    def drain(self) -> None:
+        while not self.events.empty():
+            event = self.events.get()
+            if event is None:
+                break
+            self.dispatch(event)
+
+    def dispatch(self, event) -> None:
+        if self.journal is not None:
+            self.journal.record(event)
+
+        if event.type == EventType.MARKET:
+            me = event  # type: ignore[assignment]
+            assert isinstance(me, MarketEvent)
+            self.bars_seen += 1
+
+            # update mark-to-market prices for portfolio + execution
+            self.portfolio.update_market_price(me.symbol, float(me.close))
+            self.execution.on_market(me)
+            if self.risk is not None:
+                self.risk.on_price(me.symbol, float(me.close))
+
+            # record equity curve row (one per bar)
+            self.portfolio.update_timeindex(me.ts)
+
+            if self.history is not None:
+                self.history.on_market(me)
+
+            # strategy reacts to market -> may emit SignalEvent
+            self.strategy.on_market(me)
+
+            if self.on_bar is not None:
+                self.on_bar(self, me)
+
+            if self._session_end is not None:
+                self._check_session_end(me.ts)
+
+        elif event.type == EventType.MARKET_BATCH:
+            be = event  # type: ignore[assignment]
+            assert isinstance(be, MarketBatchEvent)
+            self.bars_seen += 1
+
+            self.portfolio.on_market_batch(be)
+            deliver_batch(self.execution, be)
+            if self.risk is not None:
+                self.risk.on_market_batch(be)
+
+            # one equity row per timestamp, not per symbol
+            self.portfolio.update_timeindex(be.ts)
+
+            if self.history is not None:
+                self.history.on_market_batch(be)
+
+            deliver_batch(self.strategy, be)
+
+            if self.on_bar is not None:
+                self.on_bar(self, be)
+
+            if self._session_end is not None:
+                self._check_session_end(be.ts)
+
+        elif event.type == EventType.SIGNAL:
+            se = event  # type: ignore[assignment]
+            assert isinstance(se, SignalEvent)
+            self.portfolio.on_signal(se)  # Signal -> Order (with cash constraint)
+
+        elif event.type == EventType.ORDER:
+            oe = event  # type: ignore[assignment]
+            assert isinstance(oe, OrderEvent)
+            breach = self.risk.check(oe) if self.risk is not None else None
+            if breach is None:
+                self.execution.on_order(oe)  # Order -> Fill
+            else:
+                self.events.put(breach)  # rejected pre-trade
+
+        elif event.type == EventType.FILL:
+            fe = event  # type: ignore[assignment]
+            assert isinstance(fe, FillEvent)
+            self.portfolio.on_fill(fe)  # Fill -> cash/positions update
+            if self.risk is not None:
+                self._sync_risk(fe.symbol)
+
+        elif event.type == EventType.CORPORATE_ACTION:
+            ce = event  # type: ignore[assignment]
+            assert isinstance(ce, CorporateActionEvent)
+            self.portfolio.on_corporate_action(ce)  # split/dividend -> positions/cash
+            if self.risk is not None:
+                self._sync_risk(ce.symbol)
+            if self.history is not None:
+                self.history.on_corporate_action(ce)
+            for consumer in (self.execution, self.strategy):
+                handler = getattr(consumer, "on_corporate_action", None)
+                if handler is not None:
+                    handler(ce)
+
+        elif event.type == EventType.RISK:
+            rk = event  # type: ignore[assignment]
+            assert isinstance(rk, RiskEvent)
+            handler = getattr(self.strategy, "on_risk", None)
+            if handler is not None:
+                handler(rk)
+
+        else:
+            raise ValueError(f"Unknown event type: {event.type}")
+
+    def _sync_risk(self, symbol: str) -> None:
+        p = self.portfolio
+        self.risk.on_position(
+            symbol,
+            float(p.positions.get(symbol, 0.0)),
+            p.cash,
+            p.last_price.get(symbol),
+        )
+
+    def _check_session_end(self, ts) -> None:
+        t = ts if type(ts) is int else to_epoch_ns(ts)
+        if t in self._session_end and t != self._session_end_fired:
+            self._session_end_fired = t
+            handler = getattr(self.strategy, "on_session_end", None)
+            if handler is not None:
+                handler(ts)
+
+    def run(
+        self,
+        market_events: Iterable[MarketEvent | MarketBatchEvent],
+        max_bars: int | None = None,
+    ) -> int:
+        """
+        Replay market events (or batches) through the loop. Returns the number of bars processed.
+        """
+        start = self.bars_seen
+        with validation(self.validation):
+            for me in market_events:
+                if max_bars is not None and self.bars_seen - start >= max_bars:
+                    break
+                self.on_market(me)
+        return self.bars_seen - start
@@ -0,0 +1,360 @@
+# backtester/core/journal.py
+
+from __future__ import annotations
+
+import argparse
+import json
+from collections.abc import Iterable, Iterator
+from itertools import compress
+from pathlib import Path
+
+import numpy as np
+
+from backtester.data.bar_store import to_ns_array
+from backtester.events import (
+    EventType,
+    FillEvent,
+    MarketBatchEvent,
+    MarketEvent,
+    OrderEvent,
+    OrderType,
+    Side,
+    SignalEvent,
+    to_epoch_ns,
+)
+
+# one fixed-width record per event (56 bytes)
+#   MARKET: f0..f4 = open, high, low, close, volume
+#   SIGNAL: f0 = strength (nan if None)
+#   ORDER:  f0 = qty, f1 = limit_price (nan for MKT)
+#   FILL:   f0 = qty, f1 = fill_price, f2 = fee
+JOURNAL_DTYPE = np.dtype(
+    [
+        ("ts", "i8"),
+        ("type", "u1"),
+        ("side", "i1"),
+        ("order_type", "u1"),
+        ("pad", "u1"),
+        ("symbol_id", "u4"),
+        ("f0", "f8"),
+        ("f1", "f8"),
+        ("f2", "f8"),
+        ("f3", "f8"),
+        ("f4", "f8"),
+    ]
+)
+
+TYPE_CODES = {
+    EventType.MARKET: 1,
+    EventType.SIGNAL: 2,
+    EventType.ORDER: 3,
+    EventType.FILL: 4,
+}
+CODE_TYPES = {v: k for k, v in TYPE_CODES.items()}
+_ORDER_CODES = {OrderType.MKT: 0, OrderType.LMT: 1}
+_NAN = float("nan")
+_OTHER_FIELDS = ("type", "side", "order_type", "f0", "f1", "f2", "f3", "f4")
+_CODES = {MarketEvent: 1, SignalEvent: 2, OrderEvent: 3, FillEvent: 4}
+
+
+def _journaled(events: Iterable) -> Iterator:
+    # batches are journaled as their per-symbol MARKET records (readers are unchanged);
+    # event types without a record layout are skipped
+    for e in events:
+        cls = type(e)
+        if cls in _CODES:
+            yield e
+        elif cls is MarketBatchEvent:
+            yield from e.market_events()
+
+
+def _meta_path(path: Path) -> Path:
+    return path.with_name(path.name + ".meta.json")
+
+
+def _index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx.npy")
+
+
+class EventJournal:
+    """
+    Append-only binary journal of engine events.
+
+    record() only buffers the (frozen) event; every `buffer_records` events the
+    block is decoded field by field into a JOURNAL_DTYPE array and written in
+    one call, and every `index_every`-th record's ts goes into a sparse index
+    for seeks. Sidecars (<path>.meta.json, <path>.idx.npy) are written on close().
+
+    Journaling is opt-in (BacktestEngine(journal=None) is the default); with it
+    on, a 200k-bar single-symbol SMA run is ~9% slower, almost all of it the
+    per-event attribute reads when a block is decoded.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        buffer_records: int = 65_536,
+        index_every: int = 4_096,
+    ) -> None:
+        self.path = Path(path)
+        self.index_every = int(index_every)
+        self._f = self.path.open("wb")
+        self._cap = int(buffer_records)
+        self._pending: list = []
+        self.count = 0
+
+        self.symbols: list[str] = []
+        self._sym_ids: dict[str, int] = {}
+        self._index_ts: list[int] = []
+
+    def __enter__(self) -> EventJournal:
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _sid(self, symbol: str) -> int:
+        sid = self._sym_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._sym_ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def record(self, event) -> None:
+        # events are immutable: the block keeps references and flush() decodes it
+        # column by column, so recording costs one append per event
+        self._pending.append(event)
+        if len(self._pending) >= self._cap:
+            self.flush()
+
+    def _encode(self, evs: list) -> np.ndarray:
+        if not set(map(type, evs)) <= _CODES.keys():
+            evs = list(_journaled(evs))
+        n = len(evs)
+        block = np.zeros(n, dtype=JOURNAL_DTYPE)
+        block["ts"] = to_ns_array([e.ts for e in evs])
+
+        ids = self._sym_ids
+        try:
+            block["symbol_id"] = [ids[e.symbol] for e in evs]
+        except KeyError:
+            for e in evs:
+                self._sid(e.symbol)
+            block["symbol_id"] = [ids[e.symbol] for e in evs]
+
+        market = np.array([type(e) is MarketEvent for e in evs], dtype=bool)
+        block["type"] = market  # MARKET == 1, the rest are set row by row below
+        if market.all():
+            rows, bars = slice(None), evs
+        else:
+            rows, bars = market, list(compress(evs, market))
+        if bars:
+            block["f0"][rows] = np.array([e.open for e in bars], dtype=np.float64)
+            block["f1"][rows] = np.array([e.high for e in bars], dtype=np.float64)
+            block["f2"][rows] = np.array([e.low for e in bars], dtype=np.float64)
+            block["f3"][rows] = np.array([e.close for e in bars], dtype=np.float64)
+            block["f4"][rows] = np.array([e.volume for e in bars], dtype=np.float64)
+
+        # signals / orders / fills: a minority, decoded in one Python pass and
+        # written with one vectorized assignment per field
+        others = np.flatnonzero(~market)
+        if others.size:
+            recs = []
+            for i in others.tolist():
+                e = evs[i]
+                cls = type(e)
+                side = 1 if e.side == Side.BUY else -1
+                if cls is FillEvent:
+                    recs.append((4, side, 0, e.qty, e.fill_price, e.fee, _NAN, _NAN))
+                elif cls is OrderEvent:
+                    lp = _NAN if e.limit_price is None else e.limit_price
+                    ot = _ORDER_CODES[e.order_type]
+                    recs.append((3, side, ot, e.qty, lp, _NAN, _NAN, _NAN))
+                else:
+                    st = _NAN if e.strength is None else e.strength
+                    recs.append((2, side, 0, st, _NAN, _NAN, _NAN, _NAN))
+            cols = list(zip(*recs, strict=True))
+            for name, col in zip(_OTHER_FIELDS, cols, strict=True):
+                block[name][others] = col
+        return block
+
+    def flush(self) -> None:
+        if self._pending:
+            block = self._encode(self._pending)
+            self._pending = []
+
+            # sparse index: ts of every index_every-th record
+            first = (-self.count) % self.index_every
+            self._index_ts.extend(block["ts"][first :: self.index_every].tolist())
+
+            self._f.write(block.data)
+            self.count += len(block)
+        self._f.flush()
+
+    def close(self) -> None:
+        if self._f.closed:
+            return
+        self.flush()
+        self._f.close()
+        np.save(_index_path(self.path), np.asarray(self._index_ts, dtype=np.int64))
+        _meta_path(self.path).write_text(
+            json.dumps(
+                {
+                    "version": 1,
+                    "count": self.count,
+                    "index_every": self.index_every,
+                    "symbols": self.symbols,
+                }
+            ),
+            encoding="utf-8",
+        )
+
+
+class JournalReader:
+    """
+    Memory-mapped view of a closed EventJournal with time/symbol/type filters.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        meta = json.loads(_meta_path(self.path).read_text("utf-8"))
+        self.symbols: list[str] = meta["symbols"]
+        self.index_every = int(meta["index_every"])
+        self.count = int(meta["count"])
+        self._index_ts = np.load(_index_path(self.path))
+        if self.count:
+            self.records = np.memmap(
+                self.path, dtype=JOURNAL_DTYPE, mode="r", shape=(self.count,)
+            )
+        else:
+            self.records = np.zeros(0, dtype=JOURNAL_DTYPE)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _bounds(self, start, end) -> tuple[int, int]:
+        # sparse index -> coarse record range, then exact searchsorted inside it
+        lo, hi = 0, self.count
+        if start is not None:
+            k = int(np.searchsorted(self._index_ts, to_epoch_ns(start), side="left"))
+            lo = max(k - 1, 0) * self.index_every
+        if end is not None:
+            k = int(np.searchsorted(self._index_ts, to_epoch_ns(end), side="left"))
+            hi = min(k * self.index_every, self.count)
+        ts = self.records["ts"][lo:hi]
+        a = lo + (
+            0 if start is None else int(np.searchsorted(ts, to_epoch_ns(start), "left"))
+        )
+        b = lo + (
+            len(ts)
+            if end is None
+            else int(np.searchsorted(ts, to_epoch_ns(end), "left"))
+        )
+        return a, b
+
+    def query(
+        self,
+        start=None,
+        end=None,
+        symbols: Iterable[str] | None = None,
+        types: Iterable[EventType] | None = None,
+    ) -> np.ndarray:
+        """
+        Records with start <= ts < end, optionally filtered by symbol / event type.
+        """
+        a, b = self._bounds(start, end)
+        recs = self.records[a:b]
+        mask = np.ones(len(recs), dtype=bool)
+        if symbols is not None:
+            ids = [self.symbols.index(s) for s in symbols if s in self.symbols]
+            mask &= np.isin(recs["symbol_id"], ids)
+        if types is not None:
+            mask &= np.isin(recs["type"], [TYPE_CODES[EventType(t)] for t in types])
+        return recs[mask] if not mask.all() else recs
+
+    def events(self, records: np.ndarray | None = None) -> Iterator:
+        """
+        Rebuild event objects from journal records (ts as epoch-ns ints).
+        """
+        recs = self.records if records is None else records
+        stamps = recs["ts"].tolist()
+        syms = self.symbols
+        for ts, r in zip(stamps, recs.tolist(), strict=True):
+            _, code, side_i, ot, _, sid, f0, f1, f2, f3, f4 = r
+            sym = syms[sid]
+            if code == 1:
+                yield MarketEvent(ts, sym, f0, f1, f2, f3, f4)
+                continue
+            side = Side.BUY if side_i > 0 else Side.SELL
+            if code == 4:
+                yield FillEvent(ts, sym, side, f0, f1, f2)
+            elif code == 3:
+                if ot == _ORDER_CODES[OrderType.LMT]:
+                    yield OrderEvent(ts, sym, side, f0, OrderType.LMT, f1)
+                else:
+                    yield OrderEvent(ts, sym, side, f0, OrderType.MKT)
+            elif code == 2:
+                yield SignalEvent(ts, sym, side, None if f0 != f0 else f0)
+
+
+def replay(
+    journal: str | Path | JournalReader,
+    portfolio=None,
+    strategy=None,
+    start=None,
+    end=None,
+    symbols: Iterable[str] | None = None,
+) -> int:
+    """
+    Re-drive a Portfolio and/or Strategy from a journal, without the feed.
+
+    - portfolio: marked to market on MARKET, updated on FILL (same order as the engine).
+      For a plain per-bar run its history/cash/positions match the original; a
+      MarketBatchEvent run replays bar by bar (one history row per symbol, not per
+      batch), and corporate actions / risk events are not journaled, so runs using
+      them will not reproduce.
+    - strategy: receives every MARKET event (its signals go to its own queue)
+    Returns the number of records replayed.
+    """
+    reader = journal if isinstance(journal, JournalReader) else JournalReader(journal)
+    types = [EventType.MARKET]
+    if portfolio is not None:
+        types.append(EventType.FILL)
+    recs = reader.query(start, end, symbols, types)
+
+    for ev in reader.events(recs):
+        if ev.type == EventType.MARKET:
+            if portfolio is not None:
+                portfolio.update_market_price(ev.symbol, float(ev.close))
+                portfolio.update_timeindex(ev.ts)
+            if strategy is not None:
+                strategy.on_market(ev)
+        elif portfolio is not None:
+            portfolio.on_fill(ev)
+    return len(recs)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Query a binary event journal.")
+    ap.add_argument("path")
+    ap.add_argument("--start", default=None)
+    ap.add_argument("--end", default=None)
+    ap.add_argument("--symbol", action="append", default=None)
+    ap.add_argument(
+        "--type", action="append", default=None, choices=[t.value for t in TYPE_CODES]
+    )
+    ap.add_argument("--limit", type=int, default=50)
+    args = ap.parse_args()
+
+    reader = JournalReader(args.path)
+    recs = reader.query(args.start, args.end, args.symbol, args.type)
+    print(f"{len(recs):,} matching records ({reader.count:,} total)")
+    for i, ev in enumerate(reader.events(recs)):
+        if i >= args.limit:
+            break
+        print(ev)
+
+
+if __name__ == "__main__":
+    main()
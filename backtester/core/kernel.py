@@ -0,0 +1,256 @@
+# backtester/core/kernel.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from backtester.execution.execution_handler import CommissionModel, SlippageModel
+
+try:
+    from numba import njit
+
+    NUMBA_AVAILABLE = True
+except ImportError:  # pure-Python fallback: same code, just not compiled
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+_COMMISSION_CODES = {"per_trade": 0, "percent": 1, "per_share": 2}
+_SLIPPAGE_CODES = {"bps": 0, "spread": 1}
+
+
+@dataclass(frozen=True)
+class KernelResult:
+    """
+    Same per-bar series the event-driven engine records, plus the fill log.
+    equity/cash are recorded before the bar's signal is acted on (like update_timeindex);
+    position is the quantity held after the bar.
+    """
+
+    equity: np.ndarray
+    cash: np.ndarray
+    position: np.ndarray
+    fills: dict[str, np.ndarray]
+
+
+@njit
+def ma_cross_signal(close, i, state):
+    """
+    MovingAverageCrossStrategy as typed state + update function.
+    state = [fast, slow, last_side] (last_side: 0 none, +1 BUY, -1 SELL)
+    Returns +1 / -1 on a regime flip, 0 otherwise.
+    """
+    fast_n = int(state[0])
+    slow_n = int(state[1])
+    if i + 1 < slow_n:
+        return 0
+
+    # sum oldest -> newest, same order as sum(list(prices)[-n:])
+    f = 0.0
+    for k in range(i - fast_n + 1, i + 1):
+        f += close[k]
+    s = 0.0
+    for k in range(i - slow_n + 1, i + 1):
+        s += close[k]
+
+    side = 1 if f / fast_n > s / slow_n else -1
+    if state[2] == 0 or side != state[2]:
+        state[2] = side
+        return side
+    return 0
+
+
+@njit
+def _fused_loop(
+    close,
+    signal_fn,
+    state,
+    starting_cash,
+    target_qty,
+    max_qty,
+    est_fee,
+    comm_code,
+    per_trade_fee,
+    percent_rate,
+    per_share_fee,
+    slip_code,
+    bps,
+    half_spread,
+    equity,
+    cash_out,
+    pos_out,
+    fill_bar,
+    fill_side,
+    fill_qty,
+    fill_px,
+    fill_fee,
+):
+    cash = starting_cash
+    pos = 0.0
+    nf = 0
+
+    for i in range(len(close)):
+        px = close[i]
+
+        # Portfolio.update_timeindex: record before the strategy acts
+        equity[i] = cash + pos * px
+        cash_out[i] = cash
+
+        sig = signal_fn(close, i, state)
+        if sig != 0:
+            # ----- Portfolio.on_signal -----
+            desired = target_qty if sig > 0 else 0.0
+            desired = max(0.0, min(desired, max_qty))
+            delta = desired - pos
+            order_qty = 0.0
+            buy = delta > 0
+            if abs(delta) >= 1e-9:
+                order_qty = abs(delta)
+                if not buy:
+                    order_qty = min(order_qty, pos)
+                else:
+                    max_affordable = (cash - est_fee) / px
+                    if max_affordable <= 0:
+                        order_qty = 0.0
+                    else:
+                        order_qty = min(order_qty, max_affordable)
+
+            if order_qty > 0:
+                # ----- ExecutionHandler.on_order (MKT at last close) -----
+                if slip_code == 1:
+                    fp = px + half_spread if buy else px - half_spread
+                else:
+                    adj = bps / 10_000.0
+                    fp = px * (1.0 + adj) if buy else px * (1.0 - adj)
+
+                if comm_code == 0:
+                    fee = per_trade_fee
+                elif comm_code == 1:
+                    fee = abs(order_qty) * fp * percent_rate
+                elif comm_code == 2:
+                    fee = abs(order_qty) * per_share_fee
+                else:
+                    fee = 0.0
+
+                # ----- Portfolio.on_fill -----
+                if fp > 0:
+                    q = order_qty
+                    applied = True
+                    if buy:
+                        cost = q * fp + fee
+                        if cost > cash + 1e-9:
+                            applied = False
+                        else:
+                            cash -= cost
+                            pos = pos + q
+                    else:
+                        q = min(q, pos)
+                        cash += q * fp - fee
+                        pos = pos - q
+
+                    if applied and q > 0:
+                        fill_bar[nf] = i
+                        fill_side[nf] = 1 if buy else -1
+                        fill_qty[nf] = q
+                        fill_px[nf] = fp
+                        fill_fee[nf] = fee
+                        nf += 1
+
+        pos_out[i] = pos
+
+    return nf
+
+
+def run_kernel(
+    close: np.ndarray,
+    signal_fn,
+    state: np.ndarray,
+    starting_cash: float = 10_000.0,
+    target_qty: float = 100.0,
+    max_qty: float = 200.0,
+    est_fee_per_trade: float = 1.0,
+    commission: CommissionModel | None = None,
+    slippage: SlippageModel | None = None,
+) -> KernelResult:
+    """
+    One compiled pass of strategy -> Portfolio.on_signal -> ExecutionHandler -> on_fill
+    over a single symbol's closes. Same defaults as Portfolio / ExecutionHandler.
+
+    signal_fn(close, i, state) -> +1 BUY / -1 SELL / 0, must be @njit when numba is
+    installed. state is mutated in place.
+    """
+    commission = commission or CommissionModel(model="per_trade", per_trade_fee=1.0)
+    slippage = slippage or SlippageModel(model="bps", bps=0.0)
+
+    px = np.ascontiguousarray(close, dtype=np.float64)
+    n = len(px)
+    equity = np.empty(n)
+    cash = np.empty(n)
+    pos = np.empty(n)
+    fill_bar = np.empty(n, dtype=np.int64)
+    fill_side = np.empty(n, dtype=np.int8)
+    fill_qty = np.empty(n)
+    fill_px = np.empty(n)
+    fill_fee = np.empty(n)
+
+    # the Python fallback indexes lists much faster than arrays
+    src = px if NUMBA_AVAILABLE else px.tolist()
+
+    nf = _fused_loop(
+        src,
+        signal_fn,
+        state,
+        float(starting_cash),
+        float(target_qty),
+        float(max_qty),
+        float(est_fee_per_trade),
+        _COMMISSION_CODES.get(commission.model, 3),
+        float(commission.per_trade_fee),
+        float(commission.percent_rate),
+        float(commission.per_share_fee),
+        _SLIPPAGE_CODES.get(slippage.model, 0),
+        float(slippage.bps),
+        float(slippage.half_spread),
+        equity,
+        cash,
+        pos,
+        fill_bar,
+        fill_side,
+        fill_qty,
+        fill_px,
+        fill_fee,
+    )
+
+    return KernelResult(
+        equity=equity,
+        cash=cash,
+        position=pos,
+        fills={
+            "bar": fill_bar[:nf],
+            "side": fill_side[:nf],
+            "qty": fill_qty[:nf],
+            "price": fill_px[:nf],
+            "fee": fill_fee[:nf],
+        },
+    )
+
+
+def run_ma_cross_kernel(
+    close: np.ndarray,
+    fast: int = 10,
+    slow: int = 30,
+    **kwargs,
+) -> KernelResult:
+    """
+    Compiled equivalent of MovingAverageCrossStrategy + Portfolio + ExecutionHandler.
+    """
+    if fast >= slow:
+        raise ValueError("fast must be < slow")
+    state = np.array([fast, slow, 0.0])
+    return run_kernel(close, ma_cross_signal, state, **kwargs)
@@ -0,0 +1,324 @@
+# backtester/core/live.py
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import inspect
+import time
+from collections import deque
+from collections.abc import AsyncIterable, AsyncIterator, Callable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from backtester.core.engine import BacktestEngine
+from backtester.events import EventType, MarketEvent, OrderEvent, validation
+
+# ----- wire format: one bar per line, "ts,symbol,open,high,low,close,volume\n" -----
+# floats are written with repr(), so a replayed feed is bit-identical to its source
+
+
+def format_bar(event: MarketEvent) -> bytes:
+    return (
+        f"{event.ts},{event.symbol},{event.open!r},{event.high!r},"
+        f"{event.low!r},{event.close!r},{event.volume!r}\n"
+    ).encode()
+
+
+def parse_bar(line: bytes) -> MarketEvent:
+    ts, symbol, o, h, lo, c, v = line.decode().rstrip("\n").split(",")
+    return MarketEvent(
+        int(ts), symbol, float(o), float(h), float(lo), float(c), float(v)
+    )
+
+
+async def async_feed(
+    events: Iterable[MarketEvent], rate: float | None = None
+) -> AsyncIterator[MarketEvent]:
+    """
+    An in-process async feed over `events`, paced at `rate` bars/second (None = unpaced).
+    """
+    t0 = time.perf_counter()
+    for i, event in enumerate(events):
+        if rate:
+            delay = t0 + i / rate - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+        yield event
+        await asyncio.sleep(0)
+
+
+async def socket_feed(host: str, port: int) -> AsyncIterator[MarketEvent]:
+    """
+    Bars from a TCP stream of bar lines (a ReplayServer or a gateway speaking the same format).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while line := await reader.readline():
+            yield parse_bar(line)
+    finally:
+        writer.close()
+        with contextlib.suppress(ConnectionError):
+            await writer.wait_closed()
+
+
+class ReplayServer:
+    """
+    Local stand-in for a market data gateway: each client connection gets a fresh
+    stream of source() as bar lines, paced at `rate` bars/second (None = as fast as
+    the socket drains).
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Iterable[MarketEvent]],
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate: float | None = None,
+    ) -> None:
+        self.source = source
+        self.host = host
+        self.port = port
+        self.rate = rate
+        self._server: asyncio.AbstractServer | None = None
+
+    async def start(self) -> tuple[str, int]:
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        return self.host, self.port
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> ReplayServer:
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            async for event in async_feed(self.source(), self.rate):
+                writer.write(format_bar(event))
+                await writer.drain()
+        except ConnectionError:
+            pass  # client went away
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+
+@dataclass
+class LiveStats:
+    """
+    Counters plus latency samples (ns, perf_counter clock):
+    - queue_ns: bar arrival -> processing start (time spent waiting behind the engine)
+    - bar_to_order_ns: bar arrival -> each order it triggered leaving the portfolio
+    A coalesced bar is timed from its oldest arrival.
+    """
+
+    bars_received: int = 0
+    bars_processed: int = 0
+    bars_coalesced: int = 0
+    orders: int = 0
+    queue_ns: list[int] = field(default_factory=list)
+    bar_to_order_ns: list[int] = field(default_factory=list)
+
+    def summary(self) -> dict[str, float]:
+        out: dict[str, float] = {
+            "bars_received": self.bars_received,
+            "bars_processed": self.bars_processed,
+            "bars_coalesced": self.bars_coalesced,
+            "orders": self.orders,
+        }
+        for name in ("queue_ns", "bar_to_order_ns"):
+            samples = np.asarray(getattr(self, name), dtype=np.float64)
+            if len(samples):
+                p50, p99 = np.percentile(samples, [50, 99])
+                out[f"{name[:-3]}_p50_us"] = float(p50) / 1e3
+                out[f"{name[:-3]}_p99_us"] = float(p99) / 1e3
+                out[f"{name[:-3]}_max_us"] = float(samples.max()) / 1e3
+        return out
+
+
+def coalesce(older: MarketEvent, newer: MarketEvent) -> MarketEvent:
+    """
+    One bar spanning both: first open, extreme high/low, last close, summed volume.
+    """
+    return MarketEvent(
+        ts=newer.ts,
+        symbol=newer.symbol,
+        open=older.open,
+        high=max(older.high, newer.high),
+        low=min(older.low, newer.low),
+        close=newer.close,
+        volume=older.volume + newer.volume,
+    )
+
+
+async def _maybe_await(result: Any) -> None:
+    if inspect.isawaitable(result):
+        await result
+
+
+class LiveEngine:
+    """
+    Asyncio front end for an unchanged BacktestEngine (same strategy / portfolio /
+    execution objects): an async feed is consumed by a receiver task while the
+    engine processes bars one at a time, dispatching exactly like engine.run().
+
+    - coalesce=True: if the engine falls behind, bars waiting for the same symbol
+      are merged (coalesce()) rather than queued, so at most one bar per symbol is
+      ever pending and latency stays bounded by one engine step per symbol;
+      coalesce=False processes every bar in arrival order (the replay mode, whose
+      results match engine.run() on the same events)
+    - on_bar(engine, bar) / on_order(order) may be plain or async callables (e.g. a
+      paper broker acknowledging orders); they are awaited between bars
+    - stats: arrival -> processing and bar -> order latency samples
+    """
+
+    def __init__(
+        self,
+        engine: BacktestEngine,
+        coalesce: bool = True,
+        on_bar: Callable[[BacktestEngine, MarketEvent], Any] | None = None,
+        on_order: Callable[[OrderEvent], Any] | None = None,
+    ) -> None:
+        self.engine = engine
+        self.coalesce = coalesce
+        self.on_bar = on_bar
+        self.on_order = on_order
+        self.stats = LiveStats()
+
+    async def run(
+        self, feed: AsyncIterable[MarketEvent], max_bars: int | None = None
+    ) -> LiveStats:
+        """
+        Process `feed` until it ends (or max_bars bars were processed). Returns stats.
+        """
+        # coalescing: symbol -> (first arrival, bar), re-inserted on update so the
+        # dict stays in latest-arrival order; replay: FIFO of (arrival, bar)
+        latest: dict[str, tuple[int, MarketEvent]] = {}
+        fifo: deque[tuple[int, MarketEvent]] = deque()
+        wake = asyncio.Event()
+        stats = self.stats
+        ended = False
+
+        async def receive() -> None:
+            nonlocal ended
+            try:
+                async for bar in feed:
+                    now = time.perf_counter_ns()
+                    stats.bars_received += 1
+                    if not self.coalesce:
+                        fifo.append((now, bar))
+                    else:
+                        prev = latest.pop(bar.symbol, None)
+                        if prev is None:
+                            latest[bar.symbol] = (now, bar)
+                        else:
+                            stats.bars_coalesced += 1
+                            latest[bar.symbol] = (prev[0], coalesce(prev[1], bar))
+                    wake.set()
+            finally:
+                ended = True
+                wake.set()
+
+        receiver = asyncio.create_task(receive())
+        try:
+            with validation(self.engine.validation):
+                while max_bars is None or stats.bars_processed < max_bars:
+                    if fifo:
+                        arrival, bar = fifo.popleft()
+                    elif latest:
+                        symbol = next(iter(latest))
+                        arrival, bar = latest.pop(symbol)
+                    elif ended:
+                        break
+                    else:
+                        wake.clear()
+                        await wake.wait()
+                        continue
+                    await self._step(bar, arrival)
+                    # let the receiver take in what arrived meanwhile
+                    await asyncio.sleep(0)
+        finally:
+            if not receiver.done():
+                receiver.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await receiver  # re-raises a feed error
+        return stats
+
+    async def _step(self, bar: MarketEvent, arrival: int) -> None:
+        stats = self.stats
+        stats.queue_ns.append(time.perf_counter_ns() - arrival)
+        engine = self.engine
+        events = engine.events
+        events.put(bar)
+        # engine.drain(), with orders timed as they leave the portfolio
+        while not events.empty():
+            event = events.get()
+            if event.type == EventType.ORDER:
+                stats.orders += 1
+                stats.bar_to_order_ns.append(time.perf_counter_ns() - arrival)
+                if self.on_order is not None:
+                    await _maybe_await(self.on_order(event))
+            engine.dispatch(event)
+        stats.bars_processed += 1
+        if self.on_bar is not None:
+            await _maybe_await(self.on_bar(engine, bar))
+
+
+async def paper_trade(
+    engine: BacktestEngine,
+    events: Iterable[MarketEvent],
+    rate: float | None = None,
+    coalesce: bool = True,
+) -> LiveStats:
+    """
+    Serve `events` from a local ReplayServer and trade them through `engine` over the socket.
+    """
+    async with ReplayServer(lambda: events, rate=rate) as server:
+        live = LiveEngine(engine, coalesce=coalesce)
+        return await live.run(socket_feed(server.host, server.port))
+
+
+def main() -> None:
+    from backtester.core.config import load_run_plan
+
+    ap = argparse.ArgumentParser(
+        description="Paper-trade a run plan against a local replay feed."
+    )
+    ap.add_argument("config")
+    ap.add_argument(
+        "--rate", type=float, default=None, help="bars/second (default: unpaced)"
+    )
+    ap.add_argument("--bars", type=int, default=None)
+    ap.add_argument("--no-coalesce", action="store_true")
+    args = ap.parse_args()
+
+    plan = load_run_plan(args.config)
+    engine = plan.build()
+    feed = plan.market_events()
+    if args.bars is not None:
+        feed = (e for _, e in zip(range(args.bars), feed, strict=False))
+    stats = asyncio.run(
+        paper_trade(engine, list(feed), rate=args.rate, coalesce=not args.no_coalesce)
+    )
+    for k, v in stats.summary().items():
+        print(f"{k:>22}: {v:,.1f}" if isinstance(v, float) else f"{k:>22}: {v:,}")
+    print(f"{'equity':>22}: {engine.portfolio.total_value():,.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+# backtester/core/sharding.py
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+
+import numpy as np
+import pandas as pd
+
+from backtester.core.config import RunPlan
+from backtester.data.bar_store import BarStore, to_ns_array
+from backtester.portfolio.ledger import LEDGER_COLUMNS, TradeLedger
+
+
+@dataclass(frozen=True)
+class SleeveResult:
+    """
+    One symbol's independent run: its equity rows (one per bar of the symbol) and fills.
+    """
+
+    symbol: str
+    ts: np.ndarray  # epoch ns
+    equity: np.ndarray
+    cash: np.ndarray
+    fills: dict[str, np.ndarray]  # TradeLedger columns (single symbol, symbol_id 0)
+
+
+@dataclass(frozen=True)
+class ShardedRun:
+    """
+    Portfolio-level result of per-symbol sleeves: equity / cash are the sums of the
+    sleeves' curves on the union of their timestamps (each sleeve carried forward,
+    starting_cash before its first bar); fills are merged in (ts, universe) order.
+    """
+
+    universe: tuple[str, ...]
+    ts: np.ndarray
+    equity: np.ndarray
+    cash: np.ndarray
+    fills: dict[str, np.ndarray]  # symbol_id indexes universe
+    sleeves: dict[str, SleeveResult]
+
+    def equity_curve_df(self) -> pd.DataFrame:
+        idx = pd.DatetimeIndex(self.ts.view("datetime64[ns]"), name="ts")
+        return pd.DataFrame({"equity": self.equity, "cash": self.cash}, index=idx)
+
+    def ledger(self) -> TradeLedger:
+        return TradeLedger.from_arrays(self.fills, list(self.universe))
+
+
+def shard_symbols(symbols: Sequence[str], n_shards: int) -> list[tuple[str, ...]]:
+    """
+    Round-robin split of the universe into at most n_shards non-empty shards.
+    """
+    if n_shards < 1:
+        raise ValueError(f"n_shards must be >= 1, got {n_shards}.")
+    n = min(n_shards, len(symbols))
+    return [tuple(symbols[i::n]) for i in range(n)]
+
+
+def run_sleeve(
+    plan: RunPlan, symbol: str, store: BarStore | None = None
+) -> SleeveResult:
+    """
+    The plan's strategy on one symbol with its own portfolio (plan.portfolio capital).
+    """
+    sub = replace(plan, universe=(symbol,))
+    engine = sub.build()
+    engine.run(sub.market_events(store))
+    portfolio = engine.portfolio
+    hist = portfolio.history
+    return SleeveResult(
+        symbol=symbol,
+        ts=to_ns_array([h["ts"] for h in hist]) if hist else np.zeros(0, np.int64),
+        equity=np.fromiter((h["equity"] for h in hist), np.float64, len(hist)),
+        cash=np.fromiter((h["cash"] for h in hist), np.float64, len(hist)),
+        fills={k: v.copy() for k, v in portfolio.ledger.to_arrays().items()},
+    )
+
+
+def run_shard(plan: RunPlan, symbols: tuple[str, ...]) -> list[SleeveResult]:
+    # process-pool entry point: each worker opens its own (memory-mapped) data
+    store = BarStore(plan.data.path) if plan.data.source == "store" else None
+    return [run_sleeve(plan, s, store) for s in symbols]
+
+
+def merge_sleeves(
+    results: Sequence[SleeveResult],
+    universe: Sequence[str],
+    starting_cash: float,
+) -> ShardedRun:
+    """
+    Timestamp-aligned vectorized sum of sleeve curves, always in universe order, so
+    the floating-point result does not depend on how symbols were sharded.
+    """
+    by_symbol = {r.symbol: r for r in results}
+    missing = [s for s in universe if s not in by_symbol]
+    if missing:
+        raise ValueError(f"merge_sleeves: no result for {missing}.")
+    sleeves = [by_symbol[s] for s in universe]
+
+    ts = (
+        np.unique(np.concatenate([r.ts for r in sleeves]))
+        if sleeves
+        else np.zeros(0, np.int64)
+    )
+    equity = np.zeros(len(ts))
+    cash = np.zeros(len(ts))
+    for r in sleeves:
+        i = np.searchsorted(r.ts, ts, side="right") - 1
+        live = i >= 0
+        i = np.maximum(i, 0)
+        equity += np.where(live, r.equity[i] if len(r.ts) else 0.0, starting_cash)
+        cash += np.where(live, r.cash[i] if len(r.ts) else 0.0, starting_cash)
+
+    parts = []
+    for k, r in enumerate(sleeves):
+        cols = dict(r.fills)
+        cols["symbol_id"] = np.full(len(cols["ts"]), k, dtype=np.int32)
+        parts.append(cols)
+    fills = {
+        c: np.concatenate([p[c] for p in parts]).astype(dt)
+        for c, dt in LEDGER_COLUMNS.items()
+    }
+    # stable: per-symbol fill order kept
+    order = np.lexsort((fills["symbol_id"], fills["ts"]))
+    fills = {c: v[order] for c, v in fills.items()}
+
+    return ShardedRun(
+        tuple(universe), ts, equity, cash, fills, {r.symbol: r for r in sleeves}
+    )
+
+
+def run_sharded(plan: RunPlan, workers: int = 1) -> ShardedRun:
+    """
+    Run every universe symbol as an independent sleeve, sharded across `workers`
+    processes (workers=1 runs in-process). The merged result is identical for any
+    worker count.
+    """
+    shards = shard_symbols(plan.universe, workers)
+    if workers == 1 or len(shards) == 1:
+        results = [r for shard in shards for r in run_shard(plan, shard)]
+    else:
+        with ProcessPoolExecutor(max_workers=len(shards)) as pool:
+            futures = [pool.submit(run_shard, plan, shard) for shard in shards]
+            results = [r for f in futures for r in f.result()]
+    return merge_sleeves(results, plan.universe, plan.portfolio.starting_cash)
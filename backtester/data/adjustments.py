@@ -0,0 +1,218 @@
+# backtester/data/adjustments.py
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import replace
+
+import numpy as np
+
+from backtester.data.bar_store import Bars, to_ns
+from backtester.events import ActionType, CorporateActionEvent, MarketEvent, to_epoch_ns
+
+
+class AdjustmentIndex:
+    """
+    Per-symbol corporate actions as cumulative back-adjustment factors.
+
+    - actions are kept sorted by ex-date; factors are compiled lazily per symbol
+      into (ex_ts, cum_price, cum_volume) so a lookup is one searchsorted
+    - a bar at ts is scaled by every action with ex_ts > ts (later actions only),
+      so raw data is never rewritten: adjust at read time, vectorized
+    - split ratio r: prices / r, volume * r
+    - dividend d: prices * (1 - d / close before the ex-date), volume unchanged
+    - as_of: adjust as seen at that time (actions after it are ignored), for
+      point-in-time research without lookahead
+    """
+
+    def __init__(self) -> None:
+        # symbol -> [(ex_ns, price_factor, volume_factor, event)]
+        self._actions: dict[
+            str, list[tuple[int, float, float, CorporateActionEvent]]
+        ] = {}
+        self._tables: dict[str, tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self._actions.values())
+
+    @property
+    def symbols(self) -> list[str]:
+        return sorted(self._actions)
+
+    def add(self, event: CorporateActionEvent, prev_close: float | None = None) -> None:
+        """
+        Register one action. Dividends need the last close before the ex-date.
+        """
+        if event.action == ActionType.SPLIT:
+            pf, vf = 1.0 / float(event.ratio), float(event.ratio)
+        else:
+            if prev_close is None:
+                raise ValueError(
+                    f"Dividend on {event.symbol} at {event.ts} needs prev_close."
+                )
+            if prev_close <= event.amount:
+                raise ValueError(
+                    f"Dividend {event.amount} on {event.symbol} must be < prev_close {prev_close}."
+                )
+            pf, vf = 1.0 - float(event.amount) / float(prev_close), 1.0
+
+        rows = self._actions.setdefault(event.symbol, [])
+        rows.append((to_epoch_ns(event.ts), pf, vf, event))
+        rows.sort(key=lambda r: r[0])
+        self._tables.pop(event.symbol, None)
+
+    @classmethod
+    def from_actions(
+        cls,
+        actions: Iterable[CorporateActionEvent],
+        bars: Mapping[str, Bars] | None = None,
+    ) -> AdjustmentIndex:
+        """
+        Build from a list of actions; dividend prev_close is looked up in `bars`.
+        """
+        index = cls()
+        for ev in actions:
+            prev_close = None
+            if ev.action == ActionType.DIVIDEND:
+                b = (bars or {}).get(ev.symbol)
+                if b is None:
+                    raise ValueError(
+                        f"Dividend on {ev.symbol} needs its bars for prev_close."
+                    )
+                i = int(np.searchsorted(b.ts, to_epoch_ns(ev.ts), side="left")) - 1
+                if i < 0:
+                    raise ValueError(
+                        f"No bar for {ev.symbol} before dividend ex-date {ev.ts}."
+                    )
+                prev_close = float(b.close[i])
+            index.add(ev, prev_close)
+        return index
+
+    def actions(
+        self, symbol: str | None = None, start=None, end=None
+    ) -> list[CorporateActionEvent]:
+        """
+        Actions with start <= ex-date < end, in ex-date order (all symbols if symbol is None).
+        """
+        rows = (
+            self._actions.get(symbol, [])
+            if symbol is not None
+            else [r for v in self._actions.values() for r in v]
+        )
+        lo = to_ns(start)
+        hi = to_ns(end)
+        out = [
+            r for r in rows if (lo is None or r[0] >= lo) and (hi is None or r[0] < hi)
+        ]
+        out.sort(key=lambda r: r[0])
+        return [r[3] for r in out]
+
+    def _table(self, symbol: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        table = self._tables.get(symbol)
+        if table is None:
+            rows = self._actions.get(symbol, [])
+            ex = np.fromiter((r[0] for r in rows), np.int64, len(rows))
+            pf = np.fromiter((r[1] for r in rows), np.float64, len(rows))
+            vf = np.fromiter((r[2] for r in rows), np.float64, len(rows))
+            # cum[k] = product of factors k..n-1 (cum[n] = 1): the scale for bars
+            # that have seen the first k actions
+            cum_p = np.ones(len(rows) + 1)
+            cum_v = np.ones(len(rows) + 1)
+            cum_p[:-1] = np.cumprod(pf[::-1])[::-1]
+            cum_v[:-1] = np.cumprod(vf[::-1])[::-1]
+            table = self._tables[symbol] = (ex, cum_p, cum_v)
+        return table
+
+    def factors(
+        self, symbol: str, ts: np.ndarray, as_of=None
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        (price_factor, volume_factor) for each bar timestamp (epoch ns).
+        """
+        ex, cum_p, cum_v = self._table(symbol)
+        k = np.searchsorted(ex, np.asarray(ts, dtype=np.int64), side="right")
+        p = cum_p[k]
+        v = cum_v[k]
+        if as_of is not None:
+            j = int(np.searchsorted(ex, to_ns(as_of), side="right"))
+            k = np.minimum(k, j)
+            p = cum_p[k] / cum_p[j]
+            v = cum_v[k] / cum_v[j]
+        return p, v
+
+    def adjust(self, bars: Bars, as_of=None) -> Bars:
+        """
+        Back-adjusted copy of raw bars (the input, e.g. a BarStore mmap, is untouched).
+        """
+        if bars.symbol not in self._actions:
+            return bars
+        p, v = self.factors(bars.symbol, bars.ts, as_of)
+        return replace(
+            bars,
+            open=bars.open * p,
+            high=bars.high * p,
+            low=bars.low * p,
+            close=bars.close * p,
+            volume=bars.volume * v,
+        )
+
+    def adjust_events(
+        self, events: Iterable[MarketEvent], as_of=None
+    ) -> Iterator[MarketEvent]:
+        """
+        Adjust a time-ordered MarketEvent stream (e.g. CSVDataHandler) on the fly.
+        Symbols without actions pass through untouched.
+        """
+        tables = {s: self._table(s) for s in self._actions}
+        limit = None if as_of is None else to_ns(as_of)
+        # per symbol: number of actions known at as_of
+        known = {
+            s: (
+                len(t[0])
+                if limit is None
+                else int(np.searchsorted(t[0], limit, side="right"))
+            )
+            for s, t in tables.items()
+        }
+        for ev in events:
+            table = tables.get(ev.symbol)
+            if table is None:
+                yield ev
+                continue
+            ex, cum_p, cum_v = table
+            t = to_epoch_ns(ev.ts)
+            j = known[ev.symbol]
+            k = min(int(np.searchsorted(ex, t, side="right")), j)
+            p = float(cum_p[k] / cum_p[j])
+            v = float(cum_v[k] / cum_v[j])
+            if p == 1.0 and v == 1.0:
+                yield ev
+                continue
+            yield replace(
+                ev,
+                open=ev.open * p,
+                high=ev.high * p,
+                low=ev.low * p,
+                close=ev.close * p,
+                volume=ev.volume * v,
+            )
+
+
+def with_actions(
+    events: Iterable[MarketEvent],
+    actions: Iterable[CorporateActionEvent],
+) -> Iterator[MarketEvent | CorporateActionEvent]:
+    """
+    Interleave corporate actions into a raw, time-ordered feed: each action is
+    emitted right before the first bar at or after its ex-date, so the Portfolio
+    rescales positions / books dividends before trading on post-action prices.
+    """
+    pending = sorted((to_epoch_ns(a.ts), k, a) for k, a in enumerate(actions))
+    i = 0
+    for ev in events:
+        if i < len(pending):
+            t = to_epoch_ns(ev.ts)
+            while i < len(pending) and pending[i][0] <= t:
+                yield pending[i][2]
+                i += 1
+        yield ev
@@ -0,0 +1,252 @@
+# backtester/data/bar_store.py
+
+from __future__ import annotations
+
+import hashlib
+import warnings
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.events import MarketBatchEvent, MarketEvent, to_epoch_ns
+
+FIELDS = ("ts", "open", "high", "low", "close", "volume")
+_PRICE_FIELDS = FIELDS[1:]
+
+
+def to_ns(ts) -> int | None:
+    if ts is None:
+        return None
+    if isinstance(ts, np.integer):
+        return int(ts)
+    return to_epoch_ns(ts)
+
+
+def to_ns_array(stamps: list) -> np.ndarray:
+    """
+    Vectorized to_epoch_ns (naive timestamps read as UTC).
+    """
+    if not stamps:
+        return np.zeros(0, dtype=np.int64)
+    if isinstance(stamps[0], int):
+        try:
+            return np.asarray(stamps, dtype=np.int64)
+        except (TypeError, ValueError):
+            # ints mixed with edge-format strings / datetimes
+            return np.fromiter(
+                (to_epoch_ns(t) for t in stamps), dtype=np.int64, count=len(stamps)
+            )
+    try:
+        # fast path: naive ISO strings (numpy only warns on tz offsets)
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            return np.asarray(stamps, dtype="datetime64[ns]").view(np.int64)
+    except (TypeError, ValueError, UserWarning):
+        pass
+    try:
+        return pd.to_datetime(stamps, utc=True, format="ISO8601").as_unit("ns").asi8
+    except (TypeError, ValueError):
+        return np.fromiter(
+            (to_epoch_ns(t) for t in stamps), dtype=np.int64, count=len(stamps)
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class Bars:
+    """
+    Columnar OHLCV for one symbol.
+    ts is int64 epoch nanoseconds (sorted), prices/volume are float64.
+    """
+
+    symbol: str
+    ts: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+
+    def __post_init__(self) -> None:
+        if not self.symbol or not self.symbol.strip():
+            raise ValueError("Bars.symbol must be a non-empty string.")
+        n = len(self.ts)
+        for name in FIELDS[1:]:
+            if len(getattr(self, name)) != n:
+                raise ValueError(
+                    f"Bars.{name} length {len(getattr(self, name))} != ts length {n}."
+                )
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def slice(self, start: int, stop: int) -> Bars:
+        return Bars(
+            symbol=self.symbol,
+            ts=self.ts[start:stop],
+            open=self.open[start:stop],
+            high=self.high[start:stop],
+            low=self.low[start:stop],
+            close=self.close[start:stop],
+            volume=self.volume[start:stop],
+        )
+
+    def window(self, start=None, end=None) -> Bars:
+        """
+        Bars with start <= ts < end (either bound may be None). O(log n) via searchsorted.
+        """
+        lo = (
+            0
+            if start is None
+            else int(np.searchsorted(self.ts, to_ns(start), side="left"))
+        )
+        hi = (
+            len(self)
+            if end is None
+            else int(np.searchsorted(self.ts, to_ns(end), side="left"))
+        )
+        return self.slice(lo, hi)
+
+    def fingerprint(self) -> str:
+        """
+        Content hash of the bar arrays (stable across processes/hosts).
+        """
+        h = hashlib.sha256(self.symbol.encode())
+        for name in FIELDS:
+            h.update(np.ascontiguousarray(getattr(self, name)).tobytes())
+        return h.hexdigest()
+
+    def market_events(self) -> Iterator[MarketEvent]:
+        # epoch-ns ints, the canonical event timestamp (no per-event parsing)
+        sym = self.symbol
+        for ts, o, h, lo, c, v in zip(
+            self.ts.tolist(),
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+            strict=True,
+        ):
+            yield MarketEvent(
+                ts=ts, symbol=sym, open=o, high=h, low=lo, close=c, volume=v
+            )
+
+
+def market_batches(bars: Iterable[Bars]) -> Iterator[MarketBatchEvent]:
+    """
+    Merge several symbols' bars into one MarketBatchEvent per distinct timestamp
+    (columns are views into the merged arrays; symbols keep the input order).
+    Batches with the same symbol set share one symbols tuple.
+    """
+    items = [b for b in bars if len(b)]
+    if not items:
+        return
+    names = [b.symbol for b in items]
+    if len(set(names)) != len(names):
+        raise ValueError(f"market_batches got duplicate symbols: {names}")
+
+    ts = np.concatenate([b.ts for b in items])
+    sid = np.concatenate(
+        [np.full(len(b), i, dtype=np.int32) for i, b in enumerate(items)]
+    )
+    order = np.lexsort((sid, ts))
+    ts = ts[order]
+    sid = sid[order]
+    cols = {
+        f: np.concatenate([getattr(b, f) for b in items])[order] for f in _PRICE_FIELDS
+    }
+
+    bounds = np.flatnonzero(np.r_[True, ts[1:] != ts[:-1], True])
+    stamps = ts[bounds[:-1]].tolist()
+    universes: dict[bytes, tuple[str, ...]] = {}
+    o, h, lo, c, v = (cols[f] for f in _PRICE_FIELDS)
+
+    for k, (a, b) in enumerate(
+        zip(bounds[:-1].tolist(), bounds[1:].tolist(), strict=True)
+    ):
+        key = sid[a:b].tobytes()
+        symbols = universes.get(key)
+        if symbols is None:
+            symbols = universes[key] = tuple(names[i] for i in sid[a:b].tolist())
+        yield MarketBatchEvent(
+            stamps[k], symbols, o[a:b], h[a:b], lo[a:b], c[a:b], v[a:b]
+        )
+
+
+def bars_from_csv(handler: CSVDataHandler) -> Bars:
+    """
+    Vectorized load of a CSVDataHandler source into columnar Bars.
+    """
+    path = Path(handler.csv_path)
+    if not path.exists():
+        raise FileNotFoundError(f"CSV not found: {path}")
+
+    df = pd.read_csv(path, usecols=csv_columns(handler), encoding="utf-8-sig")
+    return frame_to_bars(df, handler)
+
+
+def csv_columns(handler: CSVDataHandler) -> list[str]:
+    return [
+        handler.ts_col,
+        handler.open_col,
+        handler.high_col,
+        handler.low_col,
+        handler.close_col,
+        handler.volume_col,
+    ]
+
+
+def frame_to_bars(df: pd.DataFrame, handler: CSVDataHandler) -> Bars:
+    ts = pd.to_datetime(df[handler.ts_col], format="mixed")
+    if ts.dt.tz is not None:
+        ts = ts.dt.tz_convert("UTC").dt.tz_localize(None)
+
+    return Bars(
+        symbol=handler.symbol,
+        ts=ts.to_numpy(dtype="datetime64[ns]").view(np.int64),
+        open=df[handler.open_col].to_numpy(dtype=np.float64),
+        high=df[handler.high_col].to_numpy(dtype=np.float64),
+        low=df[handler.low_col].to_numpy(dtype=np.float64),
+        close=df[handler.close_col].to_numpy(dtype=np.float64),
+        volume=df[handler.volume_col].fillna(0.0).to_numpy(dtype=np.float64),
+    )
+
+
+class BarStore:
+    """
+    Local columnar bar cache: <root>/<symbol>/<field>.npy
+    Arrays are memory-mapped on read, so attaching to a symbol is ~free.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def path_for(self, symbol: str) -> Path:
+        return self.root / symbol
+
+    def has(self, symbol: str) -> bool:
+        return (self.path_for(symbol) / "ts.npy").exists()
+
+    def put(self, bars: Bars) -> Path:
+        out = self.path_for(bars.symbol)
+        out.mkdir(parents=True, exist_ok=True)
+        for name in FIELDS:
+            np.save(out / f"{name}.npy", np.ascontiguousarray(getattr(bars, name)))
+        return out
+
+    def get(self, symbol: str, mmap: bool = True) -> Bars:
+        src = self.path_for(symbol)
+        if not self.has(symbol):
+            raise FileNotFoundError(f"No cached bars for {symbol!r} under {self.root}")
+        mode = "r" if mmap else None
+        arrays = {name: np.load(src / f"{name}.npy", mmap_mode=mode) for name in FIELDS}
+        return Bars(symbol=symbol, **arrays)
+
+    def ingest_csv(self, handler: CSVDataHandler) -> Bars:
+        bars = bars_from_csv(handler)
+        self.put(bars)
+        return bars
@@ -0,0 +1,267 @@
+# backtester/data/calendar.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field, replace
+from datetime import date, time, timedelta
+
+import numpy as np
+import pandas as pd
+
+from backtester.data.bar_store import Bars, to_ns
+
+_NS_PER_DAY = 86_400 * 10**9
+_DAY = np.timedelta64(1, "D")
+
+
+def _ns_of_day(t: time) -> int:
+    return ((t.hour * 60 + t.minute) * 60 + t.second) * 10**9
+
+
+def _nth_weekday(year: int, month: int, weekday: int, n: int) -> date:
+    # n-th (1-based) weekday of a month; n = -1 for the last one
+    if n > 0:
+        d = date(year, month, 1)
+        d += timedelta(days=(weekday - d.weekday()) % 7 + 7 * (n - 1))
+        return d
+    d = date(year + (month == 12), month % 12 + 1, 1) - timedelta(days=1)
+    return d - timedelta(days=(d.weekday() - weekday) % 7)
+
+
+def _easter(year: int) -> date:
+    # anonymous Gregorian algorithm
+    a, b, c = year % 19, year // 100, year % 100
+    d, e = b // 4, b % 4
+    f = (b + 8) // 25
+    g = (b - f + 1) // 3
+    h = (19 * a + b - d - g + 15) % 30
+    i, k = c // 4, c % 4
+    m = (32 + 2 * e + 2 * i - h - k) % 7
+    n = (a + 11 * h + 22 * m) // 451
+    month = (h + m - 7 * n + 114) // 31
+    return date(year, month, (h + m - 7 * n + 114) % 31 + 1)
+
+
+def _observed(d: date) -> date:
+    # Saturday -> Friday, Sunday -> Monday
+    if d.weekday() == 5:
+        return d - timedelta(days=1)
+    if d.weekday() == 6:
+        return d + timedelta(days=1)
+    return d
+
+
+def nyse_holidays(year: int) -> tuple[set[date], set[date]]:
+    """
+    (full-day closures, 13:00 early closes) for one year, rule-based.
+    """
+    closed = {
+        _nth_weekday(year, 1, 0, 3),  # MLK day
+        _nth_weekday(year, 2, 0, 3),  # Presidents' day
+        _easter(year) - timedelta(days=2),  # Good Friday
+        _nth_weekday(year, 5, 0, -1),  # Memorial day
+        _observed(date(year, 7, 4)),
+        _nth_weekday(year, 9, 0, 1),  # Labor day
+        _nth_weekday(year, 11, 3, 4),  # Thanksgiving
+        _observed(date(year, 12, 25)),
+    }
+    new_year = date(year, 1, 1)
+    if new_year.weekday() != 5:  # a Saturday New Year is not observed on Dec 31
+        closed.add(_observed(new_year))
+    if year >= 2022:
+        closed.add(_observed(date(year, 6, 19)))
+
+    early = {_nth_weekday(year, 11, 3, 4) + timedelta(days=1)}  # day after Thanksgiving
+    for d in (date(year, 7, 3), date(year, 12, 24)):
+        if d.weekday() < 5 and d not in closed:
+            early.add(d)
+    return closed, early
+
+
+@dataclass(frozen=True)
+class TradingCalendar:
+    """
+    Exchange sessions (default: NYSE regular + extended hours).
+
+    data_tz: timezone of the bar timestamps; None means they are already
+    exchange-local wall clock (typical of vendor minute CSVs), otherwise they
+    are converted to `tz` before sessionizing.
+    """
+
+    tz: str = "America/New_York"
+    data_tz: str | None = None
+    rth_open: time = time(9, 30)
+    rth_close: time = time(16, 0)
+    eth_open: time = time(4, 0)
+    eth_close: time = time(20, 0)
+    early_close: time = time(13, 0)
+    weekdays: tuple[int, ...] = (0, 1, 2, 3, 4)
+    extra_holidays: tuple[date, ...] = field(default_factory=tuple)
+
+    def sessions(self, first: date, last: date) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Trading dates in [first, last] and their RTH close (ns of day).
+        """
+        days = np.arange(np.datetime64(first, "D"), np.datetime64(last, "D") + _DAY)
+        dow = (days.astype(np.int64) + 3) % 7  # 1970-01-01 was a Thursday
+        keep = np.isin(dow, self.weekdays)
+
+        closed: set[date] = set(self.extra_holidays)
+        early: set[date] = set()
+        for year in range(first.year, last.year + 1):
+            c, e = nyse_holidays(year)
+            closed |= c
+            early |= e
+        if closed:
+            keep &= ~np.isin(days, np.array(sorted(closed), dtype="datetime64[D]"))
+        days = days[keep]
+
+        close = np.full(len(days), _ns_of_day(self.rth_close), dtype=np.int64)
+        if early:
+            close[np.isin(days, np.array(sorted(early), dtype="datetime64[D]"))] = (
+                _ns_of_day(self.early_close)
+            )
+        return days, close
+
+    def sessions_per_year(self, first: date, last: date) -> float:
+        """
+        Average session count over the whole calendar years covering [first, last].
+        """
+        days, _ = self.sessions(date(first.year, 1, 1), date(last.year, 12, 31))
+        return len(days) / (last.year - first.year + 1)
+
+    def index(self, ts: np.ndarray) -> SessionIndex:
+        return SessionIndex(self, np.asarray(ts, dtype=np.int64))
+
+
+class SessionIndex:
+    """
+    Session structure of one loaded, time-sorted bar series (epoch ns).
+
+    - session_id[i]: index into session_dates, -1 for bars outside any session
+    - rth_mask / eth_mask: vectorized regular / extended-hours masks
+    - session_start[k]: first bar of session k (searchsorted bounds)
+    - is_session_end[i]: last in-session bar of its session (end-of-day hooks)
+    """
+
+    def __init__(self, calendar: TradingCalendar, ts: np.ndarray) -> None:
+        self.calendar = calendar
+        self.ts = ts
+        cal = calendar
+
+        local = ts
+        if cal.data_tz is not None and len(ts):
+            local = (
+                pd.DatetimeIndex(ts.view("datetime64[ns]"))
+                .tz_localize(cal.data_tz)
+                .tz_convert(cal.tz)
+                .tz_localize(None)
+                .as_unit("ns")
+                .asi8
+            )
+        self.local_ts = local
+
+        day = local // _NS_PER_DAY
+        tod = local - day * _NS_PER_DAY
+        if len(ts):
+            first = date(1970, 1, 1) + timedelta(days=int(day[0]))
+            last = date(1970, 1, 1) + timedelta(days=int(day[-1]))
+            dates, close = cal.sessions(first, last)
+        else:
+            dates, close = np.zeros(0, "datetime64[D]"), np.zeros(0, np.int64)
+
+        # bar -> session by calendar day
+        if len(dates):
+            session_days = dates.astype(np.int64)
+            k = np.minimum(np.searchsorted(session_days, day), len(dates) - 1)
+            on_day = session_days[k] == day
+            bar_close = close[k]
+        else:
+            k = np.zeros(len(ts), dtype=np.int64)
+            on_day = np.zeros(len(ts), dtype=bool)
+            bar_close = np.zeros(len(ts), dtype=np.int64)
+
+        self.rth_mask = on_day & (tod >= _ns_of_day(cal.rth_open)) & (tod < bar_close)
+        in_eth = (
+            on_day
+            & (tod >= _ns_of_day(cal.eth_open))
+            & (tod < _ns_of_day(cal.eth_close))
+        )
+        self.eth_mask = in_eth & ~self.rth_mask
+        self.session_id = np.where(in_eth, k, -1).astype(np.int32)
+
+        # keep only sessions that actually have bars (remap[-1] stays -1)
+        present = np.unique(self.session_id[self.session_id >= 0])
+        remap = np.full(len(dates) + 1, -1, dtype=np.int32)
+        remap[present] = np.arange(len(present), dtype=np.int32)
+        self.session_id = remap[self.session_id]
+        self.session_dates = dates[present]
+        self.session_close = close[present]
+
+        in_session = np.flatnonzero(self.session_id >= 0)
+        sid = self.session_id[in_session]
+        starts = np.r_[True, sid[1:] != sid[:-1]] if len(sid) else np.zeros(0, bool)
+        ends = np.r_[sid[1:] != sid[:-1], True] if len(sid) else np.zeros(0, bool)
+        self.session_start = in_session[starts]
+        self.is_session_end = np.zeros(len(ts), dtype=bool)
+        self.is_session_end[in_session[ends]] = True
+
+    def __len__(self) -> int:
+        return len(self.session_dates)
+
+    def seek(self, when) -> int:
+        """
+        First bar at or after `when` (timestamp or date). O(log n).
+        """
+        if not isinstance(when, (int, np.integer)):
+            when = str(when)  # dates / Timestamps via their ISO form
+        return int(np.searchsorted(self.ts, to_ns(when), side="left"))
+
+    def session_slice(self, day) -> slice:
+        """
+        Bars of the session on `day` (empty slice if not a session with data).
+        """
+        k = int(np.searchsorted(self.session_dates, np.datetime64(str(day)[:10], "D")))
+        if k >= len(self.session_dates) or self.session_dates[k] != np.datetime64(
+            str(day)[:10], "D"
+        ):
+            return slice(0, 0)
+        start = int(self.session_start[k])
+        stop = int(np.flatnonzero(self.is_session_end[start:])[0]) + start + 1
+        return slice(start, stop)
+
+    def filter(self, bars: Bars, rth: bool = True) -> Bars:
+        """
+        RTH-only (or extended-hours-only) copy of the bars this index was built from.
+        """
+        if len(bars) != len(self.ts):
+            raise ValueError(
+                "SessionIndex.filter: bars do not match the indexed series."
+            )
+        m = self.rth_mask if rth else self.eth_mask
+        return replace(
+            bars,
+            ts=bars.ts[m],
+            open=bars.open[m],
+            high=bars.high[m],
+            low=bars.low[m],
+            close=bars.close[m],
+            volume=bars.volume[m],
+        )
+
+    def bars_per_session(self, rth: bool = True) -> float:
+        if not len(self):
+            return 0.0
+        mask = self.rth_mask if rth else self.session_id >= 0
+        return float(mask.sum()) / len(self)
+
+    def periods_per_year(self, rth: bool = True) -> float:
+        """
+        Exact annualization factor for compute_metrics on this data:
+        sessions per year (from the calendar) x observed bars per session.
+        """
+        if not len(self):
+            raise ValueError("SessionIndex has no sessions; cannot annualize.")
+        first = self.session_dates[0].astype(object)
+        last = self.session_dates[-1].astype(object)
+        return self.calendar.sessions_per_year(first, last) * self.bars_per_session(rth)
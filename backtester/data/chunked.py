@@ -0,0 +1,91 @@
+# backtester/data/chunked.py
+
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+import pandas as pd
+
+from backtester.data.bar_store import Bars, csv_columns, frame_to_bars
+from backtester.data.csv_data_handler import CSVDataHandler
+
+T = TypeVar("T")
+
+
+def iter_csv_chunks(handler: CSVDataHandler, chunk_rows: int) -> Iterator[Bars]:
+    """
+    Stream a CSVDataHandler source as fixed-size columnar Bars chunks.
+    """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be > 0, got {chunk_rows}.")
+    reader = pd.read_csv(
+        handler.csv_path,
+        usecols=csv_columns(handler),
+        encoding="utf-8-sig",
+        chunksize=chunk_rows,
+    )
+    with reader:
+        for df in reader:
+            yield frame_to_bars(df, handler)
+
+
+def iter_bar_chunks(bars: Bars, chunk_rows: int) -> Iterator[Bars]:
+    """
+    Fixed-size slices of columnar bars (zero-copy; with BarStore.get(mmap=True)
+    only the pages of the current chunk are resident).
+    """
+    if chunk_rows <= 0:
+        raise ValueError(f"chunk_rows must be > 0, got {chunk_rows}.")
+    for start in range(0, len(bars), chunk_rows):
+        yield bars.slice(start, start + chunk_rows)
+
+
+_DONE = object()
+
+
+def prefetch(chunks: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    Load up to `depth` chunks ahead on a background thread
+    (chunk k+1 is read while chunk k is being processed).
+
+    If the consumer stops early (break, exception, close()), the loader is
+    told to stop and joined, so no thread is left blocked on a full queue.
+    """
+    q: queue.Queue = queue.Queue(maxsize=max(int(depth), 1))
+    stop = threading.Event()
+
+    def _put(item) -> bool:
+        # bounded put that gives up once the consumer is gone
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.05)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _load() -> None:
+        try:
+            for c in chunks:
+                if not _put(c):
+                    return
+        except BaseException as e:  # hand the error to the consumer
+            _put(e)
+        _put(_DONE)
+
+    t = threading.Thread(target=_load, daemon=True)
+    t.start()
+    try:
+        while True:
+            item = q.get()
+            if item is _DONE:
+                break
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        t.join()
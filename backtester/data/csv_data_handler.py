@@ -6,14 +6,10 @@ from datetime import datetime
 from pathlib import Path
 from typing import Iterator
 
-from backtester.events import MarketEvent
+from backtester.events import MarketEvent, to_epoch_ns
 
 
-def parse_ts(raw: str) -> str:
-    """
-    Return ISO-8601 string with timezone if possible (ends with 'Z' or '+00:00').
-    Your MarketEvent accepts str or datetime; we'll store a normalized ISO string.
-    """
+def _parse_dt(raw: str) -> datetime:
     s = raw.strip()
 
     # Try common formats (daily + intraday)
@@ -27,19 +23,31 @@ def parse_ts(raw: str) -> str:
     ]
     for fmt in fmts:
         try:
-            dt = datetime.strptime(s, fmt)
-            return dt.isoformat()
+            return datetime.strptime(s, fmt)
         except ValueError:
             pass
 
     # ISO fallback
     try:
-        dt = datetime.fromisoformat(s.replace("Z", "+00:00"))
-        return dt.isoformat()
+        return datetime.fromisoformat(s.replace("Z", "+00:00"))
     except ValueError as e:
         raise ValueError(f"Unrecognized timestamp format: {raw!r}") from e
 
 
+def parse_ts(raw: str) -> str:
+    """
+    Return ISO-8601 string with timezone if possible (ends with 'Z' or '+00:00').
+    """
+    return _parse_dt(raw).isoformat()
+
+
+def parse_ts_ns(raw: str) -> int:
+    """
+    Epoch nanoseconds (naive read as UTC): the canonical event timestamp, parsed once here.
+    """
+    return to_epoch_ns(_parse_dt(raw))
+
+
 @dataclass(slots=True)
 class CSVDataHandler:
     csv_path: str
@@ -64,16 +72,22 @@ class CSVDataHandler:
                 raise ValueError("CSV has no header row.")
 
             required = {
-                self.ts_col, self.open_col, self.high_col,
-                self.low_col, self.close_col, self.volume_col
+                self.ts_col,
+                self.open_col,
+                self.high_col,
+                self.low_col,
+                self.close_col,
+                self.volume_col,
             }
             missing = required - set(reader.fieldnames)
             if missing:
-                raise ValueError(f"Missing columns: {missing}. Found: {reader.fieldnames}")
+                raise ValueError(
+                    f"Missing columns: {missing}. Found: {reader.fieldnames}"
+                )
 
             for row in reader:
                 yield MarketEvent(
-                    ts=parse_ts(row[self.ts_col]),
+                    ts=parse_ts_ns(row[self.ts_col]),
                     symbol=self.symbol,
                     open=float(row[self.open_col]),
                     high=float(row[self.high_col]),
@@ -0,0 +1,275 @@
+# backtester/data/parquet_data_handler.py
+
+from __future__ import annotations
+
+import argparse
+from collections.abc import Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from backtester.data.bar_store import FIELDS, Bars, bars_from_csv, to_ns, to_ns_array
+from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.events import MarketEvent
+
+
+def _arrow() -> tuple[Any, Any, Any]:
+    # pyarrow is optional: only Parquet sources need it
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+    except ImportError as e:
+        raise ImportError("Parquet data needs pyarrow: pip install pyarrow") from e
+    return pa, pc, ds
+
+
+@dataclass(slots=True)
+class ParquetDataHandler:
+    """
+    Bars from a Parquet file or a (hive-partitioned) Parquet dataset directory.
+
+    - only the ts + OHLCV columns are read (column projection)
+    - the symbol filter and the [start, end) window are pushed down: partitions
+      (symbol=/year=) prune whole files, row-group min/max statistics skip row
+      groups, so a one-symbol year touches only its own row groups
+    - iter_batches() yields columnar Bars per record batch (usable as run_chunked
+      chunks); stream_market_events() matches CSVDataHandler
+    Rows are returned in file order; convert_csv() writes them sorted by ts.
+    """
+
+    path: str
+    symbol: str
+    start: str | None = None
+    end: str | None = None
+
+    ts_col: str = "timestamp"
+    open_col: str = "open"
+    high_col: str = "high"
+    low_col: str = "low"
+    close_col: str = "close"
+    volume_col: str = "volume"
+    symbol_col: str = "symbol"
+    batch_rows: int = 65_536
+
+    def dataset(self):
+        _, _, ds = _arrow()
+        path = Path(self.path)
+        if not path.exists():
+            raise FileNotFoundError(f"Parquet data not found: {path}")
+        return ds.dataset(str(path), format="parquet", partitioning="hive")
+
+    def columns(self) -> list[str]:
+        return [
+            self.ts_col,
+            self.open_col,
+            self.high_col,
+            self.low_col,
+            self.close_col,
+            self.volume_col,
+        ]
+
+    def filter(self, dataset):
+        """
+        Pushdown predicate: symbol (if the data has a symbol column/partition) and window.
+        """
+        pa, pc, _ = _arrow()
+        schema = dataset.schema
+        missing = set(self.columns()) - set(schema.names)
+        if missing:
+            raise ValueError(f"Missing columns: {missing}. Found: {schema.names}")
+
+        expr = None
+        if self.symbol_col in schema.names:
+            expr = pc.field(self.symbol_col) == self.symbol
+        if self.start is None and self.end is None:
+            return expr
+
+        ts_type = schema.field(self.ts_col).type
+        if not pa.types.is_timestamp(ts_type):
+            raise ValueError(
+                f"ParquetDataHandler window needs a timestamp {self.ts_col!r} column, got {ts_type}."
+            )
+        ts = pc.field(self.ts_col)
+        by_year = "year" in schema.names and pa.types.is_integer(
+            schema.field("year").type
+        )
+        for bound, lower in ((self.start, True), (self.end, False)):
+            ns = to_ns(bound)
+            if ns is None:
+                continue
+            # naive bounds are read as UTC, like to_epoch_ns
+            scalar = pa.scalar(ns, pa.timestamp("ns", ts_type.tz)).cast(
+                ts_type, safe=False
+            )
+            cond = ts >= scalar if lower else ts < scalar
+            if by_year:
+                # year= partitions are pruned from the path alone, without opening footers
+                year = (
+                    int(
+                        np.datetime64(ns, "ns").astype("datetime64[Y]").astype(np.int64)
+                    )
+                    + 1970
+                )
+                cond = cond & (
+                    pc.field("year") >= year if lower else pc.field("year") <= year
+                )
+            expr = cond if expr is None else expr & cond
+        return expr
+
+    def row_groups(self) -> tuple[int, int]:
+        """
+        (row groups left after pushdown, row groups in the dataset), i.e. what a read touches.
+        """
+        dataset = self.dataset()
+        expr = self.filter(dataset)
+        total = kept = 0
+        for frag in dataset.get_fragments():
+            total += frag.metadata.num_row_groups
+        for frag in dataset.get_fragments(filter=expr):
+            kept += len(frag.split_by_row_group(expr, schema=dataset.schema))
+        return kept, total
+
+    def iter_batches(self) -> Iterator[Bars]:
+        pa, _, _ = _arrow()
+        dataset = self.dataset()
+        scanner = dataset.scanner(
+            columns=self.columns(),
+            filter=self.filter(dataset),
+            batch_size=self.batch_rows,
+            use_threads=False,  # keep file order
+        )
+        for batch in scanner.to_batches():
+            if batch.num_rows:
+                yield self._to_bars(batch, pa)
+
+    def _to_bars(self, batch, pa) -> Bars:
+        ts = batch.column(self.ts_col)
+        if pa.types.is_timestamp(ts.type):
+            ts = ts.cast(pa.timestamp("ns", ts.type.tz)).to_numpy().view(np.int64)
+        else:
+            # e.g. ISO strings straight from a CSV export
+            ts = to_ns_array(ts.to_pylist())
+        return Bars(
+            symbol=self.symbol,
+            ts=np.ascontiguousarray(ts, dtype=np.int64),
+            open=batch.column(self.open_col).to_numpy().astype(np.float64, copy=False),
+            high=batch.column(self.high_col).to_numpy().astype(np.float64, copy=False),
+            low=batch.column(self.low_col).to_numpy().astype(np.float64, copy=False),
+            close=batch.column(self.close_col)
+            .to_numpy()
+            .astype(np.float64, copy=False),
+            volume=np.nan_to_num(
+                batch.column(self.volume_col)
+                .to_numpy(zero_copy_only=False)
+                .astype(np.float64)
+            ),
+        )
+
+    def load(self) -> Bars:
+        """
+        The whole (filtered) selection as one Bars.
+        """
+        parts = list(self.iter_batches())
+        if not parts:
+            empty = np.zeros(0)
+            return Bars(
+                self.symbol, np.zeros(0, np.int64), empty, empty, empty, empty, empty
+            )
+        if len(parts) == 1:
+            return parts[0]
+        return Bars(
+            symbol=self.symbol,
+            **{f: np.concatenate([getattr(b, f) for b in parts]) for f in FIELDS},
+        )
+
+    def stream_market_events(self) -> Iterator[MarketEvent]:
+        for bars in self.iter_batches():
+            yield from bars.market_events()
+
+
+def bars_to_table(bars: Bars):
+    """
+    Arrow table (symbol, year, timestamp[ns], OHLCV) for one symbol's bars.
+    """
+    pa, _, _ = _arrow()
+    ts = bars.ts.astype("datetime64[ns]")
+    return pa.table(
+        {
+            "symbol": pa.array(
+                np.full(len(bars), bars.symbol, dtype=object), pa.string()
+            ),
+            "year": pa.array(
+                ts.astype("datetime64[Y]").astype(np.int64) + 1970, pa.int32()
+            ),
+            "timestamp": pa.array(ts, pa.timestamp("ns")),
+            "open": bars.open,
+            "high": bars.high,
+            "low": bars.low,
+            "close": bars.close,
+            "volume": bars.volume,
+        }
+    )
+
+
+def write_bars(bars: Bars, out_dir: str | Path, row_group_rows: int = 32_768) -> Path:
+    """
+    Append one symbol to a hive-partitioned dataset: <out>/symbol=X/year=YYYY/*.parquet,
+    sorted by ts with row groups of row_group_rows (smaller groups = finer pushdown).
+    """
+    _, _, ds = _arrow()
+    order = np.argsort(bars.ts, kind="stable")
+    if np.any(order != np.arange(len(order))):
+        bars = Bars(bars.symbol, *(getattr(bars, f)[order] for f in FIELDS))
+    out = Path(out_dir)
+    ds.write_dataset(
+        bars_to_table(bars),
+        str(out),
+        format="parquet",
+        partitioning=["symbol", "year"],
+        partitioning_flavor="hive",
+        basename_template=f"{bars.symbol}-{{i}}.parquet",
+        max_rows_per_group=row_group_rows,
+        min_rows_per_group=min(row_group_rows, max(len(bars), 1)),
+        existing_data_behavior="delete_matching",
+    )
+    return out / f"symbol={bars.symbol}"
+
+
+def convert_csv(
+    handler: CSVDataHandler, out_dir: str | Path, row_group_rows: int = 32_768
+) -> Bars:
+    """
+    CSVDataHandler source -> partitioned Parquet (the symbol's partitions are replaced).
+    """
+    bars = bars_from_csv(handler)
+    write_bars(bars, out_dir, row_group_rows)
+    return bars
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Convert bar CSVs to a partitioned Parquet dataset."
+    )
+    ap.add_argument("out_dir")
+    ap.add_argument(
+        "csv",
+        nargs="+",
+        help="SYMBOL=path/to/file.csv (or path; symbol from the file stem)",
+    )
+    ap.add_argument("--ts-col", default="timestamp")
+    ap.add_argument("--row-group-rows", type=int, default=32_768)
+    args = ap.parse_args()
+
+    for spec in args.csv:
+        symbol, _, path = spec.rpartition("=")
+        symbol = symbol or Path(path).stem.split("_")[0].upper()
+        handler = CSVDataHandler(csv_path=path, symbol=symbol, ts_col=args.ts_col)
+        bars = convert_csv(handler, args.out_dir, args.row_group_rows)
+        print(f"{symbol}: {len(bars):,} bars -> {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
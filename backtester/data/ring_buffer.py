@@ -0,0 +1,220 @@
+# backtester/data/ring_buffer.py
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+import numpy as np
+
+from backtester.events import (
+    ActionType,
+    CorporateActionEvent,
+    EventType,
+    MarketBatchEvent,
+    MarketEvent,
+)
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+class BarHistory:
+    """
+    Shared per-symbol bar history: one fixed-size NumPy ring per symbol and field.
+
+    - written once per bar by the engine (or router) that owns it; strategies only read
+    - lookbacks are declared up front via reserve(); capacity is fixed at the first write,
+      so memory is symbols x fields x 2 x capacity x 8 bytes, whatever the strategy count
+    - every value is written twice (slot and slot + capacity), so the last n values are
+      always one contiguous slice: window() returns a read-only view, no copy
+    - symbols are added on first sight (or up front via `symbols`)
+    """
+
+    def __init__(
+        self,
+        capacity: int = 0,
+        symbols: Iterable[str] = (),
+        fields: Iterable[str] = BAR_FIELDS,
+    ) -> None:
+        fields = tuple(fields)
+        unknown = set(fields) - set(BAR_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"BarHistory.fields must be among {BAR_FIELDS}, got {sorted(unknown)}."
+            )
+        if capacity < 0:
+            raise ValueError("BarHistory.capacity must be >= 0.")
+
+        self.fields = fields
+        self._field_i = {f: i for i, f in enumerate(fields)}
+        self.capacity = int(capacity)
+        self._slots: dict[str, int] = {}
+        self._data: np.ndarray | None = None  # (symbols, fields, 2 * capacity)
+        self._pos = np.zeros(0, dtype=np.int64)  # next write slot per symbol
+        self._count = np.zeros(0, dtype=np.int64)  # bars written per symbol
+        # symbols tuple of a batch -> slot indices (aligned feeds reuse one tuple)
+        self._batch_slots: dict[tuple[str, ...], np.ndarray] = {}
+        self._pending = list(symbols)
+
+    # ----- setup -----
+
+    def reserve(self, lookback: int) -> None:
+        """
+        Declare a reader's lookback. Grows capacity before the first write; afterwards
+        a larger lookback is an error (buffers never reallocate mid-run).
+        """
+        if lookback <= self.capacity:
+            return
+        if self._data is not None:
+            raise ValueError(
+                f"BarHistory lookback {lookback} exceeds capacity {self.capacity}; "
+                "declare lookbacks before the first bar."
+            )
+        self.capacity = int(lookback)
+
+    def _slot(self, symbol: str) -> int:
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = self._add_symbols((symbol,))[0]
+        return slot
+
+    def _add_symbols(self, symbols: Iterable[str]) -> list[int]:
+        if self.capacity < 1:
+            raise ValueError(
+                "BarHistory needs capacity >= 1 (reserve() a lookback first)."
+            )
+        new = [s for s in dict.fromkeys(symbols) if s not in self._slots]
+        if new:
+            n_old = len(self._slots)
+            for k, s in enumerate(new):
+                self._slots[s] = n_old + k
+            grown = np.full(
+                (n_old + len(new), len(self.fields), 2 * self.capacity), np.nan
+            )
+            if self._data is not None:
+                grown[:n_old] = self._data
+            self._data = grown
+            self._pos = np.r_[self._pos, np.zeros(len(new), dtype=np.int64)]
+            self._count = np.r_[self._count, np.zeros(len(new), dtype=np.int64)]
+        return [self._slots[s] for s in symbols]
+
+    @property
+    def symbols(self) -> list[str]:
+        return list(self._slots)
+
+    @property
+    def nbytes(self) -> int:
+        return 0 if self._data is None else int(self._data.nbytes)
+
+    # ----- writes (engine side) -----
+
+    def append(self, symbol: str, **values: float) -> None:
+        """
+        One bar for one symbol; fields not given are stored as NaN.
+        """
+        if self._data is None and self._pending:
+            self._add_symbols(self._pending)
+        slot = self._slot(symbol)
+        cap = self.capacity
+        p = int(self._pos[slot])
+        row = self._data[slot]
+        for f, i in self._field_i.items():
+            v = values.get(f, np.nan)
+            row[i, p] = v
+            row[i, p + cap] = v
+        self._pos[slot] = (p + 1) % cap
+        self._count[slot] += 1
+
+    def on_market(self, event: MarketEvent) -> None:
+        self.append(
+            event.symbol,
+            open=event.open,
+            high=event.high,
+            low=event.low,
+            close=event.close,
+            volume=event.volume,
+        )
+
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        # all symbols of one timestamp in a single fancy-indexed write
+        slots = self._batch_slots.get(batch.symbols)
+        if slots is None:
+            if self._data is None and self._pending:
+                self._add_symbols(self._pending)
+            slots = np.asarray(self._add_symbols(batch.symbols), dtype=np.int64)
+            self._batch_slots[batch.symbols] = slots
+        cap = self.capacity
+        pos = self._pos[slots]
+        vals = np.stack(
+            [np.asarray(getattr(batch, f), dtype=np.float64) for f in self.fields],
+            axis=1,
+        )
+        self._data[slots, :, pos] = vals
+        self._data[slots, :, pos + cap] = vals
+        self._pos[slots] = (pos + 1) % cap
+        self._count[slots] += 1
+
+    def on_corporate_action(self, event: CorporateActionEvent) -> None:
+        # raw feeds: rescale stored history so windows stay continuous across a split
+        slot = self._slots.get(event.symbol)
+        if slot is None or event.action != ActionType.SPLIT:
+            return
+        r = float(event.ratio)
+        for f, i in self._field_i.items():
+            if f == "volume":
+                self._data[slot, i] *= r
+            else:
+                self._data[slot, i] /= r
+
+    def update(self, event) -> None:
+        """
+        Route any feed event (market, batch, corporate action); others are ignored.
+        """
+        t = event.type
+        if t == EventType.MARKET:
+            self.on_market(event)
+        elif t == EventType.MARKET_BATCH:
+            self.on_market_batch(event)
+        elif t == EventType.CORPORATE_ACTION:
+            self.on_corporate_action(event)
+
+    # ----- reads (strategy side) -----
+
+    def count(self, symbol: str) -> int:
+        """
+        Bars written so far for symbol (may exceed capacity).
+        """
+        slot = self._slots.get(symbol)
+        return 0 if slot is None else int(self._count[slot])
+
+    def window(
+        self, symbol: str, field: str = "close", n: int | None = None
+    ) -> np.ndarray:
+        """
+        Read-only view of the last n values (oldest first); shorter while warming up.
+        Valid until the next write for the symbol.
+        """
+        n = self.capacity if n is None else n
+        if n > self.capacity:
+            raise ValueError(
+                f"BarHistory.window n={n} exceeds capacity {self.capacity}."
+            )
+        slot = self._slots.get(symbol)
+        if slot is None:
+            return np.empty(0)
+        n = min(n, int(self._count[slot]))
+        end = int(self._pos[slot]) + self.capacity
+        view = self._data[slot, self._field_i[field], end - n : end]
+        view.flags.writeable = False
+        return view
+
+    def closes(self, symbol: str, n: int | None = None) -> np.ndarray:
+        return self.window(symbol, "close", n)
+
+    def highs(self, symbol: str, n: int | None = None) -> np.ndarray:
+        return self.window(symbol, "high", n)
+
+    def lows(self, symbol: str, n: int | None = None) -> np.ndarray:
+        return self.window(symbol, "low", n)
+
+    def volumes(self, symbol: str, n: int | None = None) -> np.ndarray:
+        return self.window(symbol, "volume", n)
@@ -0,0 +1,226 @@
+# backtester/data/synthetic.py
+
+from __future__ import annotations
+
+import argparse
+import math
+import time
+import zlib
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+from backtester.data.bar_store import FIELDS, Bars, BarStore
+from backtester.events import to_epoch_ns
+
+# bars are generated in fixed blocks, each from its own seed, so a symbol's series is
+# identical whether it is built in memory, streamed, or written to a store
+BLOCK = 1 << 20
+
+
+@dataclass(frozen=True, slots=True)
+class SyntheticSpec:
+    """
+    Price/volume model for synthetic bars (rates are annualized):
+    - log price follows GBM with drift `mu` and volatility `sigma`, plus Merton jumps
+      (Poisson `jump_intensity` per year, log-sizes ~ N(jump_mean, jump_std));
+      the drift is jump-compensated, so `mu` stays the expected return
+    - each bar opens at the previous close; high/low extend past max/min(open, close)
+      by exponential excursions scaled by `range_scale` x the per-bar volatility
+    - volume is exponential around `volume` (mean), higher on large moves
+    """
+
+    s0: float = 100.0
+    mu: float = 0.05
+    sigma: float = 0.2
+    jump_intensity: float = 0.0
+    jump_mean: float = 0.0
+    jump_std: float = 0.0
+    range_scale: float = 0.5
+    volume: float = 10_000.0
+    bar_ns: int = 60_000_000_000
+    bars_per_year: float = 252 * 390
+    start: int | str = "2024-01-02T09:30:00"
+
+    def __post_init__(self) -> None:
+        for name in ("s0", "volume", "bars_per_year", "bar_ns"):
+            if not getattr(self, name) > 0:
+                raise ValueError(f"SyntheticSpec.{name} must be > 0.")
+        for name in ("sigma", "jump_intensity", "jump_std", "range_scale"):
+            if getattr(self, name) < 0:
+                raise ValueError(f"SyntheticSpec.{name} must be >= 0.")
+        if self.jump_intensity / self.bars_per_year >= 1.0:
+            raise ValueError("SyntheticSpec.jump_intensity must be < bars_per_year.")
+
+
+def _symbol_key(symbol: str) -> int:
+    return zlib.crc32(symbol.encode())
+
+
+def _block(
+    spec: SyntheticSpec, seed: int, symbol: str, k: int, n: int, prev_close: float
+) -> tuple[np.ndarray, ...]:
+    # one block of n bars (open, high, low, close, volume) continuing from prev_close
+    rng = np.random.Generator(
+        np.random.SFC64(np.random.SeedSequence((seed, _symbol_key(symbol), k)))
+    )
+    dt = 1.0 / spec.bars_per_year
+    vol = spec.sigma * math.sqrt(dt)
+    p_jump = spec.jump_intensity * dt
+    kappa = math.exp(spec.jump_mean + 0.5 * spec.jump_std**2) - 1.0
+    drift = (spec.mu - 0.5 * spec.sigma**2 - spec.jump_intensity * kappa) * dt
+
+    z = rng.standard_normal(n, dtype=np.float32)
+    r = z.astype(np.float64)
+    r *= vol
+    r += drift
+    if p_jump > 0.0:
+        hits = np.flatnonzero(rng.random(n, dtype=np.float32) < p_jump)
+        r[hits] += rng.normal(spec.jump_mean, spec.jump_std, len(hits))
+    np.cumsum(r, out=r)
+    r += math.log(prev_close)
+    close = np.exp(r, out=r)
+
+    open_ = np.empty(n)
+    open_[0] = prev_close
+    open_[1:] = close[:-1]
+
+    scale = spec.range_scale * vol
+    ext = rng.standard_exponential(n, dtype=np.float32)
+    ext *= scale
+    high = np.maximum(open_, close)
+    high *= np.exp(ext)
+    ext = rng.standard_exponential(n, dtype=np.float32)
+    ext *= -scale
+    low = np.minimum(open_, close)
+    low *= np.exp(ext)
+
+    # |z| (one bar's move in sigmas) lifts the volume: mean volume * (0.5 + |z| * sqrt(pi/8))
+    np.abs(z, out=z)
+    z *= math.sqrt(math.pi / 8.0)
+    z += 0.5
+    z *= rng.standard_exponential(n, dtype=np.float32)
+    volume = z.astype(np.float64)
+    volume *= spec.volume
+    return open_, high, low, close, volume
+
+
+def iter_blocks(
+    symbol: str,
+    n: int,
+    spec: SyntheticSpec | None = None,
+    seed: int = 0,
+) -> Iterator[Bars]:
+    """
+    A symbol's first n synthetic bars as consecutive Bars blocks of up to BLOCK rows.
+    Memory stays O(BLOCK) regardless of n.
+    """
+    spec = spec if spec is not None else SyntheticSpec()
+    if n < 0:
+        raise ValueError(f"n must be >= 0, got {n}.")
+    t0 = to_epoch_ns(spec.start)
+    prev_close = spec.s0
+    for k, lo in enumerate(range(0, n, BLOCK)):
+        m = min(BLOCK, n - lo)
+        ts = np.arange(lo, lo + m, dtype=np.int64)
+        ts *= spec.bar_ns
+        ts += t0
+        o, h, low, c, v = _block(spec, seed, symbol, k, m, prev_close)
+        prev_close = float(c[-1])
+        yield Bars(symbol, ts, o, h, low, c, v)
+
+
+def generate_bars(
+    symbol: str,
+    n: int,
+    spec: SyntheticSpec | None = None,
+    seed: int = 0,
+) -> Bars:
+    """
+    n seeded synthetic bars for one symbol (same (symbol, seed, spec) -> same bars).
+    """
+    blocks = list(iter_blocks(symbol, n, spec, seed))
+    if len(blocks) == 1:
+        return blocks[0]
+    if not blocks:
+        empty = np.zeros(0)
+        return Bars(
+            symbol, np.zeros(0, dtype=np.int64), empty, empty, empty, empty, empty
+        )
+    return Bars(
+        symbol, *(np.concatenate([getattr(b, f) for b in blocks]) for f in FIELDS)
+    )
+
+
+def synthetic_universe(n_symbols: int, prefix: str = "SYN") -> list[str]:
+    width = len(str(max(n_symbols - 1, 0)))
+    return [f"{prefix}{i:0{width}d}" for i in range(n_symbols)]
+
+
+def write_store(
+    root: str | Path,
+    symbols: Sequence[str],
+    n: int,
+    spec: SyntheticSpec | None = None,
+    seed: int = 0,
+) -> BarStore:
+    """
+    Generate n bars per symbol straight into a BarStore (<root>/<symbol>/<field>.npy).
+    Blocks are written into preallocated memory-mapped arrays, so the universe never
+    has to fit in RAM; the result is bit-identical to BarStore.put(generate_bars(...)).
+    """
+    store = BarStore(root)
+    for symbol in symbols:
+        out = store.path_for(symbol)
+        out.mkdir(parents=True, exist_ok=True)
+        cols = {
+            f: np.lib.format.open_memmap(
+                out / f"{f}.npy",
+                mode="w+",
+                dtype=np.int64 if f == "ts" else np.float64,
+                shape=(n,),
+            )
+            for f in FIELDS
+        }
+        lo = 0
+        for block in iter_blocks(symbol, n, spec, seed):
+            hi = lo + len(block)
+            for f, col in cols.items():
+                col[lo:hi] = getattr(block, f)
+            lo = hi
+        for col in cols.values():
+            col.flush()
+        del cols
+    return store
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Write seeded synthetic GBM/jump-diffusion bars into a BarStore."
+    )
+    ap.add_argument("out_dir")
+    ap.add_argument("--symbols", type=int, default=10)
+    ap.add_argument("--bars", type=int, default=1_000_000, help="bars per symbol")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--sigma", type=float, default=0.2)
+    ap.add_argument("--jump-intensity", type=float, default=0.0, help="jumps per year")
+    ap.add_argument("--jump-std", type=float, default=0.0)
+    args = ap.parse_args()
+
+    spec = SyntheticSpec(
+        sigma=args.sigma, jump_intensity=args.jump_intensity, jump_std=args.jump_std
+    )
+    symbols = synthetic_universe(args.symbols)
+    t0 = time.perf_counter()
+    write_store(args.out_dir, symbols, args.bars, spec, args.seed)
+    dt = time.perf_counter() - t0
+    total = args.symbols * args.bars
+    print(
+        f"{total:,} bars ({args.symbols} symbols) -> {args.out_dir} in {dt:.2f}s ({total / dt / 1e6:.1f}M bars/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
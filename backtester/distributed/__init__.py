@@ -0,0 +1,19 @@
+# backtester/distributed/__init__.py
+from .coordinator import SweepCoordinator
+from .jobs import JobResult, SweepJob, jobs_from_plan, make_sweep_jobs
+from .transport import FileQueueTransport, Lease, Transport
+from .worker import SweepWorker, run_job, run_plan
+
+__all__ = [
+    "SweepCoordinator",
+    "JobResult",
+    "SweepJob",
+    "make_sweep_jobs",
+    "jobs_from_plan",
+    "FileQueueTransport",
+    "Lease",
+    "Transport",
+    "SweepWorker",
+    "run_job",
+    "run_plan",
+]
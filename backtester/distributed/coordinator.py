@@ -0,0 +1,76 @@
+# backtester/distributed/coordinator.py
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+
+from backtester.distributed.jobs import JobResult, SweepJob
+from backtester.distributed.transport import Transport
+
+
+class SweepCoordinator:
+    """
+    Hands sweep jobs to workers through a Transport and collects results.
+
+    - retry: a lease whose heartbeat is older than lease_timeout is treated as a
+      dead worker and the job goes back to pending
+    - work stealing: once pending is empty, leases claimed more than straggler_after
+      ago get a duplicate ticket (however recently they heartbeat) so an idle worker can race the straggler (first result wins)
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        lease_timeout: float = 60.0,
+        straggler_after: float | None = None,
+    ) -> None:
+        self.transport = transport
+        self.lease_timeout = float(lease_timeout)
+        self.straggler_after = straggler_after
+        self.job_ids: list[str] = []
+        self._stolen: set[str] = set()
+
+    def submit(self, jobs: Iterable[SweepJob]) -> list[str]:
+        ids = []
+        for job in jobs:
+            self.transport.submit(job)
+            ids.append(job.job_id)
+        self.job_ids.extend(i for i in ids if i not in self.job_ids)
+        return ids
+
+    def poll(self) -> dict[str, JobResult]:
+        results = self.transport.results()
+        now = time.time()
+        queue_empty = not self.transport.pending()
+
+        for lease in self.transport.leases():
+            if lease.job_id in results:
+                continue
+            if now - lease.last_seen > self.lease_timeout:
+                self.transport.requeue(lease)
+            elif (
+                self.straggler_after is not None
+                and queue_empty
+                and now - lease.claimed_at > self.straggler_after
+                and lease.job_id not in self._stolen
+            ):
+                self.transport.duplicate(lease.job_id)
+                self._stolen.add(lease.job_id)
+
+        return {jid: results[jid] for jid in self.job_ids if jid in results}
+
+    def wait(
+        self, timeout: float | None = None, poll_interval: float = 0.2
+    ) -> dict[str, JobResult]:
+        """
+        Poll until every submitted job has a result (or timeout). Returns what finished.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            done = self.poll()
+            if len(done) == len(self.job_ids):
+                return done
+            if deadline is not None and time.monotonic() >= deadline:
+                return done
+            time.sleep(poll_interval)
@@ -0,0 +1,174 @@
+# backtester/distributed/jobs.py
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import itertools
+import json
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+from backtester.core.config import DEFAULT_STRATEGY, RunPlan, parse_run_plan
+
+
+@dataclass(frozen=True)
+class SweepJob:
+    """
+    One (parameter set x date range) shard of a sweep.
+
+    Everything a worker needs travels with the job except the bars themselves:
+    workers attach to their local BarStore by symbol.
+      - costs: config.yaml style {"commission": {...}, "slippage": {...}}
+      - portfolio: Portfolio kwargs (starting_cash, target_qty, max_qty)
+    """
+
+    symbol: str
+    params: dict[str, Any]
+    start: str | None = None
+    end: str | None = None
+    strategy: str = DEFAULT_STRATEGY
+    costs: dict[str, Any] = field(default_factory=dict)
+    portfolio: dict[str, Any] = field(default_factory=dict)
+    periods_per_year: int = 252 * 390
+    # 0 = metrics only, N = downsampled equity curve of ~N points
+    equity_points: int = 0
+
+    @property
+    def job_id(self) -> str:
+        # content-derived, so resubmitting / retrying the same job is idempotent
+        raw = json.dumps(asdict(self), sort_keys=True, default=str)
+        return hashlib.sha1(raw.encode()).hexdigest()[:16]
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self), sort_keys=True)
+
+    @classmethod
+    def from_json(cls, raw: str) -> SweepJob:
+        return cls(**json.loads(raw))
+
+    @classmethod
+    def from_plan(
+        cls,
+        plan: RunPlan,
+        params: dict[str, Any] | None = None,
+        start: str | None = None,
+        end: str | None = None,
+        equity_points: int = 0,
+    ) -> SweepJob:
+        """
+        Shard of a validated RunPlan (single-symbol; bars come from the worker's BarStore).
+        """
+        if len(plan.universe) != 1:
+            raise ValueError(
+                f"SweepJob covers one symbol, plan has {list(plan.universe)}."
+            )
+        portfolio = asdict(plan.portfolio)
+        if portfolio["est_fee_per_trade"] is None:
+            del portfolio["est_fee_per_trade"]
+        return cls(
+            symbol=plan.symbol,
+            params={**plan.strategy.kwargs, **(params or {})},
+            start=start,
+            end=end,
+            strategy=plan.strategy.path,
+            costs={
+                "commission": asdict(plan.commission),
+                "slippage": asdict(plan.slippage),
+            },
+            portfolio=portfolio,
+            periods_per_year=plan.periods_per_year,
+            equity_points=equity_points,
+        )
+
+    def to_plan(self) -> RunPlan:
+        """
+        Validated RunPlan for this job (store-backed data).
+
+        Everything but the strategy params is shared across a sweep, so that part
+        is parsed once per worker process and the job's params are layered on top.
+        """
+        shared = asdict(self)
+        del shared["params"], shared["equity_points"]
+        return _base_plan(json.dumps(shared, sort_keys=True)).with_params(**self.params)
+
+
+@functools.lru_cache(maxsize=64)
+def _base_plan(raw: str) -> RunPlan:
+    job = json.loads(raw)
+    return parse_run_plan(
+        {
+            "data": {"source": "store"},
+            "universe": [job["symbol"]],
+            "strategy": {"class": job["strategy"]},
+            "costs": job["costs"],
+            "portfolio": job["portfolio"],
+            "window": {"start": job["start"], "end": job["end"]},
+            "periods_per_year": job["periods_per_year"],
+        }
+    )
+
+
+@dataclass(frozen=True)
+class JobResult:
+    """
+    Compact worker output: BacktestMetrics as a dict plus optional equity samples.
+    """
+
+    job_id: str
+    worker_id: str
+    metrics: dict[str, float]
+    bars: int
+    equity_ts: list[int] = field(default_factory=list)
+    equity: list[float] = field(default_factory=list)
+    error: str | None = None
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> JobResult:
+        return cls(**json.loads(raw))
+
+
+def make_sweep_jobs(
+    symbol: str,
+    grid: dict[str, list[Any]],
+    windows: list[tuple[str | None, str | None]] | None = None,
+    **job_kwargs: Any,
+) -> list[SweepJob]:
+    """
+    Shard a parameter grid x date windows into SweepJobs (deterministic order).
+    """
+    names = sorted(grid)
+    windows = windows or [(None, None)]
+    jobs = []
+    for values in itertools.product(*(grid[n] for n in names)):
+        params = dict(zip(names, values, strict=True))
+        for start, end in windows:
+            jobs.append(
+                SweepJob(
+                    symbol=symbol, params=params, start=start, end=end, **job_kwargs
+                )
+            )
+    return jobs
+
+
+def jobs_from_plan(
+    plan: RunPlan,
+    grid: dict[str, list[Any]],
+    windows: list[tuple[str | None, str | None]] | None = None,
+    equity_points: int = 0,
+) -> list[SweepJob]:
+    """
+    make_sweep_jobs() over a base RunPlan: the grid overrides the plan's strategy params,
+    windows default to the plan's own date window.
+    """
+    names = sorted(grid)
+    windows = windows or [(plan.start, plan.end)]
+    jobs = []
+    for values in itertools.product(*(grid[n] for n in names)):
+        params = dict(zip(names, values, strict=True))
+        for start, end in windows:
+            jobs.append(SweepJob.from_plan(plan, params, start, end, equity_points))
+    return jobs
@@ -0,0 +1,156 @@
+# backtester/distributed/transport.py
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Protocol
+
+from backtester.distributed.jobs import JobResult, SweepJob
+
+
+@dataclass(frozen=True)
+class Lease:
+    """
+    claimed_at: when the worker took the job (drives straggler detection)
+    heartbeat_at: last sign of life (drives the dead-worker timeout); None = claimed_at
+    """
+
+    job_id: str
+    worker_id: str
+    claimed_at: float
+    heartbeat_at: float | None = None
+
+    @property
+    def last_seen(self) -> float:
+        return self.claimed_at if self.heartbeat_at is None else self.heartbeat_at
+
+
+class Transport(Protocol):
+    """
+    What the coordinator and workers need from the wire.
+    """
+
+    def submit(self, job: SweepJob) -> None: ...
+
+    def claim(self, worker_id: str) -> tuple[Lease, SweepJob] | None: ...
+
+    def heartbeat(self, lease: Lease) -> None: ...
+
+    def complete(self, lease: Lease, result: JobResult) -> None: ...
+
+    def leases(self) -> list[Lease]: ...
+
+    def requeue(self, lease: Lease) -> None: ...
+
+    def duplicate(self, job_id: str) -> None: ...
+
+    def pending(self) -> list[str]: ...
+
+    def results(self) -> dict[str, JobResult]: ...
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+class FileQueueTransport:
+    """
+    Directory-backed job queue (works on a shared/network filesystem):
+
+      <root>/jobs/<job_id>.json                 job specs (write-once)
+      <root>/pending/<job_id>[.dup|.retry-<w>]  claimable tickets
+      <root>/leased/<job_id>__<worker_id>       claimed tickets (content = claim time,
+                                                mtime = heartbeat)
+      <root>/results/<job_id>.json              first result wins
+
+    Claims are atomic renames, so two workers never run the same ticket.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        for sub in ("jobs", "pending", "leased", "results"):
+            (self.root / sub).mkdir(parents=True, exist_ok=True)
+
+    def _job(self, job_id: str) -> SweepJob:
+        return SweepJob.from_json(
+            (self.root / "jobs" / f"{job_id}.json").read_text("utf-8")
+        )
+
+    def submit(self, job: SweepJob) -> None:
+        jid = job.job_id
+        if (self.root / "results" / f"{jid}.json").exists():
+            return  # already done (idempotent resubmit)
+        _atomic_write(self.root / "jobs" / f"{jid}.json", job.to_json())
+        (self.root / "pending" / jid).touch()
+
+    def claim(self, worker_id: str) -> tuple[Lease, SweepJob] | None:
+        for ticket in sorted((self.root / "pending").iterdir()):
+            jid = ticket.name.split(".", 1)[0]
+            dst = self.root / "leased" / f"{jid}__{worker_id}"
+            try:
+                os.rename(ticket, dst)
+            except FileNotFoundError:
+                continue  # another worker won the race
+            now = time.time()
+            dst.write_text(repr(now), encoding="utf-8")
+            os.utime(dst, (now, now))
+            if (self.root / "results" / f"{jid}.json").exists():
+                dst.unlink(missing_ok=True)  # stale duplicate ticket
+                continue
+            return Lease(jid, worker_id, now), self._job(jid)
+        return None
+
+    def heartbeat(self, lease: Lease) -> None:
+        p = self.root / "leased" / f"{lease.job_id}__{lease.worker_id}"
+        try:
+            os.utime(p)
+        except FileNotFoundError:
+            pass
+
+    def complete(self, lease: Lease, result: JobResult) -> None:
+        out = self.root / "results" / f"{lease.job_id}.json"
+        if not out.exists():
+            _atomic_write(out, result.to_json())
+        (self.root / "leased" / f"{lease.job_id}__{lease.worker_id}").unlink(
+            missing_ok=True
+        )
+
+    def leases(self) -> list[Lease]:
+        out = []
+        for p in (self.root / "leased").iterdir():
+            jid, _, wid = p.name.partition("__")
+            try:
+                beat = p.stat().st_mtime
+                claimed = p.read_text("utf-8")
+            except FileNotFoundError:
+                continue
+            # an empty ticket was caught between rename and write: its mtime is the claim
+            out.append(Lease(jid, wid, float(claimed) if claimed else beat, beat))
+        return out
+
+    def requeue(self, lease: Lease) -> None:
+        src = self.root / "leased" / f"{lease.job_id}__{lease.worker_id}"
+        try:
+            os.rename(
+                src, self.root / "pending" / f"{lease.job_id}.retry-{lease.worker_id}"
+            )
+        except FileNotFoundError:
+            pass
+
+    def duplicate(self, job_id: str) -> None:
+        (self.root / "pending" / f"{job_id}.dup").touch()
+
+    def pending(self) -> list[str]:
+        return [p.name.split(".", 1)[0] for p in (self.root / "pending").iterdir()]
+
+    def results(self) -> dict[str, JobResult]:
+        out = {}
+        for p in (self.root / "results").glob("*.json"):
+            r = JobResult.from_json(p.read_text("utf-8"))
+            out[r.job_id] = r
+        return out
@@ -0,0 +1,155 @@
+# backtester/distributed/worker.py
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import threading
+import time
+from dataclasses import asdict
+
+import numpy as np
+
+from backtester.analysis.metrics import compute_metrics
+from backtester.core.config import RunPlan
+from backtester.data.bar_store import BarStore
+from backtester.distributed.jobs import JobResult, SweepJob
+from backtester.distributed.transport import FileQueueTransport, Lease, Transport
+
+
+def run_job(job: SweepJob, store: BarStore, worker_id: str = "local") -> JobResult:
+    """
+    Run one sweep job against locally cached bars.
+    """
+    plan = job.to_plan()
+    return _run_plan(plan, store, job.job_id, worker_id, job.equity_points)
+
+
+def run_plan(
+    plan: RunPlan, store: BarStore, equity_points: int = 0, worker_id: str = "local"
+) -> JobResult:
+    """
+    Run a (pickled) RunPlan against locally cached bars; job_id is the plan hash.
+    """
+    return _run_plan(plan, store, plan.hash()[:16], worker_id, equity_points)
+
+
+def _run_plan(
+    plan: RunPlan, store: BarStore, job_id: str, worker_id: str, equity_points: int
+) -> JobResult:
+    bars = store.get(plan.symbol).window(plan.start, plan.end)
+    engine = plan.build()
+    n = engine.run(bars.market_events())
+
+    equity_curve = engine.portfolio.equity_curve_df()
+    m = compute_metrics(equity_curve, periods_per_year=plan.periods_per_year)
+
+    eq_ts: list[int] = []
+    eq: list[float] = []
+    if equity_points > 0 and n:
+        idx = np.unique(np.linspace(0, n - 1, min(equity_points, n)).astype(np.int64))
+        eq_ts = bars.ts[idx].tolist()
+        eq = equity_curve["equity"].to_numpy()[idx].tolist()
+
+    return JobResult(
+        job_id=job_id,
+        worker_id=worker_id,
+        metrics=asdict(m),
+        bars=n,
+        equity_ts=eq_ts,
+        equity=eq,
+    )
+
+
+class SweepWorker:
+    """
+    Pulls jobs from a Transport, runs them against a local BarStore, pushes results.
+    A background heartbeat keeps the lease fresh while a long job runs.
+    """
+
+    def __init__(
+        self,
+        transport: Transport,
+        store: BarStore,
+        worker_id: str | None = None,
+        heartbeat_every: float = 5.0,
+    ) -> None:
+        self.transport = transport
+        self.store = store
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.heartbeat_every = float(heartbeat_every)
+
+    def _heartbeat(self, lease: Lease, stop: threading.Event) -> None:
+        while not stop.wait(self.heartbeat_every):
+            self.transport.heartbeat(lease)
+
+    def run_once(self) -> bool:
+        claimed = self.transport.claim(self.worker_id)
+        if claimed is None:
+            return False
+
+        lease, job = claimed
+        stop = threading.Event()
+        beat = threading.Thread(target=self._heartbeat, args=(lease, stop), daemon=True)
+        beat.start()
+        try:
+            result = run_job(job, self.store, self.worker_id)
+        except Exception as e:
+            # report instead of dying, so the job isn't retried forever
+            result = JobResult(
+                job_id=lease.job_id,
+                worker_id=self.worker_id,
+                metrics={},
+                bars=0,
+                error=f"{type(e).__name__}: {e}",
+            )
+        finally:
+            stop.set()
+            beat.join()
+
+        self.transport.complete(lease, result)
+        return True
+
+    def serve(
+        self, idle_timeout: float | None = None, poll_interval: float = 0.5
+    ) -> int:
+        """
+        Work until the queue stays empty for idle_timeout seconds. Returns jobs run.
+        """
+        done = 0
+        idle_since = time.monotonic()
+        while True:
+            if self.run_once():
+                done += 1
+                idle_since = time.monotonic()
+                continue
+            if (
+                idle_timeout is not None
+                and time.monotonic() - idle_since >= idle_timeout
+            ):
+                return done
+            time.sleep(poll_interval)
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Backtest sweep worker (file-queue transport)."
+    )
+    ap.add_argument("--queue", required=True, help="shared queue directory")
+    ap.add_argument("--bars", required=True, help="local BarStore root")
+    ap.add_argument("--worker-id", default=None)
+    ap.add_argument("--idle-timeout", type=float, default=None)
+    args = ap.parse_args()
+
+    worker = SweepWorker(
+        FileQueueTransport(args.queue),
+        BarStore(args.bars),
+        worker_id=args.worker_id,
+    )
+    n = worker.serve(idle_timeout=args.idle_timeout)
+    print(f"[WORKER {worker.worker_id}] jobs completed: {n}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,43 @@
 # backtester/events/__init__.py
 
 from .events import (
+    ActionType,
+    CorporateActionEvent,
     EventType,
-    Timestamp,
+    FillEvent,
+    MarketBatchEvent,
     MarketEvent,
-    SignalEvent,
     OrderEvent,
-    FillEvent,
-    Side,
     OrderType,
+    RiskEvent,
+    Side,
+    SignalEvent,
+    Timestamp,
+    ValidationLevel,
+    get_validation,
+    set_validation,
+    to_epoch_ns,
+    to_iso,
+    validation,
 )
 
 __all__ = [
     "EventType",
     "Timestamp",
     "MarketEvent",
+    "MarketBatchEvent",
     "SignalEvent",
     "OrderEvent",
     "FillEvent",
+    "CorporateActionEvent",
+    "RiskEvent",
+    "ActionType",
     "Side",
     "OrderType",
+    "to_epoch_ns",
+    "to_iso",
+    "ValidationLevel",
+    "get_validation",
+    "set_validation",
+    "validation",
 ]
@@ -1,20 +1,125 @@
 # backtester/events.py
 
 from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from enum import Enum
-from datetime import datetime
+from numbers import Integral
 from typing import Optional, Union
 
+import numpy as np
+
 
 class EventType(str, Enum):
     MARKET = "MARKET"
+    MARKET_BATCH = "MARKET_BATCH"
     SIGNAL = "SIGNAL"
     ORDER = "ORDER"
     FILL = "FILL"
-
-
-Timestamp = Union[str, datetime]
+    CORPORATE_ACTION = "CORPORATE_ACTION"
+    RISK = "RISK"
+
+
+# Canonical form is int epoch nanoseconds (UTC): every data source emits it and
+# the engine passes it through untouched. ISO strings / datetimes are accepted
+# at the edges and converted with to_epoch_ns() / to_iso(), as are NumPy
+# integers and datetime64 values read straight out of arrays.
+Timestamp = Union[int, str, datetime]
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_US = timedelta(microseconds=1)
+
+
+def to_epoch_ns(ts: Timestamp) -> int:
+    """
+    Epoch nanoseconds for an event timestamp (naive timestamps are read as UTC).
+    """
+    if isinstance(ts, int):
+        return ts
+    if isinstance(ts, Integral):
+        return int(ts)
+    if isinstance(ts, np.datetime64):
+        return int(ts.astype("datetime64[ns]").view(np.int64))
+    dt = (
+        datetime.fromisoformat(ts.replace("Z", "+00:00")) if isinstance(ts, str) else ts
+    )
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return ((dt - _EPOCH) // _US) * 1000
+
+
+def to_iso(ts: Timestamp) -> str:
+    """
+    Naive UTC ISO-8601 string (microsecond precision) for display / text output.
+    """
+    if isinstance(ts, str):
+        return ts
+    ns = to_epoch_ns(ts)
+    return (
+        (_EPOCH + timedelta(microseconds=ns // 1000)).replace(tzinfo=None).isoformat()
+    )
+
+
+class ValidationLevel(str, Enum):
+    """
+    - STRICT: every constructor checks its fields (string timestamps are parsed)
+    - TRUSTED: market data events skip their checks and no event re-parses its
+      timestamp; for feeds that were validated once at ingest (BarStore, Parquet,
+      journal replay)
+    """
+
+    STRICT = "STRICT"
+    TRUSTED = "TRUSTED"
+
+
+_strict = True
+
+
+def get_validation() -> ValidationLevel:
+    return ValidationLevel.STRICT if _strict else ValidationLevel.TRUSTED
+
+
+def set_validation(level: ValidationLevel | str) -> ValidationLevel:
+    """
+    Set the process-wide validation level. Returns the previous level.
+    """
+    global _strict
+    prev = get_validation()
+    _strict = (
+        ValidationLevel(str(getattr(level, "value", level)).upper())
+        == ValidationLevel.STRICT
+    )
+    return prev
+
+
+@contextmanager
+def validation(level: ValidationLevel | str | None) -> Iterator[None]:
+    """
+    Scoped set_validation(); None leaves the current level unchanged.
+    """
+    if level is None:
+        yield
+        return
+    prev = set_validation(level)
+    try:
+        yield
+    finally:
+        set_validation(prev)
+
+
+def _check_ts(owner: str, ts: Timestamp) -> None:
+    if not _strict or type(ts) is int:
+        return
+    if isinstance(ts, str):
+        try:
+            datetime.fromisoformat(ts.replace("Z", "+00:00"))
+        except ValueError as e:
+            raise ValueError(
+                f"{owner}.ts must be ISO-8601 parseable, got: {ts!r}"
+            ) from e
 
 
 @dataclass(frozen=True, slots=True)
@@ -32,16 +137,77 @@ class MarketEvent:
         return EventType.MARKET
 
     def __post_init__(self) -> None:
+        if not _strict:
+            return
         if not self.symbol or not self.symbol.strip():
             raise ValueError("MarketEvent.symbol must be a non-empty string")
 
-        if isinstance(self.ts, str):
-            try:
-                datetime.fromisoformat(self.ts.replace("Z", "+00:00"))
-            except ValueError as e:
+        _check_ts("MarketEvent", self.ts)
+
+
+def _pylist(values: Sequence[float]) -> list[float]:
+    return values.tolist() if hasattr(values, "tolist") else list(values)
+
+
+@dataclass(frozen=True, slots=True)
+class MarketBatchEvent:
+    """
+    Every symbol's bar for one timestamp, as aligned columns:
+    symbols[i] <-> open[i], high[i], low[i], close[i], volume[i].
+    Columns may be lists or NumPy arrays.
+    """
+
+    ts: Timestamp
+    symbols: tuple[str, ...]
+    open: Sequence[float]
+    high: Sequence[float]
+    low: Sequence[float]
+    close: Sequence[float]
+    volume: Sequence[float]
+
+    @property
+    def type(self) -> EventType:
+        return EventType.MARKET_BATCH
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __post_init__(self) -> None:
+        if not _strict:
+            return
+        if not self.symbols:
+            raise ValueError("MarketBatchEvent.symbols must not be empty.")
+
+        n = len(self.symbols)
+        for name in ("open", "high", "low", "close", "volume"):
+            if len(getattr(self, name)) != n:
                 raise ValueError(
-                    f"MarketEvent.ts must be ISO-8601 parseable, got: {self.ts!r}"
-                ) from e
+                    f"MarketBatchEvent.{name} must have one value per symbol ({n}), "
+                    f"got {len(getattr(self, name))}."
+                )
+
+        _check_ts("MarketBatchEvent", self.ts)
+
+    def closes(self) -> dict[str, float]:
+        return dict(zip(self.symbols, _pylist(self.close), strict=True))
+
+    def market_events(self) -> Iterator[MarketEvent]:
+        """
+        Fan the batch out as per-symbol MarketEvents (for on_market-only consumers).
+        """
+        ts = self.ts
+        for sym, o, h, lo, c, v in zip(
+            self.symbols,
+            _pylist(self.open),
+            _pylist(self.high),
+            _pylist(self.low),
+            _pylist(self.close),
+            _pylist(self.volume),
+            strict=True,
+        ):
+            yield MarketEvent(
+                ts=ts, symbol=sym, open=o, high=h, low=lo, close=c, volume=v
+            )
 
 
 class Side(str, Enum):
@@ -69,16 +235,12 @@ class SignalEvent:
         if not self.symbol or not self.symbol.strip():
             raise ValueError("SignalEvent.symbol must be a non-empty string.")
 
-        if isinstance(self.ts, str):
-            try:
-                datetime.fromisoformat(self.ts.replace("Z", "+00:00"))
-            except ValueError as e:
-                raise ValueError(
-                    f"SignalEvent.ts must be ISO-8601 parseable, got: {self.ts!r}"
-                ) from e
+        _check_ts("SignalEvent", self.ts)
 
         if isinstance(self.side, str) and self.side not in (Side.BUY, Side.SELL):
-            raise ValueError(f"SignalEvent.side must be BUY or SELL, got {self.side!r}.")
+            raise ValueError(
+                f"SignalEvent.side must be BUY or SELL, got {self.side!r}."
+            )
 
         if self.strength is not None and self.strength <= 0:
             raise ValueError(
@@ -104,13 +266,7 @@ class OrderEvent:
         if not self.symbol or not self.symbol.strip():
             raise ValueError("OrderEvent.symbol must be a non-empty string.")
 
-        if isinstance(self.ts, str):
-            try:
-                datetime.fromisoformat(self.ts.replace("Z", "+00:00"))
-            except ValueError as e:
-                raise ValueError(
-                    f"OrderEvent.ts must be ISO-8601 parseable, got: {self.ts!r}"
-                ) from e
+        _check_ts("OrderEvent", self.ts)
 
         if isinstance(self.side, str) and self.side not in (Side.BUY, Side.SELL):
             raise ValueError(f"OrderEvent.side must be BUY or SELL, got {self.side!r}.")
@@ -150,13 +306,7 @@ class FillEvent:
         if not self.symbol or not self.symbol.strip():
             raise ValueError("FillEvent.symbol must be a non-empty string.")
 
-        if isinstance(self.ts, str):
-            try:
-                datetime.fromisoformat(self.ts.replace("Z", "+00:00"))
-            except ValueError as e:
-                raise ValueError(
-                    f"FillEvent.ts must be ISO-8601 parseable, got: {self.ts!r}"
-                ) from e
+        _check_ts("FillEvent", self.ts)
 
         if isinstance(self.side, str) and self.side not in (Side.BUY, Side.SELL):
             raise ValueError(f"FillEvent.side must be BUY or SELL, got {self.side!r}.")
@@ -165,7 +315,83 @@ class FillEvent:
             raise ValueError(f"FillEvent.qty must be > 0, got {self.qty}.")
 
         if self.fill_price <= 0:
-            raise ValueError(f"FillEvent.fill_price must be > 0, got {self.fill_price}.")
+            raise ValueError(
+                f"FillEvent.fill_price must be > 0, got {self.fill_price}."
+            )
 
         if self.fee < 0:
             raise ValueError(f"FillEvent.fee must be >= 0, got {self.fee}.")
+
+
+class ActionType(str, Enum):
+    SPLIT = "SPLIT"
+    DIVIDEND = "DIVIDEND"
+
+
+@dataclass(frozen=True, slots=True)
+class CorporateActionEvent:
+    """
+    Effective at the start of ts (the ex-date):
+    - SPLIT: ratio new shares per old share (2.0 = 2-for-1, 0.1 = 1-for-10 reverse)
+    - DIVIDEND: amount in cash per share
+    """
+
+    ts: Timestamp
+    symbol: str
+    action: ActionType
+    ratio: float = 1.0
+    amount: float = 0.0
+
+    @property
+    def type(self) -> EventType:
+        return EventType.CORPORATE_ACTION
+
+    def __post_init__(self) -> None:
+        if not self.symbol or not self.symbol.strip():
+            raise ValueError("CorporateActionEvent.symbol must be a non-empty string.")
+
+        _check_ts("CorporateActionEvent", self.ts)
+
+        if self.action not in (ActionType.SPLIT, ActionType.DIVIDEND):
+            raise ValueError(
+                f"CorporateActionEvent.action must be SPLIT or DIVIDEND, got {self.action!r}."
+            )
+
+        if self.action == ActionType.SPLIT and self.ratio <= 0:
+            raise ValueError(
+                f"CorporateActionEvent.ratio must be > 0, got {self.ratio}."
+            )
+
+        if self.action == ActionType.DIVIDEND and self.amount <= 0:
+            raise ValueError(
+                f"CorporateActionEvent.amount must be > 0, got {self.amount}."
+            )
+
+
+@dataclass(frozen=True, slots=True)
+class RiskEvent:
+    """
+    Pre-trade limit breach: the order (side, qty) was rejected because `rule`
+    would have reached `value` against `limit`.
+    """
+
+    ts: Timestamp
+    symbol: str
+    rule: str
+    value: float
+    limit: float
+    side: Side = Side.BUY
+    qty: float = 0.0
+
+    @property
+    def type(self) -> EventType:
+        return EventType.RISK
+
+    def __post_init__(self) -> None:
+        if not self.symbol or not self.symbol.strip():
+            raise ValueError("RiskEvent.symbol must be a non-empty string.")
+
+        _check_ts("RiskEvent", self.ts)
+
+        if not self.rule:
+            raise ValueError("RiskEvent.rule must be a non-empty string.")
@@ -1,10 +1,20 @@
 # backtester/execution/execution_handler.py
 
 from __future__ import annotations
+
 from dataclasses import dataclass
 
 from backtester.core.event_queue import EventQueue
-from backtester.events import MarketEvent, OrderEvent, FillEvent, Side, OrderType
+from backtester.events import (
+    ActionType,
+    CorporateActionEvent,
+    FillEvent,
+    MarketBatchEvent,
+    MarketEvent,
+    OrderEvent,
+    OrderType,
+    Side,
+)
 
 
 @dataclass(frozen=True)
@@ -15,14 +25,15 @@ class CommissionModel:
     - percent: percent of notional (e.g., 0.0005 = 5 bps)
     - per_share: fee per share (e.g., 0.005 = half cent/share)
     """
-    model: str = "per_trade"        # "per_trade" | "percent" | "per_share"
+
+    model: str = "per_trade"  # "per_trade" | "percent" | "per_share"
 
     # keep backward-compat with your current main.py
     per_trade_fee: float = 1.0
 
     # new knobs
-    percent_rate: float = 0.0       # e.g. 0.0005 = 5 bps of notional
-    per_share_fee: float = 0.0      # e.g. 0.005 dollars per share
+    percent_rate: float = 0.0  # e.g. 0.0005 = 5 bps of notional
+    per_share_fee: float = 0.0  # e.g. 0.005 dollars per share
 
     def calculate(self, qty: float, price: float) -> float:
         q = abs(float(qty))
@@ -51,13 +62,14 @@ class SlippageModel:
 
     Backward compatible: SlippageModel(bps=0.0) still works.
     """
-    model: str = "bps"              # "bps" | "spread"
+
+    model: str = "bps"  # "bps" | "spread"
 
     # backward compatible field
-    bps: float = 0.0                # 1 bp = 0.01%
+    bps: float = 0.0  # 1 bp = 0.01%
 
     # new knob
-    half_spread: float = 0.0        # dollars
+    half_spread: float = 0.0  # dollars
 
     def apply(self, side: Side, price: float) -> float:
         px = float(price)
@@ -86,12 +98,22 @@ class ExecutionHandler:
     ) -> None:
         self.events = events
         self.slippage = slippage or SlippageModel(model="bps", bps=0.0)
-        self.commission = commission or CommissionModel(model="per_trade", per_trade_fee=1.0)
+        self.commission = commission or CommissionModel(
+            model="per_trade", per_trade_fee=1.0
+        )
         self.last_price: dict[str, float] = {}
 
     def on_market(self, event: MarketEvent) -> None:
         self.last_price[event.symbol] = float(event.close)
 
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        self.last_price.update(batch.closes())
+
+    def on_corporate_action(self, event: CorporateActionEvent) -> None:
+        # keep the last close on the post-split price scale until the next bar
+        if event.action == ActionType.SPLIT and event.symbol in self.last_price:
+            self.last_price[event.symbol] /= float(event.ratio)
+
     def on_order(self, event: OrderEvent) -> None:
         sym = event.symbol
         if sym not in self.last_price:
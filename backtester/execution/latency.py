@@ -0,0 +1,279 @@
+# backtester/execution/latency.py
+
+from __future__ import annotations
+
+import heapq
+from abc import ABC, abstractmethod
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from backtester.core.event_queue import EventQueue
+from backtester.events import (
+    CorporateActionEvent,
+    FillEvent,
+    MarketBatchEvent,
+    MarketEvent,
+    OrderEvent,
+    to_epoch_ns,
+)
+
+_ORDER = 0
+_ACK = 1
+
+
+class LatencyModel(ABC):
+    """
+    Delay (int ns) of one leg of an order's round trip.
+    """
+
+    @abstractmethod
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        raise NotImplementedError
+
+    def route(self, symbol: str) -> LatencyModel:
+        # per-venue models pick a sub-model per symbol
+        return self
+
+
+@dataclass(frozen=True)
+class FixedLatency(LatencyModel):
+    delay_ns: int = 0
+
+    def __post_init__(self) -> None:
+        if self.delay_ns < 0:
+            raise ValueError(
+                f"FixedLatency.delay_ns must be >= 0, got {self.delay_ns}."
+            )
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return np.full(n, int(self.delay_ns), dtype=np.int64)
+
+
+@dataclass(frozen=True)
+class RandomLatency(LatencyModel):
+    """
+    base_ns + a random component of typical size scale_ns:
+    - exponential: Exp(scale_ns)
+    - lognormal: scale_ns * LogNormal(0, sigma) (median scale_ns, heavy right tail)
+    - uniform: U(0, scale_ns)
+    """
+
+    base_ns: int = 0
+    scale_ns: int = 0
+    dist: str = "lognormal"  # "exponential" | "lognormal" | "uniform"
+    sigma: float = 0.5
+
+    def __post_init__(self) -> None:
+        if self.base_ns < 0 or self.scale_ns < 0:
+            raise ValueError("RandomLatency.base_ns and scale_ns must be >= 0.")
+        if self.dist not in ("exponential", "lognormal", "uniform"):
+            raise ValueError(
+                f"RandomLatency.dist must be exponential, lognormal or uniform, got {self.dist!r}."
+            )
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        if self.dist == "exponential":
+            x = rng.exponential(self.scale_ns, n)
+        elif self.dist == "lognormal":
+            x = self.scale_ns * rng.lognormal(0.0, self.sigma, n)
+        else:
+            x = rng.uniform(0.0, self.scale_ns, n)
+        return self.base_ns + x.astype(np.int64)
+
+    def mean_ns(self) -> float:
+        if self.dist == "exponential":
+            return self.base_ns + float(self.scale_ns)
+        if self.dist == "lognormal":
+            return self.base_ns + self.scale_ns * float(np.exp(self.sigma**2 / 2))
+        return self.base_ns + self.scale_ns / 2
+
+
+@dataclass(frozen=True)
+class VenueLatency(LatencyModel):
+    """
+    Per-venue models: symbol -> venue -> model (unmapped symbols use default).
+    """
+
+    venues: Mapping[str, LatencyModel]
+    symbol_venue: Mapping[str, str] = field(default_factory=dict)
+    default: LatencyModel = field(default_factory=FixedLatency)
+
+    def __post_init__(self) -> None:
+        missing = set(self.symbol_venue.values()) - set(self.venues)
+        if missing:
+            raise ValueError(
+                f"VenueLatency.symbol_venue names unknown venues: {sorted(missing)}"
+            )
+
+    def route(self, symbol: str) -> LatencyModel:
+        venue = self.symbol_venue.get(symbol)
+        return self.default if venue is None else self.venues[venue]
+
+    def sample(self, rng: np.random.Generator, n: int) -> np.ndarray:
+        return self.default.sample(rng, n)
+
+
+class TimerHeap:
+    """
+    Min-heap of (due_ns, seq, kind, item): O(log n) push/pop, FIFO among equal due times.
+    """
+
+    def __init__(self) -> None:
+        self._heap: list[tuple[int, int, int, Any]] = []
+        self._seq = 0
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, due_ns: int, kind: int, item: Any) -> None:
+        heapq.heappush(self._heap, (due_ns, self._seq, kind, item))
+        self._seq += 1
+
+    def next_due(self) -> int | None:
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now_ns: int) -> Iterator[tuple[int, int, Any]]:
+        """
+        (due_ns, kind, item) for everything due at or before now, in due order;
+        items pushed while iterating are included if they are due too.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= now_ns:
+            due, _, kind, item = heapq.heappop(heap)
+            yield due, kind, item
+
+
+class _DelayStream:
+    # pre-drawn delays, refilled a block at a time (one RNG call per block)
+    def __init__(
+        self, model: LatencyModel, rng: np.random.Generator, block: int
+    ) -> None:
+        self.model = model
+        self.rng = rng
+        self.block = block
+        self._buf: list[int] = []
+        self._i = 0
+
+    def next(self) -> int:
+        if self._i == len(self._buf):
+            self._buf = self.model.sample(self.rng, self.block).tolist()
+            self._i = 0
+        d = self._buf[self._i]
+        self._i += 1
+        return d
+
+
+class LatencyExecutionHandler:
+    """
+    Wraps an execution handler (ExecutionHandler, OrderBookExecutionHandler) with
+    order-entry and fill-ack latency.
+
+    - on_order(): the order reaches the inner handler at ts + order delay
+    - fills the inner handler emits reach the engine queue at exec time + ack delay
+    - both legs are timers on one heap, released as market time advances (each bar
+      calls advance(bar ts) after the inner handler has seen the bar), so an order
+      executes against the first price observed at or after its arrival
+    - zero delay reproduces the wrapped handler exactly
+    - delays come from per-(leg, model) RNG streams seeded from `seed`: same seed,
+      same run
+    The inner handler must be built with its own EventQueue (its outbox).
+    """
+
+    def __init__(
+        self,
+        events: EventQueue,
+        inner,
+        order_latency: LatencyModel | None = None,
+        ack_latency: LatencyModel | None = None,
+        seed: int = 0,
+        block: int = 4_096,
+    ) -> None:
+        if inner.events is events:
+            raise ValueError(
+                "LatencyExecutionHandler: the inner handler needs its own EventQueue."
+            )
+        self.events = events
+        self.inner = inner
+        self.order_latency = order_latency or FixedLatency()
+        self.ack_latency = ack_latency or FixedLatency()
+        self.seed = int(seed)
+        self.block = int(block)
+        self.timers = TimerHeap()
+        self.now_ns: int | None = None
+        self._streams: dict[tuple[int, int], _DelayStream] = {}
+
+    @property
+    def in_flight(self) -> int:
+        return len(self.timers)
+
+    def _delay(self, leg: int, model: LatencyModel, symbol: str) -> int:
+        m = model.route(symbol)
+        key = (leg, id(m))
+        stream = self._streams.get(key)
+        if stream is None:
+            rng = np.random.default_rng([self.seed, leg, len(self._streams)])
+            stream = self._streams[key] = _DelayStream(m, rng, self.block)
+        return stream.next()
+
+    # ----- market time -----
+
+    def on_market(self, event: MarketEvent) -> None:
+        handler = getattr(self.inner, "on_market", None)
+        if handler is not None:
+            handler(event)
+        self.advance(to_epoch_ns(event.ts))
+
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        handler = getattr(self.inner, "on_market_batch", None)
+        if handler is not None:
+            handler(batch)
+        else:
+            for event in batch.market_events():
+                self.inner.on_market(event)
+        self.advance(to_epoch_ns(batch.ts))
+
+    def on_corporate_action(self, event: CorporateActionEvent) -> None:
+        handler = getattr(self.inner, "on_corporate_action", None)
+        if handler is not None:
+            handler(event)
+
+    def on_trade(self, ts, symbol: str, price: float, size: float) -> None:
+        # L2 prints: resting orders fill on the inner book, acks are delayed
+        self.advance(to_epoch_ns(ts))
+        self.inner.on_trade(ts, symbol, price, size)
+        self._collect_fills()
+
+    def advance(self, now_ns: int) -> None:
+        """
+        Release every order arrival / fill ack due at or before now_ns.
+        """
+        self.now_ns = now_ns if self.now_ns is None else max(self.now_ns, now_ns)
+        for _, kind, item in self.timers.pop_due(self.now_ns):
+            if kind == _ORDER:
+                self.inner.on_order(item)
+                self._collect_fills()
+            else:
+                self.events.put(item)
+
+    # ----- orders -----
+
+    def on_order(self, event: OrderEvent) -> None:
+        sent = to_epoch_ns(event.ts)
+        due = sent + self._delay(_ORDER, self.order_latency, event.symbol)
+        if due != sent:
+            event = replace(event, ts=due)
+        self.timers.push(due, _ORDER, event)
+        if self.now_ns is not None and due <= self.now_ns:
+            self.advance(self.now_ns)
+
+    def _collect_fills(self) -> None:
+        outbox = self.inner.events
+        while not outbox.empty():
+            fill: FillEvent = outbox.get()
+            done = to_epoch_ns(fill.ts)
+            self.timers.push(
+                done + self._delay(_ACK, self.ack_latency, fill.symbol), _ACK, fill
+            )
@@ -0,0 +1,443 @@
+# backtester/execution/order_book.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from backtester.core.event_queue import EventQueue
+from backtester.events import FillEvent, OrderEvent, OrderType, Side
+from backtester.execution.execution_handler import CommissionModel
+
+# on-disk layout for locally stored depth snapshots/deltas (np.save / np.load(mmap_mode="r"))
+# side: 0 = bid, 1 = ask | size == 0 deletes the level
+DEPTH_DTYPE = np.dtype(
+    [
+        ("ts", "i8"),
+        ("side", "i1"),
+        ("price", "f8"),
+        ("size", "f8"),
+    ]
+)
+
+BID = 0
+ASK = 1
+
+
+@dataclass(slots=True)
+class RestingOrder:
+    """
+    A passive limit order waiting in the book.
+    queue_ahead = size in front of us at our level (FIFO queue position): the displayed
+    size when we joined plus our own earlier orders at that level.
+    """
+
+    id: str
+    side: Side
+    level: int
+    qty: float
+    queue_ahead: float
+
+
+class L2OrderBook:
+    """
+    Array-backed L2 order book on a fixed tick grid.
+
+    - bid/ask sizes live in two float64 arrays indexed by tick offset from base_price
+      (no per-level Python objects, updates are O(1) array writes)
+    - best bid/ask are tracked as level indices; a full scan only happens when the
+      best level is emptied
+    - batches of deltas are applied vectorized (last write per level wins)
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        tick_size: float,
+        base_price: float,
+        n_levels: int = 100_000,
+    ) -> None:
+        if tick_size <= 0:
+            raise ValueError(f"L2OrderBook.tick_size must be > 0, got {tick_size}.")
+        if n_levels <= 0:
+            raise ValueError(f"L2OrderBook.n_levels must be > 0, got {n_levels}.")
+
+        self.symbol = symbol
+        self.tick_size = float(tick_size)
+        self.base_price = float(base_price)
+        self.n_levels = int(n_levels)
+
+        self.bids = np.zeros(self.n_levels, dtype=np.float64)
+        self.asks = np.zeros(self.n_levels, dtype=np.float64)
+
+        # sentinels: no bid -> -1, no ask -> n_levels
+        self.best_bid = -1
+        self.best_ask = self.n_levels
+
+        self.resting: dict[str, RestingOrder] = {}
+
+    # ----- price grid -----
+
+    def _raw_level(self, price: float) -> int:
+        return int(round((float(price) - self.base_price) / self.tick_size))
+
+    def on_grid(self, price: float) -> bool:
+        return 0 <= self._raw_level(price) < self.n_levels
+
+    def level_of(self, price: float) -> int:
+        idx = self._raw_level(price)
+        if idx < 0 or idx >= self.n_levels:
+            raise ValueError(
+                f"Price {price} is outside the book grid for {self.symbol}."
+            )
+        return idx
+
+    def levels_of(self, prices: np.ndarray) -> np.ndarray:
+        idx = np.rint(
+            (np.asarray(prices, dtype=np.float64) - self.base_price) / self.tick_size
+        )
+        idx = idx.astype(np.int64)
+        if idx.size and (idx.min() < 0 or idx.max() >= self.n_levels):
+            raise ValueError(f"Depth update outside the book grid for {self.symbol}.")
+        return idx
+
+    def price_of(self, level: int) -> float:
+        return self.base_price + level * self.tick_size
+
+    # ----- top of book -----
+
+    def best_bid_price(self) -> float | None:
+        return None if self.best_bid < 0 else self.price_of(self.best_bid)
+
+    def best_ask_price(self) -> float | None:
+        return None if self.best_ask >= self.n_levels else self.price_of(self.best_ask)
+
+    def mid(self) -> float | None:
+        bb, ba = self.best_bid_price(), self.best_ask_price()
+        if bb is None or ba is None:
+            return None
+        return 0.5 * (bb + ba)
+
+    def _rescan_bid(self) -> None:
+        nz = np.flatnonzero(
+            self.bids[: self.best_bid + 1] if self.best_bid >= 0 else self.bids
+        )
+        self.best_bid = int(nz[-1]) if nz.size else -1
+
+    def _rescan_ask(self) -> None:
+        start = self.best_ask if self.best_ask < self.n_levels else 0
+        nz = np.flatnonzero(self.asks[start:])
+        self.best_ask = int(nz[0]) + start if nz.size else self.n_levels
+
+    # ----- reconstruction from snapshots / deltas -----
+
+    def clear(self) -> None:
+        self.bids[:] = 0.0
+        self.asks[:] = 0.0
+        self.best_bid = -1
+        self.best_ask = self.n_levels
+
+    def apply_snapshot(
+        self,
+        bid_prices: np.ndarray,
+        bid_sizes: np.ndarray,
+        ask_prices: np.ndarray,
+        ask_sizes: np.ndarray,
+    ) -> None:
+        self.clear()
+        self.apply_deltas(BID, bid_prices, bid_sizes)
+        self.apply_deltas(ASK, ask_prices, ask_sizes)
+
+    def update(self, side: int, price: float, size: float) -> None:
+        """
+        Single level update (size == 0 deletes the level).
+        """
+        idx = self.level_of(price)
+        size = float(size)
+        if side == BID:
+            old = self.bids[idx]
+            self.bids[idx] = size
+            if size > 0 and idx > self.best_bid:
+                self.best_bid = idx
+            elif size <= 0 and idx == self.best_bid:
+                self._rescan_bid()
+        else:
+            old = self.asks[idx]
+            self.asks[idx] = size
+            if size > 0 and idx < self.best_ask:
+                self.best_ask = idx
+            elif size <= 0 and idx == self.best_ask:
+                self._rescan_ask()
+
+        if size < old and self.resting:
+            self._shrink_queues(side, np.array([idx]), np.array([size]))
+
+    def apply_deltas(self, side: int, prices: np.ndarray, sizes: np.ndarray) -> None:
+        """
+        Vectorized batch of level updates for one side.
+        Within a batch the last update per level wins (same result as applying in order).
+        """
+        idx = self.levels_of(prices)
+        sz = np.asarray(sizes, dtype=np.float64)
+        if idx.size == 0:
+            return
+        if idx.shape != sz.shape:
+            raise ValueError("apply_deltas: prices and sizes must have the same shape.")
+
+        # keep the last write per level
+        rev_idx = idx[::-1]
+        uniq, first_in_rev = np.unique(rev_idx, return_index=True)
+        final = sz[::-1][first_in_rev]
+
+        book = self.bids if side == BID else self.asks
+        shrunk = final < book[uniq]
+        book[uniq] = final
+
+        if side == BID:
+            live = uniq[final > 0]
+            if live.size and live[-1] > self.best_bid:
+                self.best_bid = int(live[-1])
+            elif self.best_bid >= 0 and self.bids[self.best_bid] <= 0:
+                self._rescan_bid()
+        else:
+            live = uniq[final > 0]
+            if live.size and live[0] < self.best_ask:
+                self.best_ask = int(live[0])
+            elif self.best_ask < self.n_levels and self.asks[self.best_ask] <= 0:
+                self._rescan_ask()
+
+        if self.resting and shrunk.any():
+            self._shrink_queues(side, uniq[shrunk], final[shrunk])
+
+    def apply_depth_records(self, records: np.ndarray) -> None:
+        """
+        Apply a DEPTH_DTYPE array (e.g. np.load(path, mmap_mode="r")) in one pass per side.
+        """
+        if records.dtype != DEPTH_DTYPE:
+            raise ValueError(f"Expected DEPTH_DTYPE records, got {records.dtype}.")
+        is_bid = records["side"] == BID
+        self.apply_deltas(BID, records["price"][is_bid], records["size"][is_bid])
+        self.apply_deltas(ASK, records["price"][~is_bid], records["size"][~is_bid])
+
+    def _shrink_queues(self, side: int, levels: np.ndarray, sizes: np.ndarray) -> None:
+        # cancels can only move us forward: queue ahead is capped by the visible size
+        # plus our own orders in front of us at the level
+        want = Side.BUY if side == BID else Side.SELL
+        new_size = dict(zip(levels.tolist(), sizes.tolist(), strict=True))
+        for o in self.resting.values():
+            if o.side == want and o.level in new_size:
+                cap = new_size[o.level]
+                new_size[o.level] += o.qty  # the next order at this level is behind us
+                o.queue_ahead = min(o.queue_ahead, cap)
+
+    # ----- aggressive orders -----
+
+    def walk(
+        self,
+        side: Side,
+        qty: float,
+        limit_price: float | None = None,
+        consume: bool = True,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Walk the opposite side of the book for `qty`.
+        Returns (prices, quantities) per level touched; total may be < qty (partial fill).
+        """
+        if qty <= 0:
+            raise ValueError(f"walk: qty must be > 0, got {qty}.")
+
+        if side == Side.BUY:
+            if self.best_ask >= self.n_levels:
+                return np.empty(0), np.empty(0)
+            # a limit beyond the grid is simply marketable against every level we hold
+            stop = self.n_levels
+            if limit_price is not None:
+                stop = min(max(self._raw_level(limit_price) + 1, 0), self.n_levels)
+            start = self.best_ask
+            if stop <= start:
+                return np.empty(0), np.empty(0)
+            seg = self.asks[start:stop]
+            lv = np.flatnonzero(seg)
+            avail = seg[lv]
+            lv = lv + start
+        else:
+            if self.best_bid < 0:
+                return np.empty(0), np.empty(0)
+            lo = 0
+            if limit_price is not None:
+                lo = min(max(self._raw_level(limit_price), 0), self.n_levels)
+            hi = self.best_bid + 1
+            if hi <= lo:
+                return np.empty(0), np.empty(0)
+            seg = self.bids[lo:hi]
+            lv = np.flatnonzero(seg)[::-1]
+            avail = seg[lv]
+            lv = lv + lo
+
+        cum = np.cumsum(avail)
+        n = int(np.searchsorted(cum, qty, side="left")) + 1
+        n = min(n, lv.size)
+        lv, take = lv[:n], avail[:n].copy()
+        if n and cum[n - 1] > qty:
+            take[-1] -= cum[n - 1] - qty
+
+        if consume and n:
+            if side == Side.BUY:
+                self.asks[lv] -= take
+                self._rescan_ask()
+            else:
+                self.bids[lv] -= take
+                self._rescan_bid()
+
+        return self.base_price + lv * self.tick_size, take
+
+    # ----- passive orders + queue position -----
+
+    def rest(self, order_id: str, side: Side, price: float, qty: float) -> RestingOrder:
+        """
+        Join the back of the queue at `price` (queue ahead = current displayed size
+        plus our own orders already resting there).
+        """
+        idx = self.level_of(price)
+        ahead = float(self.bids[idx] if side == Side.BUY else self.asks[idx])
+        ahead += sum(
+            o.qty for o in self.resting.values() if o.side == side and o.level == idx
+        )
+        o = RestingOrder(
+            id=order_id, side=side, level=idx, qty=float(qty), queue_ahead=ahead
+        )
+        self.resting[order_id] = o
+        return o
+
+    def cancel(self, order_id: str) -> None:
+        gone = self.resting.get(order_id)
+        if gone is None:
+            return
+        # orders placed after it at the same level move up by its remaining qty
+        behind = False
+        for o in self.resting.values():
+            if o is gone:
+                behind = True
+            elif behind and o.side == gone.side and o.level == gone.level:
+                o.queue_ahead = max(o.queue_ahead - gone.qty, 0.0)
+        del self.resting[order_id]
+
+    def on_trade(self, price: float, size: float) -> list[tuple[str, float, float]]:
+        """
+        A print of `size` at `price`. Resting orders through the print fill in full,
+        orders at the print level fill only after the queue ahead of them is consumed.
+        Each order's queue is reduced by the whole print independently (an order's
+        queue already counts our orders in front of it), and the displayed size at
+        the level shrinks by the print.
+        Returns [(order_id, fill_price, fill_qty), ...].
+        """
+        idx = self.level_of(price)
+        size = float(size)
+        fills: list[tuple[str, float, float]] = []
+        done: list[str] = []
+
+        for o in self.resting.values():
+            through = (o.side == Side.BUY and o.level > idx) or (
+                o.side == Side.SELL and o.level < idx
+            )
+            if through:
+                fills.append((o.id, self.price_of(o.level), o.qty))
+                done.append(o.id)
+                continue
+
+            if o.level != idx:
+                continue
+
+            eat = min(size, o.queue_ahead)
+            o.queue_ahead -= eat
+            q = min(size - eat, o.qty)
+            if q <= 0:
+                continue
+            o.qty -= q
+            fills.append((o.id, self.price_of(o.level), q))
+            if o.qty <= 1e-12:
+                done.append(o.id)
+
+        for oid in done:
+            self.resting.pop(oid, None)
+
+        # the print traded against whichever side displays size at the level
+        if self.bids[idx] > 0:
+            self.bids[idx] = max(self.bids[idx] - size, 0.0)
+            if self.bids[idx] == 0.0 and idx == self.best_bid:
+                self._rescan_bid()
+        elif self.asks[idx] > 0:
+            self.asks[idx] = max(self.asks[idx] - size, 0.0)
+            if self.asks[idx] == 0.0 and idx == self.best_ask:
+                self._rescan_ask()
+        return fills
+
+
+class OrderBookExecutionHandler:
+    """
+    Converts OrderEvent -> FillEvent(s) by walking an L2OrderBook.
+    - MKT orders consume depth level by level (market impact, partial fills)
+    - LMT orders take what is marketable, the remainder rests with queue position
+      (if its limit is on the book's grid)
+    One FillEvent is emitted per price level touched.
+    """
+
+    def __init__(
+        self,
+        events: EventQueue,
+        books: dict[str, L2OrderBook],
+        commission: CommissionModel | None = None,
+    ) -> None:
+        self.events = events
+        self.books = books
+        self.commission = commission or CommissionModel(
+            model="per_trade", per_trade_fee=1.0
+        )
+        self._order_meta: dict[str, tuple[str, Side]] = {}
+        self._next_id = 0
+
+    def _emit(self, ts, symbol: str, side: Side, qty: float, px: float) -> None:
+        fee = float(self.commission.calculate(qty, px))
+        self.events.put(
+            FillEvent(
+                ts=ts,
+                symbol=symbol,
+                side=side,
+                qty=float(qty),
+                fill_price=float(px),
+                fee=fee,
+            )
+        )
+
+    def on_order(self, event: OrderEvent) -> None:
+        book = self.books.get(event.symbol)
+        if book is None:
+            return  # no book for this symbol; skip
+
+        limit = float(event.limit_price) if event.order_type == OrderType.LMT else None
+        prices, qtys = book.walk(event.side, float(event.qty), limit_price=limit)
+        for px, q in zip(prices.tolist(), qtys.tolist(), strict=True):
+            self._emit(event.ts, event.symbol, event.side, q, px)
+
+        left = float(event.qty) - float(qtys.sum())
+        # a remainder priced off the grid has no level to queue at: it is dropped,
+        # the marketable part above stands
+        if event.order_type == OrderType.LMT and left > 1e-12 and book.on_grid(limit):
+            oid = event.id or f"{event.symbol}-{self._next_id}"
+            self._next_id += 1
+            book.rest(oid, event.side, limit, left)
+            self._order_meta[oid] = (event.symbol, event.side)
+
+    def on_trade(self, ts, symbol: str, price: float, size: float) -> None:
+        book = self.books.get(symbol)
+        if book is None:
+            return
+        for oid, px, q in book.on_trade(price, size):
+            meta = self._order_meta.get(oid)
+            if meta is None:
+                continue  # rested on the book directly, not through this handler
+            _, side = meta
+            if oid not in book.resting:
+                del self._order_meta[oid]
+            self._emit(ts, symbol, side, q, px)
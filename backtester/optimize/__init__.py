@@ -0,0 +1,24 @@
+# backtester/optimize/__init__.py
+from .optimizer import Optimizer, OptimizeResult, optimize
+from .samplers import Observation, RandomSampler, TPESampler
+from .space import Choice, FloatParam, IntParam, SearchSpace, apply_params
+from .trial import StepResult, Trial, TrialStep, count_bars, run_step
+
+__all__ = [
+    "OptimizeResult",
+    "Optimizer",
+    "optimize",
+    "Observation",
+    "RandomSampler",
+    "TPESampler",
+    "Choice",
+    "FloatParam",
+    "IntParam",
+    "SearchSpace",
+    "apply_params",
+    "StepResult",
+    "Trial",
+    "TrialStep",
+    "count_bars",
+    "run_step",
+]
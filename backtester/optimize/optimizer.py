@@ -0,0 +1,269 @@
+# backtester/optimize/optimizer.py
+
+from __future__ import annotations
+
+import math
+import tempfile
+from collections.abc import Sequence
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from backtester.analysis.metrics import BacktestMetrics
+from backtester.core.config import RunPlan
+from backtester.optimize.samplers import Observation, RandomSampler, TPESampler
+from backtester.optimize.space import SearchSpace, apply_params
+from backtester.optimize.trial import StepResult, Trial, TrialStep, count_bars, run_step
+
+_OBJECTIVES = tuple(f.name for f in fields(BacktestMetrics))
+
+
+@dataclass(frozen=True)
+class OptimizeResult:
+    """
+    All trials (pruned ones keep their last interim score) and the work done:
+    bars_run counts engine bars actually processed; full runs of every trial
+    from bar 0 would have cost n_trials * max_bars.
+    """
+
+    best: Trial
+    trials: list[Trial]
+    bars_run: int
+    max_bars: int
+
+    def table(self) -> pd.DataFrame:
+        rows = [
+            {
+                "trial_id": t.trial_id,
+                **t.params,
+                "bars": t.bars,
+                "score": t.score,
+                "pruned": t.pruned,
+            }
+            for t in self.trials
+        ]
+        return pd.DataFrame(rows).set_index("trial_id")
+
+
+class Optimizer:
+    """
+    Searches `space` around a base RunPlan, scoring each candidate by a
+    BacktestMetrics field (objective) of its equity curve so far.
+
+    - random_search(n): n candidates on the full data
+    - successive_halving(n, min_bars, eta): n candidates on the first
+      max_bars / eta**k >= min_bars bars, the best 1/eta continue on eta x as many
+      bars, ... up to the full data
+    - hyperband(min_bars, eta): successive-halving brackets from many short to few
+      long candidates, so a bad min_bars guess is hedged
+    Candidates come from `sampler` (RandomSampler or TPESampler over this space).
+
+    A candidate that continues resumes its pickled engine (checkpoint_dir, a temp
+    dir by default) instead of replaying from bar 0. Every rung runs its candidates
+    across `workers` processes; results don't depend on the worker count.
+    """
+
+    def __init__(
+        self,
+        plan: RunPlan,
+        space: SearchSpace,
+        objective: str = "sharpe",
+        maximize: bool = True,
+        sampler: RandomSampler | TPESampler | None = None,
+        workers: int = 1,
+        seed: int = 0,
+        checkpoint_dir: str | Path | None = None,
+        max_bars: int | None = None,
+    ) -> None:
+        if objective not in _OBJECTIVES:
+            raise ValueError(
+                f"Optimizer.objective must be one of {_OBJECTIVES}, got {objective!r}."
+            )
+        if workers < 1:
+            raise ValueError(f"Optimizer.workers must be >= 1, got {workers}.")
+        self.plan = plan
+        self.space = space
+        self.objective = objective
+        self.maximize = bool(maximize)
+        self.sampler = sampler or RandomSampler(space)
+        self.workers = int(workers)
+        self.rng = np.random.default_rng(seed)
+        self.checkpoint_dir = checkpoint_dir
+        self.max_bars = int(max_bars) if max_bars is not None else count_bars(plan)
+        if self.max_bars < 1:
+            raise ValueError("Optimizer: the plan's data has no bars.")
+
+        self.trials: list[Trial] = []
+        self.observations: list[Observation] = []
+        self.bars_run = 0
+        self._pool: Executor | None = None
+        self._ckpt: Path | None = None
+
+    # ----- public drivers -----
+
+    def random_search(self, n_trials: int) -> OptimizeResult:
+        return self._drive(
+            lambda: self._halving(self._new_trials(n_trials), [self.max_bars], 1)
+        )
+
+    def successive_halving(
+        self, n_trials: int, min_bars: int, eta: int = 3
+    ) -> OptimizeResult:
+        budgets = self._budgets(self._rungs(eta, min_bars), eta)
+        return self._drive(
+            lambda: self._halving(self._new_trials(n_trials), budgets, eta)
+        )
+
+    def hyperband(self, min_bars: int, eta: int = 3) -> OptimizeResult:
+        s_max = self._rungs(eta, min_bars)
+
+        def brackets() -> None:
+            for s in range(s_max, -1, -1):
+                n = int(math.ceil((s_max + 1) / (s + 1) * eta**s))
+                self._halving(self._new_trials(n), self._budgets(s, eta), eta)
+
+        return self._drive(brackets)
+
+    # ----- internals -----
+
+    def _rungs(self, eta: int, min_bars: int) -> int:
+        # s such that max_bars / eta**s is the smallest budget >= min_bars
+        if eta < 2:
+            raise ValueError(f"Optimizer: eta must be >= 2, got {eta}.")
+        if not 1 <= min_bars <= self.max_bars:
+            raise ValueError(
+                f"Optimizer: min_bars must be in [1, {self.max_bars}], got {min_bars}."
+            )
+        return int(math.floor(math.log(self.max_bars / min_bars, eta) + 1e-9))
+
+    def _budgets(self, s: int, eta: int) -> list[int]:
+        return [
+            max(1, int(round(self.max_bars * eta ** (i - s)))) for i in range(s + 1)
+        ]
+
+    def _drive(self, body) -> OptimizeResult:
+        with tempfile.TemporaryDirectory(prefix="bt-opt-") as tmp:
+            self._ckpt = Path(self.checkpoint_dir or tmp)
+            self._ckpt.mkdir(parents=True, exist_ok=True)
+            pool = (
+                ProcessPoolExecutor(max_workers=self.workers)
+                if self.workers > 1
+                else None
+            )
+            self._pool = pool
+            try:
+                body()
+            finally:
+                self._pool = None
+                if pool is not None:
+                    pool.shutdown()
+        return self.result()
+
+    def _key(self, score: float) -> float:
+        if math.isnan(score):
+            return -math.inf
+        return score if self.maximize else -score
+
+    def _new_trials(self, n: int) -> list[Trial]:
+        seen = {tuple(sorted(t.params.items())) for t in self.trials}
+        out = []
+        for _ in range(n):
+            for _ in range(100):  # avoid re-running a configuration already tried
+                params = self.sampler.suggest(self.rng, self.observations)
+                if tuple(sorted(params.items())) not in seen:
+                    break
+            seen.add(tuple(sorted(params.items())))
+            trial = Trial(trial_id=len(self.trials), params=params)
+            self.trials.append(trial)
+            out.append(trial)
+        return out
+
+    def _halving(self, trials: list[Trial], budgets: Sequence[int], eta: int) -> None:
+        alive = trials
+        for k, budget in enumerate(budgets):
+            self._run_rung(alive, budget)
+            if k == len(budgets) - 1:
+                break
+            ranked = sorted(alive, key=lambda t: (-self._key(t.score), t.trial_id))
+            keep = max(1, len(alive) // eta)
+            for t in ranked[keep:]:
+                t.pruned = True
+            alive = ranked[:keep]
+
+    def _run_rung(self, trials: list[Trial], budget: int) -> None:
+        steps = []
+        for t in trials:
+            plan = apply_params(self.plan, t.params)
+            steps.append(
+                TrialStep(
+                    trial_id=t.trial_id,
+                    plan=plan,
+                    budget=budget,
+                    # content-addressed: a kept checkpoint_dir is only reused by the same plan
+                    checkpoint=str(self._ckpt / f"{plan.hash()[:16]}.pkl"),
+                    objective=self.objective,
+                )
+            )
+        if self._pool is not None:
+            results: list[StepResult] = list(self._pool.map(run_step, steps))
+        else:
+            results = [run_step(s) for s in steps]
+
+        for t, r in zip(trials, results, strict=True):
+            t.bars = r.bars
+            t.score = r.score
+            t.metrics = r.metrics
+            t.rungs.append((r.bars, r.score))
+            self.bars_run += r.ran
+            self.observations.append(Observation(t.params, budget, self._key(r.score)))
+
+    def result(self) -> OptimizeResult:
+        if not self.trials:
+            raise ValueError("Optimizer: no trials have run.")
+        # best = top score among the candidates that reached the most bars
+        top = max(t.bars for t in self.trials)
+        finalists = [t for t in self.trials if t.bars == top]
+        best = min(finalists, key=lambda t: (-self._key(t.score), t.trial_id))
+        return OptimizeResult(
+            best=best,
+            trials=list(self.trials),
+            bars_run=self.bars_run,
+            max_bars=self.max_bars,
+        )
+
+
+def optimize(
+    plan: RunPlan,
+    space: SearchSpace,
+    method: str = "hyperband",
+    n_trials: int = 27,
+    min_bars: int | None = None,
+    eta: int = 3,
+    sampler: str = "random",
+    **kwargs: Any,
+) -> OptimizeResult:
+    """
+    One-call front end: method "random" | "halving" | "hyperband", sampler "random" | "tpe".
+    min_bars defaults to max_bars / eta**3 (four rungs).
+    """
+    if sampler not in ("random", "tpe"):
+        raise ValueError(
+            f"optimize: sampler must be 'random' or 'tpe', got {sampler!r}."
+        )
+    opt = Optimizer(
+        plan, space, sampler=TPESampler(space) if sampler == "tpe" else None, **kwargs
+    )
+    min_bars = min_bars or max(1, opt.max_bars // eta**3)
+    if method == "random":
+        return opt.random_search(n_trials)
+    if method == "halving":
+        return opt.successive_halving(n_trials, min_bars, eta)
+    if method == "hyperband":
+        return opt.hyperband(min_bars, eta)
+    raise ValueError(
+        f"optimize: method must be 'random', 'halving' or 'hyperband', got {method!r}."
+    )
@@ -0,0 +1,144 @@
+# backtester/optimize/samplers.py
+
+from __future__ import annotations
+
+import math
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from backtester.optimize.space import Choice, SearchSpace
+
+
+@dataclass(frozen=True)
+class Observation:
+    """
+    A trial's params and its score after `bars` bars (higher is better; failed = -inf).
+    """
+
+    params: dict[str, Any]
+    bars: int
+    score: float
+
+
+class RandomSampler:
+    def __init__(self, space: SearchSpace) -> None:
+        self.space = space
+
+    def suggest(
+        self, rng: np.random.Generator, observations: Sequence[Observation]
+    ) -> dict[str, Any]:
+        return self.space.sample(rng)
+
+
+class TPESampler:
+    """
+    Tree-structured Parzen estimator (independent per parameter, no external services).
+
+    Observations at the largest budget with at least n_startup scores are split into
+    the top gamma fraction (good) and the rest (bad). Per parameter, n_candidates
+    are drawn from the good density l(x) and the one maximizing l(x) / g(x) is kept.
+    Numeric params use Gaussian kernels in the unit space (log-scaled where the
+    param is), choices use smoothed frequencies. Until enough scores exist, and for
+    suggestions that violate the space's constraint, it samples at random.
+    """
+
+    def __init__(
+        self,
+        space: SearchSpace,
+        n_startup: int = 10,
+        gamma: float = 0.25,
+        n_candidates: int = 24,
+        max_tries: int = 20,
+    ) -> None:
+        if n_startup < 2:
+            raise ValueError(f"TPESampler.n_startup must be >= 2, got {n_startup}.")
+        if not 0.0 < gamma < 1.0:
+            raise ValueError(f"TPESampler.gamma must be in (0, 1), got {gamma}.")
+        self.space = space
+        self.n_startup = int(n_startup)
+        self.gamma = float(gamma)
+        self.n_candidates = int(n_candidates)
+        self.max_tries = int(max_tries)
+
+    def _split(self, observations: Sequence[Observation]):
+        counts: dict[int, int] = {}
+        for o in observations:
+            counts[o.bars] = counts.get(o.bars, 0) + 1
+        usable = [b for b, c in counts.items() if c >= self.n_startup]
+        if not usable:
+            return None
+        bars = max(usable)
+        obs = sorted(
+            (o for o in observations if o.bars == bars), key=lambda o: -o.score
+        )
+        n_good = max(1, math.ceil(self.gamma * len(obs)))
+        return obs[:n_good], obs[n_good:]
+
+    def suggest(
+        self, rng: np.random.Generator, observations: Sequence[Observation]
+    ) -> dict[str, Any]:
+        split = self._split(observations)
+        if split is None:
+            return self.space.sample(rng)
+        good, bad = split
+        for _ in range(self.max_tries):
+            params = {
+                name: self._suggest_param(
+                    rng,
+                    p,
+                    [o.params[name] for o in good],
+                    [o.params[name] for o in bad],
+                )
+                for name, p in self.space.params.items()
+            }
+            if self.space.valid(params):
+                return params
+        return self.space.sample(rng)
+
+    def _suggest_param(self, rng: np.random.Generator, p, good: list, bad: list) -> Any:
+        if isinstance(p, Choice):
+            k = len(p.values)
+            index = {v: i for i, v in enumerate(p.values)}
+            lw = np.ones(k)
+            gw = np.ones(k)
+            for v in good:
+                lw[index[v]] += 1.0
+            for v in bad:
+                gw[index[v]] += 1.0
+            lw /= lw.sum()
+            gw /= gw.sum()
+            cand = rng.choice(k, size=self.n_candidates, p=lw)
+            return p.values[int(cand[np.argmax(lw[cand] / gw[cand])])]
+
+        lu = np.array([p.to_unit(v) for v in good])
+        gu = np.array([p.to_unit(v) for v in bad])
+        # candidates from l(x): a kernel around a good point, or the uniform prior
+        pick = rng.integers(0, len(lu) + 1, self.n_candidates)
+        u = rng.random(self.n_candidates)
+        kernel = pick < len(lu)
+        h_l = _bandwidth(lu)
+        u[kernel] = lu[pick[kernel]] + rng.normal(0.0, h_l, int(kernel.sum()))
+        u = np.abs(u)
+        u = np.where(u > 1.0, 2.0 - u, u).clip(0.0, 1.0)  # reflect into [0, 1]
+        values = [p.from_unit(x) for x in u.tolist()]
+        x = np.array([p.to_unit(v) for v in values])
+        ratio = _parzen(x, lu, h_l) / _parzen(x, gu, _bandwidth(gu))
+        return values[int(np.argmax(ratio))]
+
+
+def _bandwidth(u: np.ndarray) -> float:
+    if len(u) < 2:
+        return 0.25
+    return float(np.clip(1.06 * u.std() * len(u) ** -0.2, 0.05, 0.5))
+
+
+def _parzen(x: np.ndarray, centers: np.ndarray, h: float) -> np.ndarray:
+    # mixture of the uniform prior (density 1) and one Gaussian kernel per center
+    dens = np.ones(len(x))
+    if len(centers):
+        z = (x[:, None] - centers[None, :]) / h
+        dens += (np.exp(-0.5 * z * z) / (h * math.sqrt(2 * math.pi))).sum(axis=1)
+    return dens / (len(centers) + 1)
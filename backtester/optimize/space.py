@@ -0,0 +1,183 @@
+# backtester/optimize/space.py
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field, replace
+from typing import Any
+
+import numpy as np
+
+from backtester.core.config import RunPlan
+
+# dotted parameter names address the plan's cost / portfolio sections
+_SECTIONS = ("commission", "slippage", "portfolio")
+
+
+@dataclass(frozen=True)
+class IntParam:
+    """
+    Integers low..high (inclusive) on a step grid; log=True samples log-uniformly.
+    """
+
+    low: int
+    high: int
+    step: int = 1
+    log: bool = False
+
+    def __post_init__(self) -> None:
+        if self.high < self.low:
+            raise ValueError(
+                f"IntParam.high must be >= low, got {self.low}..{self.high}."
+            )
+        if self.step < 1:
+            raise ValueError(f"IntParam.step must be >= 1, got {self.step}.")
+        if self.log and self.low <= 0:
+            raise ValueError(f"IntParam.low must be > 0 for log=True, got {self.low}.")
+
+    def from_unit(self, u: float) -> int:
+        u = min(max(float(u), 0.0), 1.0)
+        if self.log:
+            x = math.exp(
+                math.log(self.low) + u * (math.log(self.high) - math.log(self.low))
+            )
+            k = round((x - self.low) / self.step)
+        else:
+            k = math.floor(u * ((self.high - self.low) // self.step + 1))
+        return int(min(self.low + k * self.step, self.high))
+
+    def to_unit(self, value: Any) -> float:
+        if self.high == self.low:
+            return 0.5
+        if self.log:
+            return (math.log(value) - math.log(self.low)) / (
+                math.log(self.high) - math.log(self.low)
+            )
+        n = (self.high - self.low) // self.step + 1
+        return ((value - self.low) // self.step + 0.5) / n
+
+
+@dataclass(frozen=True)
+class FloatParam:
+    """
+    Floats in [low, high]; log=True samples log-uniformly.
+    """
+
+    low: float
+    high: float
+    log: bool = False
+
+    def __post_init__(self) -> None:
+        if self.high < self.low:
+            raise ValueError(
+                f"FloatParam.high must be >= low, got {self.low}..{self.high}."
+            )
+        if self.log and self.low <= 0:
+            raise ValueError(
+                f"FloatParam.low must be > 0 for log=True, got {self.low}."
+            )
+
+    def from_unit(self, u: float) -> float:
+        u = min(max(float(u), 0.0), 1.0)
+        if self.log:
+            return float(
+                math.exp(
+                    math.log(self.low) + u * (math.log(self.high) - math.log(self.low))
+                )
+            )
+        return float(self.low + u * (self.high - self.low))
+
+    def to_unit(self, value: Any) -> float:
+        if self.high == self.low:
+            return 0.5
+        if self.log:
+            return (math.log(value) - math.log(self.low)) / (
+                math.log(self.high) - math.log(self.low)
+            )
+        return (value - self.low) / (self.high - self.low)
+
+
+@dataclass(frozen=True)
+class Choice:
+    values: tuple[Any, ...]
+
+    def __post_init__(self) -> None:
+        if not self.values:
+            raise ValueError("Choice.values must not be empty.")
+
+    def from_unit(self, u: float) -> Any:
+        return self.values[min(int(float(u) * len(self.values)), len(self.values) - 1)]
+
+
+Param = IntParam | FloatParam | Choice
+
+
+@dataclass(frozen=True)
+class SearchSpace:
+    """
+    Named parameters to search plus an optional validity constraint, e.g.
+    SearchSpace({"fast": IntParam(2, 50), "slow": IntParam(10, 200),
+                 "slippage.bps": FloatParam(0.0, 5.0)},
+                constraint=lambda p: p["fast"] < p["slow"])
+
+    Plain names are strategy params; "commission.x" / "slippage.x" / "portfolio.x"
+    override the plan's cost and portfolio specs (see apply_params).
+    """
+
+    params: Mapping[str, Param]
+    constraint: Callable[[dict[str, Any]], bool] | None = field(
+        default=None, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        if not self.params:
+            raise ValueError("SearchSpace.params must not be empty.")
+        for name in self.params:
+            section, dot, _ = name.partition(".")
+            if dot and section not in _SECTIONS:
+                raise ValueError(
+                    f"SearchSpace param {name!r}: section must be one of {_SECTIONS}."
+                )
+
+    def valid(self, params: dict[str, Any]) -> bool:
+        return self.constraint is None or bool(self.constraint(params))
+
+    def sample(
+        self, rng: np.random.Generator, max_tries: int = 1_000
+    ) -> dict[str, Any]:
+        for _ in range(max_tries):
+            u = rng.random(len(self.params)).tolist()
+            params = {
+                name: p.from_unit(x)
+                for (name, p), x in zip(self.params.items(), u, strict=True)
+            }
+            if self.valid(params):
+                return params
+        raise ValueError(
+            f"SearchSpace: no valid sample in {max_tries} tries (constraint too tight?)."
+        )
+
+
+def apply_params(plan: RunPlan, params: Mapping[str, Any]) -> RunPlan:
+    """
+    Plan with `params` applied: plain names -> strategy params, dotted names ->
+    fields of plan.commission / plan.slippage / plan.portfolio.
+    """
+    strategy: dict[str, Any] = {}
+    sections: dict[str, dict[str, Any]] = {s: {} for s in _SECTIONS}
+    for name, value in params.items():
+        section, dot, key = name.partition(".")
+        if not dot:
+            strategy[name] = value
+        elif section in sections:
+            sections[section][key] = value
+        else:
+            raise ValueError(
+                f"apply_params: unknown section in {name!r} (expected one of {_SECTIONS})."
+            )
+
+    if strategy:
+        plan = plan.with_params(**strategy)
+    updates = {s: replace(getattr(plan, s), **kv) for s, kv in sections.items() if kv}
+    return replace(plan, **updates) if updates else plan
@@ -0,0 +1,123 @@
+# backtester/optimize/trial.py
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import pickle
+from collections.abc import Iterator
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from backtester.analysis.metrics import compute_metrics
+from backtester.core.config import RunPlan
+from backtester.core.engine import BacktestEngine
+from backtester.data.bar_store import BarStore
+from backtester.events import MarketEvent
+
+
+@dataclass
+class Trial:
+    """
+    One candidate configuration and its interim results, one (bars, score) per rung.
+    """
+
+    trial_id: int
+    params: dict[str, Any]
+    bars: int = 0
+    score: float = math.nan
+    metrics: dict[str, float] = field(default_factory=dict)
+    rungs: list[tuple[int, float]] = field(default_factory=list)
+    pruned: bool = False
+
+
+@dataclass(frozen=True)
+class TrialStep:
+    """
+    Run trial_id's plan up to `budget` bars, resuming from `checkpoint` if it exists.
+    """
+
+    trial_id: int
+    plan: RunPlan
+    budget: int
+    checkpoint: str | None = None
+    objective: str = "sharpe"
+
+
+@dataclass(frozen=True)
+class StepResult:
+    trial_id: int
+    bars: int  # bars seen by the engine after the step
+    ran: int  # bars processed by this step (bars - resumed offset)
+    score: float
+    metrics: dict[str, float]
+
+
+def count_bars(plan: RunPlan) -> int:
+    """
+    Length of the plan's market event feed (what engine.bars_seen reaches on a full run).
+    """
+    if plan.data.source == "store":
+        store = BarStore(plan.data.path)
+        return sum(
+            len(store.get(s).window(plan.start, plan.end)) for s in plan.universe
+        )
+    return sum(1 for _ in plan.market_events())
+
+
+def feed_from(plan: RunPlan, offset: int) -> Iterator[MarketEvent]:
+    """
+    The plan's market events from the offset-th on (a resumed engine's next bar).
+    """
+    if plan.data.source == "store" and len(plan.universe) == 1:
+        bars = BarStore(plan.data.path).get(plan.symbol).window(plan.start, plan.end)
+        return bars.slice(offset, len(bars)).market_events()
+    return itertools.islice(plan.market_events(), offset, None)
+
+
+def _load(path: Path | None, budget: int) -> BacktestEngine | None:
+    if path is None or not path.exists():
+        return None
+    with path.open("rb") as f:
+        engine = pickle.load(f)
+    # a checkpoint past this budget (e.g. from an earlier, longer schedule) can't be rewound
+    return engine if engine.bars_seen <= budget else None
+
+
+def _save(path: Path, engine: BacktestEngine) -> None:
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    with tmp.open("wb") as f:
+        pickle.dump(engine, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, path)  # atomic: a concurrent reader sees the old or the new state
+
+
+def run_step(step: TrialStep) -> StepResult:
+    """
+    Process-pool entry point: advance one trial to its budget and score the equity
+    curve so far. The engine (strategy, portfolio, execution state) is pickled to
+    step.checkpoint, so the next rung continues from here instead of bar 0.
+    """
+    path = Path(step.checkpoint) if step.checkpoint else None
+    engine = _load(path, step.budget)
+    if engine is None:
+        engine = step.plan.build()
+    start = engine.bars_seen
+    engine.run(feed_from(step.plan, start), max_bars=step.budget - start)
+    if path is not None:
+        _save(path, engine)
+
+    curve = engine.portfolio.equity_curve_df()
+    metrics = (
+        asdict(compute_metrics(curve, periods_per_year=step.plan.periods_per_year))
+        if len(curve) > 1
+        else {}
+    )
+    return StepResult(
+        trial_id=step.trial_id,
+        bars=engine.bars_seen,
+        ran=engine.bars_seen - start,
+        score=float(metrics.get(step.objective, math.nan)),
+        metrics=metrics,
+    )
@@ -0,0 +1,232 @@
+# backtester/portfolio/ledger.py
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backtester.events import FillEvent, Side, to_epoch_ns
+from backtester.portfolio.lots import LotBook
+
+# column -> dtype (one growable array per column)
+LEDGER_COLUMNS: dict[str, str] = {
+    "ts": "i8",  # epoch ns
+    "symbol_id": "i4",
+    "side": "i1",  # +1 BUY, -1 SELL
+    "qty": "f8",
+    "price": "f8",
+    "fee": "f8",
+    "realized_pnl": "f8",  # per the LotBook method (FIFO by default), gross of fees
+}
+
+
+class TradeLedger:
+    """
+    Append-only, array-backed fill log.
+
+    - one preallocated array per column, doubled when full (O(1) amortized append)
+    - symbols are interned to int ids (ledger.symbols[id] -> name)
+    - realized PnL per fill from a LotBook (FIFO or average-cost lots, long and
+      short), which also keeps running unrealized PnL once marked
+    - round trips are derived afterwards in one vectorized pass
+    """
+
+    def __init__(self, capacity: int = 1024, lot_method: str = "fifo") -> None:
+        self._cap = max(int(capacity), 1)
+        self._n = 0
+        self._cols = {
+            k: np.empty(self._cap, dtype=dt) for k, dt in LEDGER_COLUMNS.items()
+        }
+        self.symbols: list[str] = []
+        self._sym_ids: dict[str, int] = {}
+        self.lots = LotBook(lot_method)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def symbol_id(self, symbol: str) -> int:
+        sid = self._sym_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._sym_ids[symbol] = sid
+            self.symbols.append(symbol)
+        return sid
+
+    def _grow(self) -> None:
+        self._cap *= 2
+        for k, arr in self._cols.items():
+            new = np.empty(self._cap, dtype=arr.dtype)
+            new[: self._n] = arr[: self._n]
+            self._cols[k] = new
+
+    def record(
+        self,
+        ts,
+        symbol: str,
+        side: Side,
+        qty: float,
+        price: float,
+        fee: float = 0.0,
+    ) -> float:
+        """
+        Append one fill. Returns the realized PnL of this fill.
+        """
+        if self._n == self._cap:
+            self._grow()
+
+        sid = self.symbol_id(symbol)
+        sign = 1 if side == Side.BUY else -1
+        realized = self.lots.fill(symbol, sign * float(qty), float(price), float(fee))
+
+        i = self._n
+        c = self._cols
+        c["ts"][i] = to_epoch_ns(ts)
+        c["symbol_id"][i] = sid
+        c["side"][i] = sign
+        c["qty"][i] = qty
+        c["price"][i] = price
+        c["fee"][i] = fee
+        c["realized_pnl"][i] = realized
+        self._n = i + 1
+        return realized
+
+    def record_fill(self, event: FillEvent, qty: float | None = None) -> float:
+        q = event.qty if qty is None else qty
+        return self.record(
+            event.ts, event.symbol, event.side, q, event.fill_price, event.fee
+        )
+
+    def apply_split(self, symbol: str, ratio: float) -> None:
+        """
+        Rescale open lots for a split (qty * ratio, price / ratio); cost basis is unchanged.
+        """
+        self.lots.apply_split(symbol, ratio)
+
+    # ----- bulk views / export -----
+
+    def to_arrays(self) -> dict[str, np.ndarray]:
+        """
+        Column views trimmed to the filled length (no copy).
+        """
+        return {k: arr[: self._n] for k, arr in self._cols.items()}
+
+    def drain(self) -> dict[str, np.ndarray]:
+        """
+        Copy out and forget the recorded rows (symbols and open FIFO lots are kept),
+        for spilling a long run to disk in pieces.
+        """
+        out = {k: v.copy() for k, v in self.to_arrays().items()}
+        self._n = 0
+        return out
+
+    def to_frame(self) -> pd.DataFrame:
+        cols = self.to_arrays()
+        df = pd.DataFrame(
+            {k: v for k, v in cols.items() if k not in ("ts", "symbol_id")}
+        )
+        df.insert(
+            0, "symbol", np.asarray(self.symbols, dtype=object)[cols["symbol_id"]]
+        )
+        df.insert(0, "ts", pd.to_datetime(cols["ts"], unit="ns"))
+        return df
+
+    def to_npz(self, path: str | Path) -> None:
+        np.savez(path, symbols=np.asarray(self.symbols, dtype=str), **self.to_arrays())
+
+    @classmethod
+    def from_npz(cls, path: str | Path) -> TradeLedger:
+        with np.load(path) as z:
+            return cls.from_arrays(
+                {k: z[k] for k in LEDGER_COLUMNS}, z["symbols"].tolist()
+            )
+
+    @classmethod
+    def from_arrays(
+        cls, cols: dict[str, np.ndarray], symbols: list[str]
+    ) -> TradeLedger:
+        """
+        Ledger over existing columns (e.g. merged shard results); symbol_id indexes symbols.
+        """
+        n = len(cols["ts"])
+        led = cls(capacity=n)
+        for name in symbols:
+            led.symbol_id(name)
+        for k in LEDGER_COLUMNS:
+            led._cols[k][:n] = cols[k]
+        led._n = n
+        return led
+
+    def to_parquet(self, path: str | Path) -> None:
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError(
+                "TradeLedger.to_parquet requires pyarrow (pip install pyarrow)"
+            ) from e
+
+        cols = self.to_arrays()
+        table = pa.table(
+            {
+                "ts": pa.array(cols["ts"].view("datetime64[ns]")),
+                "symbol": pa.DictionaryArray.from_arrays(
+                    pa.array(cols["symbol_id"]), pa.array(self.symbols, pa.string())
+                ),
+                **{
+                    k: pa.array(v)
+                    for k, v in cols.items()
+                    if k not in ("ts", "symbol_id")
+                },
+            }
+        )
+        pq.write_table(table, path)
+
+    # ----- vectorized post-pass -----
+
+    def round_trips(self, eps: float = 1e-9) -> dict[str, np.ndarray]:
+        """
+        Flat -> position -> flat round trips per symbol (closed trips only).
+
+        Returns columns: symbol_id, entry_ts, exit_ts, n_fills, pnl (realized - fees).
+        """
+        cols = self.to_arrays()
+        n = self._n
+        if n == 0:
+            empty_i = np.empty(0, dtype=np.int64)
+            return {
+                "symbol_id": empty_i.astype(np.int32),
+                "entry_ts": empty_i,
+                "exit_ts": empty_i,
+                "n_fills": empty_i,
+                "pnl": np.empty(0),
+            }
+
+        order = np.lexsort((np.arange(n), cols["symbol_id"]))
+        sym = cols["symbol_id"][order]
+        signed = cols["side"][order] * cols["qty"][order]
+
+        grp_start = np.r_[True, sym[1:] != sym[:-1]]
+        starts = np.flatnonzero(grp_start)
+        csum = np.cumsum(signed)
+        base = csum[starts] - signed[starts]
+        pos = csum - np.repeat(base, np.diff(np.r_[starts, n]))
+        flat = np.abs(pos) < eps
+
+        new_trip = grp_start | np.r_[False, flat[:-1]]
+        trip_starts = np.flatnonzero(new_trip)
+        trip_ends = np.r_[trip_starts[1:] - 1, n - 1]
+        closed = flat[trip_ends]
+
+        net = cols["realized_pnl"][order] - cols["fee"][order]
+        pnl = np.add.reduceat(net, trip_starts)
+        ts = cols["ts"][order]
+
+        return {
+            "symbol_id": sym[trip_starts][closed],
+            "entry_ts": ts[trip_starts][closed],
+            "exit_ts": ts[trip_ends][closed],
+            "n_fills": (trip_ends - trip_starts + 1)[closed],
+            "pnl": pnl[closed],
+        }
@@ -0,0 +1,189 @@
+# backtester/portfolio/lots.py
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+
+LOT_METHODS = ("fifo", "average")
+
+UNASSIGNED = "unassigned"
+
+
+@dataclass(slots=True)
+class Position:
+    """
+    One symbol's open position and running PnL.
+    cost is the signed cost basis of the open quantity (qty * avg_price);
+    lots holds [signed_qty, price] in FIFO mode (empty in average mode).
+    """
+
+    qty: float = 0.0
+    cost: float = 0.0
+    realized: float = 0.0  # closed-lot PnL + income (dividends), gross of fees
+    fees: float = 0.0
+    unrealized: float = 0.0
+    price: float | None = None  # last mark
+    group: str = UNASSIGNED
+    lots: deque[list[float]] = field(default_factory=deque)
+
+    @property
+    def avg_price(self) -> float:
+        return self.cost / self.qty if self.qty else 0.0
+
+    @property
+    def pnl(self) -> float:
+        return self.realized - self.fees + self.unrealized
+
+
+class LotBook:
+    """
+    Lot-level accounting with incrementally maintained PnL.
+
+    - method "fifo": per-symbol lot queues, a closing fill consumes the oldest
+      opposite lots; "average": one average-cost lot per symbol
+    - fill() is O(1) amortized (each lot is opened and closed once), mark() is O(1)
+    - realized / unrealized / fees totals and per-group net PnL (assign(symbol,
+      group), e.g. the strategy trading it) are updated by deltas, so per-bar
+      attribution never replays fills
+    Long and short positions are both supported (short lots carry negative qty).
+    """
+
+    def __init__(self, method: str = "fifo") -> None:
+        if method not in LOT_METHODS:
+            raise ValueError(
+                f"LotBook.method must be one of {LOT_METHODS}, got {method!r}."
+            )
+        self.method = method
+        self.positions: dict[str, Position] = {}
+        self.realized = 0.0
+        self.unrealized = 0.0
+        self.fees = 0.0
+        self.group_pnl: dict[str, float] = {}
+
+    def position(self, symbol: str) -> Position:
+        p = self.positions.get(symbol)
+        if p is None:
+            p = self.positions[symbol] = Position()
+        return p
+
+    @property
+    def pnl(self) -> float:
+        return self.realized - self.fees + self.unrealized
+
+    def assign(self, symbol: str, group: str) -> None:
+        """
+        Attribute symbol's PnL (past and future) to `group`.
+        """
+        p = self.position(symbol)
+        if p.group == group:
+            return
+        if p.pnl:
+            self._group_add(p.group, -p.pnl)
+        p.group = group
+        self._group_add(group, p.pnl)
+
+    def _group_add(self, group: str, delta: float) -> None:
+        self.group_pnl[group] = self.group_pnl.get(group, 0.0) + delta
+
+    def _remark(self, p: Position, realized: float, fee: float) -> None:
+        # refresh unrealized after a change to qty/cost and roll every delta into the totals
+        unrealized = p.qty * p.price - p.cost if p.qty else 0.0
+        du = unrealized - p.unrealized
+        p.unrealized = unrealized
+        p.realized += realized
+        p.fees += fee
+        self.realized += realized
+        self.fees += fee
+        self.unrealized += du
+        self._group_add(p.group, realized - fee + du)
+
+    def fill(
+        self, symbol: str, signed_qty: float, price: float, fee: float = 0.0
+    ) -> float:
+        """
+        Apply a fill (+qty buys, -qty sells). Returns its realized PnL (gross of fees).
+        """
+        p = self.position(symbol)
+        if p.price is None:
+            p.price = price
+        realized = 0.0
+
+        if self.method == "fifo":
+            lots = p.lots
+            remaining = signed_qty
+            # consume opposite-signed lots first-in first-out
+            while lots and remaining != 0.0 and (lots[0][0] > 0) != (remaining > 0):
+                lot = lots[0]
+                q = min(abs(remaining), abs(lot[0]))
+                # long lot closed by a sell, or vice versa
+                direction = 1.0 if lot[0] > 0 else -1.0
+                realized += direction * q * (price - lot[1])
+                p.cost -= direction * q * lot[1]
+                lot[0] -= direction * q
+                remaining += direction * q
+                if abs(lot[0]) < 1e-12:
+                    lots.popleft()
+            if abs(remaining) > 1e-12:
+                lots.append([remaining, price])
+                p.cost += remaining * price
+        elif p.qty == 0.0 or (p.qty > 0) == (signed_qty > 0):
+            p.cost += signed_qty * price
+        else:
+            direction = 1.0 if p.qty > 0 else -1.0
+            closed = min(abs(signed_qty), abs(p.qty))
+            avg = p.cost / p.qty
+            realized = direction * closed * (price - avg)
+            p.cost -= direction * closed * avg
+            rest = abs(signed_qty) - closed
+            if rest > 1e-12:
+                # flipped: the remainder opens at this price
+                p.cost = -direction * rest * price
+
+        p.qty += signed_qty
+        if abs(p.qty) < 1e-12:
+            p.qty = 0.0
+            p.cost = 0.0
+            p.lots.clear()
+        self._remark(p, realized, fee)
+        return realized
+
+    def mark(self, symbol: str, price: float) -> None:
+        p = self.positions.get(symbol)
+        if p is None:
+            return
+        p.price = price
+        if p.qty:
+            self._remark(p, 0.0, 0.0)
+
+    def mark_many(self, prices: Mapping[str, float]) -> None:
+        for symbol, p in self.positions.items():
+            px = prices.get(symbol)
+            if px is not None:
+                p.price = px
+                if p.qty:
+                    self._remark(p, 0.0, 0.0)
+
+    def income(self, symbol: str, amount: float) -> None:
+        """
+        Cash income attributed to symbol (e.g. a dividend; negative when short).
+        """
+        self._remark(self.position(symbol), amount, 0.0)
+
+    def apply_split(self, symbol: str, ratio: float) -> None:
+        """
+        qty * ratio, prices / ratio; cost basis and PnL are unchanged.
+        """
+        p = self.positions.get(symbol)
+        if p is None:
+            return
+        p.qty *= ratio
+        for lot in p.lots:
+            lot[0] *= ratio
+            lot[1] /= ratio
+        if p.price is not None:
+            p.price /= ratio
+
+    def by_symbol(self) -> dict[str, float]:
+        return {s: p.pnl for s, p in self.positions.items()}
@@ -7,7 +7,18 @@ from typing import Any
 import pandas as pd
 
 from backtester.core.event_queue import EventQueue
-from backtester.events import FillEvent, OrderEvent, OrderType, Side, SignalEvent
+from backtester.data.bar_store import to_ns_array
+from backtester.events import (
+    ActionType,
+    CorporateActionEvent,
+    FillEvent,
+    MarketBatchEvent,
+    OrderEvent,
+    OrderType,
+    Side,
+    SignalEvent,
+)
+from backtester.portfolio.ledger import TradeLedger
 
 
 class Portfolio:
@@ -15,6 +26,14 @@ class Portfolio:
     - Holds cash + positions
     - Converts SignalEvent -> OrderEvent using target holdings
     - Enforces cash constraint (no infinite margin)
+    - Records every applied fill in an array-backed TradeLedger
+    - Lot accounting (ledger.lots, FIFO or average cost): each equity row also
+      carries running realized (net of fees) and unrealized PnL
+    - pnl_attribution="symbol" | "strategy": per-bar net PnL per symbol, or per
+      group assigned with lots.assign() (the router assigns its strategies), in
+      pnl_history / pnl_attribution_df()
+    - allow_short: SELL signals target -target_qty instead of flat (v1 is long-only);
+      short proceeds are credited to cash, no margin is modeled
     """
 
     def __init__(
@@ -24,7 +43,14 @@ class Portfolio:
         target_qty: float = 100.0,
         max_qty: float = 200.0,
         est_fee_per_trade: float = 1.0,  # matches your CommissionModel default
+        lot_method: str = "fifo",
+        allow_short: bool = False,
+        pnl_attribution: str | None = None,
     ) -> None:
+        if pnl_attribution not in (None, "symbol", "strategy"):
+            raise ValueError(
+                f"Portfolio.pnl_attribution must be None, 'symbol' or 'strategy', got {pnl_attribution!r}."
+            )
         self.events = events
         self.cash = float(starting_cash)
         self.positions: dict[str, float] = {}
@@ -34,10 +60,42 @@ class Portfolio:
         self.max_qty = float(max_qty)
         self.est_fee_per_trade = float(est_fee_per_trade)
 
+        self.allow_short = bool(allow_short)
+        self.pnl_attribution = pnl_attribution
+
         self.history: list[dict[str, Any]] = []
+        self.pnl_history: list[dict[str, float]] = []
+        self.ledger = TradeLedger(lot_method=lot_method)
+        self.lots = self.ledger.lots
 
     def update_market_price(self, symbol: str, price: float) -> None:
         self.last_price[symbol] = float(price)
+        self.lots.mark(symbol, float(price))
+
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        # update_market_price() for every symbol in the batch
+        closes = batch.closes()
+        self.last_price.update(closes)
+        self.lots.mark_many(closes)
+
+    def on_corporate_action(self, event: CorporateActionEvent) -> None:
+        """
+        Raw-price runs only (adjusted feeds already price the action in):
+        - SPLIT: position * ratio, last price / ratio (value unchanged)
+        - DIVIDEND: cash += position * amount (a short pays it)
+        """
+        sym = event.symbol
+        qty = float(self.positions.get(sym, 0.0))
+        if event.action == ActionType.SPLIT:
+            ratio = float(event.ratio)
+            if qty:
+                self.positions[sym] = qty * ratio
+            if sym in self.last_price:
+                self.last_price[sym] /= ratio
+            self.ledger.apply_split(sym, ratio)
+        elif qty:
+            self.cash += qty * float(event.amount)
+            self.lots.income(sym, qty * float(event.amount))
 
     def total_value(self) -> float:
         total = self.cash
@@ -48,20 +106,44 @@ class Portfolio:
         return float(total)
 
     def update_timeindex(self, ts) -> None:
+        lots = self.lots
         self.history.append(
             {
                 "ts": ts,
                 "equity": self.total_value(),
                 "cash": float(self.cash),
+                "realized": lots.realized - lots.fees,
+                "unrealized": lots.unrealized,
             }
         )
+        if self.pnl_attribution == "symbol":
+            self.pnl_history.append(lots.by_symbol())
+        elif self.pnl_attribution == "strategy":
+            self.pnl_history.append(dict(lots.group_pnl))
 
     def equity_curve_df(self) -> pd.DataFrame:
         df = pd.DataFrame(self.history)
-        df["ts"] = pd.to_datetime(df["ts"])
+        if df.empty:
+            return df
+        # epoch-ns ints -> DatetimeIndex in one step (no per-row string parsing)
+        df["ts"] = to_ns_array(df["ts"].tolist()).view("datetime64[ns]")
         df = df.set_index("ts").sort_index()
         return df
 
+    def pnl_attribution_df(self) -> pd.DataFrame:
+        """
+        Net PnL (realized - fees + unrealized) per symbol / strategy, one row per equity row.
+        """
+        if not self.pnl_attribution:
+            raise ValueError(
+                "Portfolio.pnl_attribution is off; construct with 'symbol' or 'strategy'."
+            )
+        idx = pd.DatetimeIndex(
+            to_ns_array([h["ts"] for h in self.history]).view("datetime64[ns]"),
+            name="ts",
+        )
+        return pd.DataFrame(self.pnl_history, index=idx).fillna(0.0).sort_index()
+
     def on_signal(self, event: SignalEvent) -> None:
         sym = event.symbol
         px = self.last_price.get(sym)
@@ -70,9 +152,13 @@ class Portfolio:
 
         current_qty = float(self.positions.get(sym, 0.0))
 
-        # (c) Target holdings logic: LONG target_qty, otherwise flat
-        desired_qty = self.target_qty if event.side == Side.BUY else 0.0
-        desired_qty = max(0.0, min(desired_qty, self.max_qty))
+        # (c) Target holdings logic: LONG target_qty, otherwise flat (or short)
+        if event.side == Side.BUY:
+            desired_qty = self.target_qty
+        else:
+            desired_qty = -self.target_qty if self.allow_short else 0.0
+        floor = -self.max_qty if self.allow_short else 0.0
+        desired_qty = max(floor, min(desired_qty, self.max_qty))
 
         delta = desired_qty - current_qty
         if abs(delta) < 1e-9:
@@ -82,7 +168,7 @@ class Portfolio:
         order_qty = abs(delta)
 
         # Prevent overselling / shorting in v1
-        if side == Side.SELL:
+        if side == Side.SELL and not self.allow_short:
             order_qty = min(order_qty, current_qty)
             if order_qty <= 0:
                 return
@@ -126,7 +212,11 @@ class Portfolio:
             self.cash -= cost
             self.positions[sym] = current_qty + qty
         else:
-            qty = min(qty, current_qty)  # final safety against oversell
+            if not self.allow_short:
+                qty = min(qty, current_qty)  # final safety against oversell
             proceeds = qty * px - fee
             self.cash += proceeds
             self.positions[sym] = current_qty - qty
+
+        if qty > 0:
+            self.ledger.record_fill(event, qty=qty)
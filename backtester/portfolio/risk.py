@@ -0,0 +1,238 @@
+# backtester/portfolio/risk.py
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from backtester.events import MarketBatchEvent, OrderEvent, OrderType, RiskEvent, Side
+
+
+@dataclass(frozen=True)
+class RiskLimits:
+    """
+    Pre-trade limits; None disables a rule. Notionals are in account currency,
+    concentration / leverage / drawdown are fractions of current equity.
+    - order size rules apply to every order
+    - exposure rules (position, concentration, gross, net, leverage, drawdown)
+      only block orders that increase the absolute position
+    """
+
+    max_order_qty: float | None = None
+    max_order_notional: float | None = None
+    max_position_notional: float | None = None
+    max_concentration: float | None = None  # |position value| / equity
+    max_gross: float | None = None  # sum of |position value|
+    max_net: float | None = None  # |sum of position value|
+    max_leverage: float | None = None  # gross / equity
+    max_drawdown: float | None = None  # 1 - equity / peak equity
+
+    def __post_init__(self) -> None:
+        for f in fields(self):
+            v = getattr(self, f.name)
+            if v is not None and v <= 0:
+                raise ValueError(f"RiskLimits.{f.name} must be > 0 when set, got {v}.")
+
+
+class RiskEngine:
+    """
+    Pre-trade risk stage between Portfolio and ExecutionHandler.
+
+    - per-symbol qty / mark price live in arrays; gross, net and peak equity are
+      running aggregates adjusted by the delta of whatever changed (a price tick,
+      a batch of ticks, one position), never re-summed over the book per order
+    - check(order) evaluates every enabled rule in O(1) and returns a RiskEvent for
+      the first breach (the engine then drops the order and dispatches the event)
+    - resync() re-sums the aggregates exactly; it runs every `resync_every` updates
+      to bound floating-point drift
+    """
+
+    def __init__(
+        self, limits: RiskLimits | None = None, resync_every: int = 100_000
+    ) -> None:
+        self.limits = limits or RiskLimits()
+        self.resync_every = int(resync_every)
+
+        self.cash = 0.0
+        self.gross = 0.0
+        self.net = 0.0
+        self.peak = 0.0
+
+        self._slots: dict[str, int] = {}
+        self._qty = np.zeros(64)
+        self._px = np.zeros(64)
+        self._batch_slots: dict[tuple[str, ...], np.ndarray] = {}
+        self._updates = 0
+
+        self.checked = 0
+        self.breaches: list[RiskEvent] = []
+
+    # ----- state -----
+
+    @property
+    def equity(self) -> float:
+        return self.cash + self.net
+
+    def drawdown(self) -> float:
+        return 1.0 - self.equity / self.peak if self.peak > 0 else 0.0
+
+    def position(self, symbol: str) -> float:
+        s = self._slots.get(symbol)
+        return 0.0 if s is None else float(self._qty[s])
+
+    def _slot(self, symbol: str) -> int:
+        s = self._slots.get(symbol)
+        if s is None:
+            s = self._slots[symbol] = len(self._slots)
+            if s == len(self._qty):
+                self._qty = np.r_[self._qty, np.zeros(s)]
+                self._px = np.r_[self._px, np.zeros(s)]
+        return s
+
+    def attach(self, portfolio) -> None:
+        """
+        Start from a Portfolio's current cash, positions and marks.
+        """
+        self.cash = float(portfolio.cash)
+        for sym, px in portfolio.last_price.items():
+            self._px[self._slot(sym)] = float(px)
+        for sym, qty in portfolio.positions.items():
+            self._qty[self._slot(sym)] = float(qty)
+        self.resync()
+        self.peak = self.equity
+
+    def resync(self) -> None:
+        n = len(self._slots)
+        value = self._qty[:n] * self._px[:n]
+        self.gross = float(np.abs(value).sum())
+        self.net = float(value.sum())
+        self._updates = 0
+
+    def _touch(self) -> None:
+        eq = self.cash + self.net
+        if eq > self.peak:
+            self.peak = eq
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self.resync()
+
+    # ----- incremental updates -----
+
+    def on_price(self, symbol: str, price: float) -> None:
+        s = self._slot(symbol)
+        q = float(self._qty[s])
+        if q:
+            old = q * float(self._px[s])
+            new = q * price
+            self.gross += abs(new) - abs(old)
+            self.net += new - old
+        self._px[s] = price
+        self._touch()
+
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        slots = self._batch_slots.get(batch.symbols)
+        if slots is None:
+            slots = np.fromiter(
+                (self._slot(sym) for sym in batch.symbols), np.int64, len(batch.symbols)
+            )
+            self._batch_slots[batch.symbols] = slots
+        px = np.asarray(batch.close, dtype=np.float64)
+        q = self._qty[slots]
+        old = q * self._px[slots]
+        new = q * px
+        self.gross += float(np.abs(new).sum() - np.abs(old).sum())
+        self.net += float((new - old).sum())
+        self._px[slots] = px
+        self._touch()
+
+    def on_position(
+        self, symbol: str, qty: float, cash: float, price: float | None = None
+    ) -> None:
+        """
+        Sync one symbol after the Portfolio applied a fill or corporate action.
+        """
+        s = self._slot(symbol)
+        old = float(self._qty[s]) * float(self._px[s])
+        if price is not None:
+            self._px[s] = price
+        new = qty * float(self._px[s])
+        self.gross += abs(new) - abs(old)
+        self.net += new - old
+        self._qty[s] = qty
+        self.cash = float(cash)
+        self._touch()
+
+    # ----- pre-trade check -----
+
+    def check(self, order: OrderEvent) -> RiskEvent | None:
+        """
+        First breached rule for this order as a RiskEvent, or None if it may go out.
+        """
+        self.checked += 1
+        lim = self.limits
+        qty = float(order.qty)
+        s = self._slots.get(order.symbol)
+        q = 0.0 if s is None else float(self._qty[s])
+        mark = 0.0 if s is None else float(self._px[s])
+        px = float(order.limit_price) if order.order_type == OrderType.LMT else mark
+
+        if lim.max_order_qty is not None and qty > lim.max_order_qty:
+            return self._breach(order, "max_order_qty", qty, lim.max_order_qty)
+        if lim.max_order_notional is not None and qty * px > lim.max_order_notional:
+            return self._breach(
+                order, "max_order_notional", qty * px, lim.max_order_notional
+            )
+
+        q2 = q + qty if order.side == Side.BUY else q - qty
+        if abs(q2) <= abs(q):
+            return None  # risk-reducing
+
+        pos = abs(q2 * mark)
+        if lim.max_position_notional is not None and pos > lim.max_position_notional:
+            return self._breach(
+                order, "max_position_notional", pos, lim.max_position_notional
+            )
+
+        eq = self.cash + self.net
+        if lim.max_concentration is not None:
+            c = pos / eq if eq > 0 else float("inf")
+            if c > lim.max_concentration:
+                return self._breach(
+                    order, "max_concentration", c, lim.max_concentration
+                )
+
+        gross = self.gross - abs(q * mark) + pos
+        if lim.max_gross is not None and gross > lim.max_gross:
+            return self._breach(order, "max_gross", gross, lim.max_gross)
+
+        if lim.max_net is not None:
+            net = abs(self.net + (q2 - q) * mark)
+            if net > lim.max_net:
+                return self._breach(order, "max_net", net, lim.max_net)
+
+        if lim.max_leverage is not None:
+            lev = gross / eq if eq > 0 else float("inf")
+            if lev > lim.max_leverage:
+                return self._breach(order, "max_leverage", lev, lim.max_leverage)
+
+        if lim.max_drawdown is not None:
+            dd = self.drawdown()
+            if dd > lim.max_drawdown:
+                return self._breach(order, "max_drawdown", dd, lim.max_drawdown)
+        return None
+
+    def _breach(
+        self, order: OrderEvent, rule: str, value: float, limit: float
+    ) -> RiskEvent:
+        event = RiskEvent(
+            ts=order.ts,
+            symbol=order.symbol,
+            rule=rule,
+            value=float(value),
+            limit=float(limit),
+            side=order.side,
+            qty=float(order.qty),
+        )
+        self.breaches.append(event)
+        return event
@@ -1,10 +1,20 @@
 # backtester/strategy/moving_average_crossover.py
 
 from __future__ import annotations
+
+import math
 from collections import deque
 
 from backtester.core.event_queue import EventQueue
-from backtester.events import MarketEvent, SignalEvent, Side
+from backtester.data.ring_buffer import BarHistory
+from backtester.events import (
+    ActionType,
+    CorporateActionEvent,
+    MarketBatchEvent,
+    MarketEvent,
+    Side,
+    SignalEvent,
+)
 from backtester.strategy.strategy import Strategy
 
 
@@ -14,6 +24,10 @@ class MovingAverageCrossStrategy(Strategy):
       - fast > slow => BUY signal
       - fast <= slow => SELL signal
     Debounced: emits only when side changes.
+
+    history: read closes from a shared BarHistory (written by the engine/router)
+    instead of keeping a private deque per instance. The first bar raises
+    ValueError if nothing has written it, instead of silently never trading.
     """
 
     def __init__(
@@ -22,6 +36,7 @@ class MovingAverageCrossStrategy(Strategy):
         symbol: str,
         fast: int = 10,
         slow: int = 30,
+        history: BarHistory | None = None,
     ) -> None:
         if fast >= slow:
             raise ValueError("fast must be < slow")
@@ -31,27 +46,73 @@ class MovingAverageCrossStrategy(Strategy):
         self.fast_n = fast
         self.slow_n = slow
 
+        self.history = history
+        self._history_checked = history is None
+        if history is not None:
+            history.reserve(slow)
         self.prices = deque(maxlen=slow)
         self.last_side: Side | None = None
 
+        # position of self.symbol in the last batch's symbols tuple
+        self._batch_symbols: tuple[str, ...] | None = None
+        self._batch_i = -1
+
     def _sma(self, n: int) -> float:
+        # fsum is exactly rounded: the deque and shared-history paths agree bit for bit
         vals = list(self.prices)[-n:]
-        return sum(vals) / float(n)
+        return math.fsum(vals) / float(n)
 
     def on_market(self, event: MarketEvent) -> None:
         if event.symbol != self.symbol:
             return
+        self._on_close(event.ts, float(event.close))
 
-        self.prices.append(float(event.close))
-        if len(self.prices) < self.slow_n:
-            return
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        # aligned feeds reuse one symbols tuple, so the lookup runs once per universe change
+        if batch.symbols is not self._batch_symbols:
+            self._batch_symbols = batch.symbols
+            self._batch_i = (
+                batch.symbols.index(self.symbol) if self.symbol in batch.symbols else -1
+            )
+        if self._batch_i >= 0:
+            self._on_close(batch.ts, float(batch.close[self._batch_i]))
+
+    def on_corporate_action(self, event: CorporateActionEvent) -> None:
+        # rescale the window so a split in a raw feed doesn't look like a crash
+        # (a shared history is rescaled by its writer)
+        if (
+            self.history is None
+            and event.symbol == self.symbol
+            and event.action == ActionType.SPLIT
+        ):
+            r = float(event.ratio)
+            self.prices = deque((p / r for p in self.prices), maxlen=self.slow_n)
 
-        fast = self._sma(self.fast_n)
-        slow = self._sma(self.slow_n)
+    def _on_close(self, ts, close: float) -> None:
+        if self.history is not None:
+            if not self._history_checked:
+                # the engine/router writes each bar before the strategy sees it
+                if self.history.count(self.symbol) == 0:
+                    raise ValueError(
+                        f"MovingAverageCrossStrategy.history has no bars for {self.symbol!r}; "
+                        "pass the same BarHistory to the engine or router (history=...)."
+                    )
+                self._history_checked = True
+            window = self.history.closes(self.symbol, self.slow_n)
+            if len(window) < self.slow_n:
+                return
+            fast = math.fsum(window[-self.fast_n :].tolist()) / float(self.fast_n)
+            slow = math.fsum(window.tolist()) / float(self.slow_n)
+        else:
+            self.prices.append(close)
+            if len(self.prices) < self.slow_n:
+                return
+            fast = self._sma(self.fast_n)
+            slow = self._sma(self.slow_n)
 
         side = Side.BUY if fast > slow else Side.SELL
 
         # Debounce: only emit on flip
         if self.last_side is None or side != self.last_side:
-            self.events.put(SignalEvent(ts=event.ts, symbol=event.symbol, side=side))
+            self.events.put(SignalEvent(ts=ts, symbol=self.symbol, side=side))
             self.last_side = side
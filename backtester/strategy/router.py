@@ -0,0 +1,186 @@
+# backtester/strategy/router.py
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from backtester.core.engine import BacktestEngine, deliver_batch
+from backtester.core.event_queue import EventQueue
+from backtester.data.ring_buffer import BarHistory
+from backtester.events import (
+    CorporateActionEvent,
+    EventType,
+    MarketBatchEvent,
+    MarketEvent,
+    RiskEvent,
+)
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.portfolio.risk import RiskEngine
+from backtester.strategy.strategy import Strategy
+
+
+class StrategyRouter:
+    """
+    Runs many strategies off one feed pass.
+
+    - symbol -> subscribers index: a bar is only dispatched to strategies
+      subscribed to its symbol
+    - subscribe(): strategy trades the shared netting portfolio (router.engine)
+    - add_isolated(): strategy gets its own sub-portfolio + execution handler
+    - risk: pre-trade RiskEngine for the netting portfolio
+    - history: shared BarHistory written once per feed event in run(), read by
+      every strategy built on it (sub-engines don't write it again)
+    """
+
+    def __init__(
+        self,
+        events: EventQueue | None = None,
+        portfolio: Portfolio | None = None,
+        execution: ExecutionHandler | None = None,
+        history: BarHistory | None = None,
+        risk: RiskEngine | None = None,
+    ) -> None:
+        self.events = events if events is not None else EventQueue()
+        self.history = history
+        self._subscribers: dict[str, list[Strategy]] = {}
+        self._isolated: dict[str, list[BacktestEngine]] = {}
+        self.sleeves: dict[str, BacktestEngine] = {}
+        # symbols tuple -> (netting strategies, isolated engines) touched by such a batch
+        self._batch_routes: dict[
+            tuple[str, ...], tuple[list[Strategy], list[BacktestEngine]]
+        ] = {}
+
+        self.engine: BacktestEngine | None = None
+        if portfolio is not None and execution is not None:
+            self.engine = BacktestEngine(
+                self.events, self, portfolio, execution, risk=risk
+            )
+
+    def subscribe(
+        self,
+        strategy: Strategy,
+        symbols: Iterable[str] | None = None,
+        name: str | None = None,
+    ) -> None:
+        """
+        Attach a strategy to the shared netting portfolio.
+        The strategy must emit into router.events. Its symbols' PnL is attributed
+        to `name` (default: the class name) unless an earlier subscriber claimed them.
+        """
+        if self.engine is None:
+            raise ValueError(
+                "StrategyRouter has no netting portfolio; use add_isolated()."
+            )
+        if strategy.events is not self.events:
+            raise ValueError(
+                "Netting strategies must be constructed with events=router.events."
+            )
+
+        lots = self.engine.portfolio.lots
+        for sym in symbols or (strategy.symbol,):
+            self._subscribers.setdefault(sym, []).append(strategy)
+            if sym not in lots.positions:
+                lots.assign(sym, name or type(strategy).__name__)
+        self._batch_routes.clear()
+
+    def add_isolated(
+        self,
+        name: str,
+        strategy: Strategy,
+        portfolio: Portfolio,
+        execution: ExecutionHandler,
+        symbols: Iterable[str] | None = None,
+    ) -> BacktestEngine:
+        """
+        Attach a strategy with its own sub-portfolio. The strategy, portfolio and
+        execution handler must share one EventQueue (not router.events).
+        """
+        if name in self.sleeves:
+            raise ValueError(f"Duplicate sleeve name: {name!r}")
+        if strategy.events is self.events:
+            raise ValueError("Isolated strategies need their own EventQueue.")
+
+        engine = BacktestEngine(strategy.events, strategy, portfolio, execution)
+        self.sleeves[name] = engine
+        for sym in symbols or (strategy.symbol,):
+            self._isolated.setdefault(sym, []).append(engine)
+        self._batch_routes.clear()
+        return engine
+
+    def on_market(self, event: MarketEvent) -> None:
+        # fan-out for the netting engine: subscribers of this symbol only
+        for strategy in self._subscribers.get(event.symbol, ()):
+            strategy.on_market(event)
+
+    def on_corporate_action(self, event: CorporateActionEvent) -> None:
+        for strategy in self._subscribers.get(event.symbol, ()):
+            handler = getattr(strategy, "on_corporate_action", None)
+            if handler is not None:
+                handler(event)
+
+    def on_risk(self, event: RiskEvent) -> None:
+        for strategy in self._subscribers.get(event.symbol, ()):
+            handler = getattr(strategy, "on_risk", None)
+            if handler is not None:
+                handler(event)
+
+    def on_session_end(self, ts) -> None:
+        seen: set[int] = set()
+        for strategies in self._subscribers.values():
+            for strategy in strategies:
+                if id(strategy) not in seen:
+                    seen.add(id(strategy))
+                    handler = getattr(strategy, "on_session_end", None)
+                    if handler is not None:
+                        handler(ts)
+
+    def _routes(
+        self, symbols: tuple[str, ...]
+    ) -> tuple[list[Strategy], list[BacktestEngine]]:
+        routes = self._batch_routes.get(symbols)
+        if routes is None:
+            strategies: dict[int, Strategy] = {}
+            engines: dict[int, BacktestEngine] = {}
+            for sym in symbols:
+                for s in self._subscribers.get(sym, ()):
+                    strategies.setdefault(id(s), s)
+                for e in self._isolated.get(sym, ()):
+                    engines.setdefault(id(e), e)
+            routes = (list(strategies.values()), list(engines.values()))
+            self._batch_routes[symbols] = routes
+        return routes
+
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        # each subscribed strategy sees the whole batch once
+        for strategy in self._routes(batch.symbols)[0]:
+            deliver_batch(strategy, batch)
+
+    def run(
+        self,
+        market_events: Iterable[MarketEvent | MarketBatchEvent],
+        max_bars: int | None = None,
+    ) -> int:
+        """
+        One pass over the feed for every attached strategy. Returns bars processed
+        (a MarketBatchEvent counts as one).
+        """
+        n = 0
+        netting = self.engine
+        isolated = self._isolated
+        history = self.history
+        for me in market_events:
+            if max_bars is not None and n >= max_bars:
+                break
+            n += 1
+            if history is not None:
+                history.update(me)
+            if netting is not None:
+                netting.on_market(me)
+            if me.type == EventType.MARKET_BATCH:
+                engines = self._routes(me.symbols)[1]
+            else:
+                engines = isolated.get(me.symbol, ())
+            for engine in engines:
+                engine.on_market(me)
+        return n
@@ -6,7 +6,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass
 
 from backtester.core.event_queue import EventQueue
-from backtester.events import MarketEvent
+from backtester.events import MarketBatchEvent, MarketEvent, RiskEvent
 
 
 @dataclass
@@ -17,7 +17,9 @@ class Strategy(ABC):
     Concrete strategies should:
       - consume MarketEvent via on_market()
       - emit SignalEvent(s) into self.events when appropriate
+      - optionally override on_market_batch() to read a timestamp's bars as arrays
     """
+
     events: EventQueue
     symbol: str
 
@@ -36,3 +38,24 @@ class Strategy(ABC):
           - push it into self.events via self.events.put(...)
         """
         raise NotImplementedError
+
+    def on_market_batch(self, batch: MarketBatchEvent) -> None:
+        """
+        Called once per timestamp in batched runs. Default: fan out to on_market().
+        """
+        for event in batch.market_events():
+            self.on_market(event)
+
+    def on_session_end(self, ts) -> None:
+        """
+        Called after the last bar of each trading session (engine built with a
+        SessionIndex). Default: nothing, e.g. override to flatten overnight.
+        """
+        return None
+
+    def on_risk(self, event: RiskEvent) -> None:
+        """
+        Called when the engine's RiskEngine rejects an order for this strategy's
+        symbol. Default: nothing.
+        """
+        return None
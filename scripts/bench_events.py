@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from backtester.data.bar_store import Bars
+from backtester.events import MarketEvent, OrderEvent, Side, to_iso, validation
+from backtester.portfolio.portfolio import Portfolio
+
+
+def make_bars(n: int) -> Bars:
+    close = 100.0 + np.cumsum(np.random.default_rng(0).normal(0, 0.05, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars(
+        "SPY", ts.view(np.int64), close, close + 0.5, close - 0.5, close, np.ones(n)
+    )
+
+
+def per_event_ns(build, rows: list, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter_ns()
+        for r in rows:
+            build(*r)
+        best = min(best, (time.perf_counter_ns() - t0) / len(rows))
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(
+        description="Per-event construction cost by timestamp form / validation level."
+    )
+    ap.add_argument("--bars", type=int, default=200_000)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    bars = make_bars(args.bars)
+    cols = [
+        bars.open.tolist(),
+        bars.high.tolist(),
+        bars.low.tolist(),
+        bars.close.tolist(),
+        bars.volume.tolist(),
+    ]
+    ns_rows = list(zip(bars.ts.tolist(), *cols, strict=True))
+    iso_rows = [(to_iso(r[0]), *r[1:]) for r in ns_rows]
+
+    def market(ts, o, h, lo, c, v):
+        return MarketEvent(ts, "SPY", o, h, lo, c, v)
+
+    def order(ts, o, h, lo, c, v):
+        return OrderEvent(ts, "SPY", Side.BUY, 10.0)
+
+    print(f"{'event':<12}{'ts':<8}{'validation':<12}{'ns/event':>10}")
+    for name, build in (("MarketEvent", market), ("OrderEvent", order)):
+        cases = (
+            # before: ISO strings re-parsed in every constructor
+            ("iso", iso_rows, "strict"),
+            ("int ns", ns_rows, "strict"),
+            ("int ns", ns_rows, "trusted"),
+        )
+        for ts_kind, rows, level in cases:
+            with validation(level):
+                cost = per_event_ns(build, rows, args.repeat)
+            print(f"{name:<12}{ts_kind:<8}{level:<12}{cost:>10.0f}")
+
+    # equity_curve_df: ISO strings through pd.to_datetime vs one int64 view
+    for ts_kind, rows in (("iso", iso_rows), ("int ns", ns_rows)):
+        portfolio = Portfolio(events=None, starting_cash=100_000.0)
+        portfolio.history = [{"ts": r[0], "equity": 1.0, "cash": 1.0} for r in rows]
+        t0 = time.perf_counter()
+        portfolio.equity_curve_df()
+        print(
+            f"equity_curve_df {ts_kind:<8}{(time.perf_counter() - t0) * 1e3:>10.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.events import to_iso
 
 
 class SimpleQueue:
@@ -60,7 +61,7 @@ def main():
         if n_total <= MAX_BARS:
             q.put(evt)
             print(
-                f"PUT {evt.type} {evt.ts} {evt.symbol} "
+                f"PUT {evt.type} {to_iso(evt.ts)} {evt.symbol} "
                 f"O={evt.open} H={evt.high} L={evt.low} C={evt.close} V={evt.volume}"
             )
 
@@ -70,7 +71,7 @@ def main():
 
     # --- Summary line (the “real system” vibe) ---
     print(
-        f"\nLoaded {n_total:,} bars for SPY: {first_ts} \u2192 {last_ts}"
+        f"\nLoaded {n_total:,} bars for SPY: {to_iso(first_ts)} \u2192 {to_iso(last_ts)}"
     )
 
     # --- Sanity check report ---
@@ -82,7 +83,9 @@ def main():
             f"(non_increasing_ts={non_increasing_ts}, bad_ohlc={bad_ohlc})"
         )
 
-    print(f"\nQueued {len(q.items)} market events (showing first {min(50, len(q.items))}).")
+    print(
+        f"\nQueued {len(q.items)} market events (showing first {min(50, len(q.items))})."
+    )
 
 
 if __name__ == "__main__":
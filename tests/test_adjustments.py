@@ -0,0 +1,103 @@
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.adjustments import AdjustmentIndex, with_actions
+from backtester.data.bar_store import Bars
+from backtester.events import ActionType, CorporateActionEvent, FillEvent, Side
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+T0 = np.datetime64("2024-01-02", "ns")
+
+
+def day(i):
+    return str((T0 + np.timedelta64(i, "D")).astype("datetime64[s]"))
+
+
+def raw_bars(n=10, split_at=5):
+    # adjusted price is a steady 100 -> 109 ramp; raw halves at the 2:1 split
+    close = 100.0 + np.arange(n, dtype=float)
+    close[split_at:] /= 2.0
+    ts = (T0 + np.arange(n) * np.timedelta64(1, "D")).view(np.int64)
+    return Bars("XYZ", ts, close, close, close, close, np.full(n, 1_000.0))
+
+
+def test_split_and_dividend_factors():
+    bars = raw_bars()
+    index = AdjustmentIndex.from_actions(
+        [
+            CorporateActionEvent(day(5), "XYZ", ActionType.SPLIT, ratio=2.0),
+            CorporateActionEvent(day(8), "XYZ", ActionType.DIVIDEND, amount=1.07),
+        ],
+        bars={"XYZ": bars},
+    )
+    raw_close = bars.close.copy()
+    adj = index.adjust(bars)
+
+    div = 1.0 - 1.07 / bars.close[7]
+    assert np.allclose(adj.close[:5], raw_close[:5] / 2.0 * div)
+    assert np.allclose(adj.close[5:8], raw_close[5:8] * div)
+    assert np.allclose(adj.close[8:], raw_close[8:])
+    assert np.allclose(adj.volume[:5], 2_000.0)
+    assert np.array_equal(bars.close, raw_close)  # raw data untouched
+
+    # point in time: the dividend is not known yet on day 6
+    pit = index.adjust(bars, as_of=day(6))
+    assert np.allclose(pit.close[:5], raw_close[:5] / 2.0)
+    assert np.allclose(pit.close[5:], raw_close[5:])
+
+    streamed = list(index.adjust_events(bars.market_events()))
+    assert np.allclose([e.close for e in streamed], adj.close)
+
+
+def test_dividend_requires_prior_close():
+    with pytest.raises(ValueError, match="prev_close"):
+        AdjustmentIndex().add(
+            CorporateActionEvent(day(1), "XYZ", ActionType.DIVIDEND, amount=1.0)
+        )
+
+
+def test_portfolio_applies_split_and_dividend():
+    p = Portfolio(events=EventQueue(), starting_cash=100_000.0)
+    p.on_fill(FillEvent(day(0), "XYZ", Side.BUY, 100, 50.0, 0.0))
+    p.update_market_price("XYZ", 50.0)
+    before = p.total_value()
+
+    p.on_corporate_action(
+        CorporateActionEvent(day(1), "XYZ", ActionType.SPLIT, ratio=2.0)
+    )
+    assert p.positions["XYZ"] == 200.0
+    assert p.total_value() == pytest.approx(before)
+
+    p.on_corporate_action(
+        CorporateActionEvent(day(2), "XYZ", ActionType.DIVIDEND, amount=0.5)
+    )
+    assert p.cash == pytest.approx(100_000.0 - 5_000.0 + 100.0)
+
+    # FIFO lots follow the split: selling all 200 at the split-adjusted cost breaks even
+    p.on_fill(FillEvent(day(3), "XYZ", Side.SELL, 200, 25.0, 0.0))
+    assert p.ledger.to_arrays()["realized_pnl"][-1] == pytest.approx(0.0)
+
+
+def test_raw_feed_with_actions_keeps_strategy_and_equity_continuous():
+    bars = raw_bars(n=12)
+    split = CorporateActionEvent(day(5), "XYZ", ActionType.SPLIT, ratio=2.0)
+    events = EventQueue()
+    portfolio = Portfolio(events=events, starting_cash=100_000.0)
+    engine = BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="XYZ", fast=2, slow=3),
+        portfolio,
+        ExecutionHandler(events=events),
+    )
+    engine.run(with_actions(bars.market_events(), [split]))
+
+    sides = portfolio.ledger.to_arrays()["side"].tolist()
+    assert sides == [1]  # one entry, no spurious exit at the split
+    equity = np.array([row["equity"] for row in portfolio.history])
+    # rises every bar once invested, split included
+    assert np.all(np.diff(equity)[2:] > 0)
+    assert portfolio.positions["XYZ"] == 200.0
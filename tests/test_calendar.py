@@ -0,0 +1,125 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars
+from backtester.data.calendar import TradingCalendar, nyse_holidays
+from backtester.events import Side, SignalEvent
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.strategy import Strategy
+
+
+def minute_bars(days, start="08:00", end="17:00"):
+    # every minute of the given local dates between start and end
+    ts = []
+    for d in days:
+        t0 = np.datetime64(f"{d}T{start}", "ns")
+        t1 = np.datetime64(f"{d}T{end}", "ns")
+        ts.append(np.arange(t0, t1, np.timedelta64(1, "m")))
+    ts = np.concatenate(ts).view(np.int64)
+    close = np.linspace(100.0, 101.0, len(ts))
+    return Bars("SPY", ts, close, close, close, close, np.ones(len(ts)))
+
+
+def test_nyse_holiday_rules():
+    closed, early = nyse_holidays(2024)
+    assert date(2024, 3, 29) in closed  # Good Friday
+    assert date(2024, 6, 19) in closed  # Juneteenth
+    assert date(2024, 11, 29) in early
+    assert date(2022, 1, 1) not in nyse_holidays(2022)[0]  # Saturday, not observed
+    counts = [
+        len(TradingCalendar().sessions(date(y, 1, 1), date(y, 12, 31))[0])
+        for y in (2022, 2023, 2024)
+    ]
+    assert counts == [251, 250, 252]
+
+
+def test_session_index_masks_and_seeks():
+    # Fri Nov 24 2023 is a half day; Sat/Sun have bars that belong to no session
+    bars = minute_bars(["2023-11-22", "2023-11-24", "2023-11-25", "2023-11-27"])
+    idx = TradingCalendar().index(bars.ts)
+
+    assert idx.session_dates.astype(str).tolist() == [
+        "2023-11-22",
+        "2023-11-24",
+        "2023-11-27",
+    ]
+    rth = idx.filter(bars)
+    per_day = np.unique(
+        rth.ts.view("datetime64[ns]").astype("datetime64[D]"), return_counts=True
+    )[1]
+    assert per_day.tolist() == [390, 210, 390]
+    assert not idx.rth_mask[idx.session_id < 0].any()
+
+    s = idx.session_slice("2023-11-24")
+    assert (
+        str(bars.ts[s.start].view("datetime64[ns]")) == "2023-11-24T08:00:00.000000000"
+    )
+    assert idx.is_session_end[s.stop - 1]
+    assert idx.seek("2023-11-27T09:30") == int(np.flatnonzero(idx.rth_mask)[-390])
+
+    assert idx.bars_per_session() == pytest.approx(330.0)
+    assert idx.periods_per_year() == pytest.approx(250 * 330.0)
+
+
+def test_utc_data_is_converted_to_exchange_time():
+    ts = np.array(
+        ["2024-01-02T14:30", "2024-01-02T20:59", "2024-01-02T21:00"],
+        dtype="datetime64[ns]",
+    )
+    idx = TradingCalendar(data_tz="UTC").index(ts.view(np.int64))
+    assert idx.rth_mask.tolist() == [True, True, False]
+
+
+class FlattenAtClose(Strategy):
+    def __init__(self, events):
+        super().__init__(events=events, symbol="SPY")
+        self.closes = []
+
+    def on_market(self, event):
+        if not self.closes or self.closes[-1] == "flat":
+            self.events.put(SignalEvent(ts=event.ts, symbol="SPY", side=Side.BUY))
+            self.closes.append("long")
+
+    def on_session_end(self, ts):
+        self.events.put(SignalEvent(ts=ts, symbol="SPY", side=Side.SELL))
+        self.closes.append("flat")
+
+
+def test_engine_calls_session_end_hook():
+    bars = minute_bars(["2024-01-02", "2024-01-03"], start="09:30", end="16:00")
+    events = EventQueue()
+    strategy = FlattenAtClose(events)
+    portfolio = Portfolio(events=events, starting_cash=100_000.0)
+    engine = BacktestEngine(
+        events,
+        strategy,
+        portfolio,
+        ExecutionHandler(events=events),
+        sessions=TradingCalendar().index(bars.ts),
+    )
+    engine.run(bars.market_events())
+    assert strategy.closes == ["long", "flat", "long", "flat"]
+    assert portfolio.positions["SPY"] == 0.0
+
+
+def test_session_end_is_found_by_timestamp_not_bar_count():
+    # the index covers both days but the feed starts mid-morning on day one
+    bars = minute_bars(["2024-01-02", "2024-01-03"], start="09:30", end="16:00")
+    events = EventQueue()
+    strategy = FlattenAtClose(events)
+    portfolio = Portfolio(events=events, starting_cash=100_000.0)
+    engine = BacktestEngine(
+        events,
+        strategy,
+        portfolio,
+        ExecutionHandler(events=events),
+        sessions=TradingCalendar().index(bars.ts),
+    )
+    engine.run(bars.slice(100, len(bars)).market_events())
+    assert strategy.closes == ["long", "flat", "long", "flat"]
+    assert portfolio.positions["SPY"] == 0.0
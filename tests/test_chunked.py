@@ -0,0 +1,116 @@
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.core.chunked import (
+    load_equity,
+    load_fills,
+    load_pnl_attribution,
+    run_chunked,
+)
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars
+from backtester.data.chunked import iter_bar_chunks, iter_csv_chunks, prefetch
+from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+
+def make_bars(n=600, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 3e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars("SPY", ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+def make_engine(pnl_attribution=None):
+    events = EventQueue()
+    portfolio = Portfolio(
+        events=events, starting_cash=100_000.0, pnl_attribution=pnl_attribution
+    )
+    return BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+        portfolio,
+        ExecutionHandler(events=events),
+    )
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 100, 600])
+def test_results_identical_across_chunk_sizes(tmp_path, chunk_rows):
+    bars = make_bars()
+
+    ref = make_engine()
+    ref.run(bars.market_events())
+    ref_eq = ref.portfolio.equity_curve_df()
+    ref_fills = ref.portfolio.ledger.to_arrays()
+
+    eng = make_engine()
+    out = tmp_path / "out"
+    assert run_chunked(eng, iter_bar_chunks(bars, chunk_rows), out) == len(bars)
+
+    assert len(ref_fills["ts"]) > 0
+    pd.testing.assert_frame_equal(load_equity(out), ref_eq)
+    fills = load_fills(out)
+    for k, v in ref_fills.items():
+        assert np.array_equal(fills[k], v)
+    assert eng.portfolio.history == []  # spilled, not retained
+
+
+def test_chunked_run_spills_pnl_attribution(tmp_path):
+    bars = make_bars()
+
+    ref = make_engine(pnl_attribution="symbol")
+    ref.run(bars.market_events())
+
+    eng = make_engine(pnl_attribution="symbol")
+    out = tmp_path / "out"
+    run_chunked(eng, iter_bar_chunks(bars, 50), out)
+
+    pd.testing.assert_frame_equal(
+        load_pnl_attribution(out), ref.portfolio.pnl_attribution_df()
+    )
+    assert eng.portfolio.pnl_history == []
+    with pytest.raises(ValueError):
+        load_pnl_attribution(tmp_path)
+
+
+def test_csv_chunks_match_full_read(tmp_path):
+    bars = make_bars(50)
+    path = tmp_path / "spy.csv"
+    pd.DataFrame(
+        {
+            "timestamp": np.datetime_as_string(
+                bars.ts.astype("datetime64[ns]"), unit="s"
+            ),
+            "open": bars.open,
+            "high": bars.high,
+            "low": bars.low,
+            "close": bars.close,
+            "volume": bars.volume,
+        }
+    ).to_csv(path, index=False)
+
+    chunks = list(iter_csv_chunks(CSVDataHandler(str(path), "SPY"), chunk_rows=16))
+    assert [len(c) for c in chunks] == [16, 16, 16, 2]
+    assert np.array_equal(np.concatenate([c.ts for c in chunks]), bars.ts)
+    assert np.allclose(np.concatenate([c.close for c in chunks]), bars.close)
+
+
+def test_prefetch_stops_its_loader_when_the_consumer_does():
+    produced = []
+
+    def source():
+        for i in range(100):
+            produced.append(i)
+            yield i
+
+    before = threading.active_count()
+    chunks = prefetch(source(), depth=2)
+    assert next(chunks) == 0
+    chunks.close()  # e.g. the engine raised mid-run
+    assert threading.active_count() == before and len(produced) < 100
@@ -0,0 +1,131 @@
+import sys
+
+import numpy as np
+import pytest
+
+from backtester.analysis.compare import compare_cached, compare_runs, main
+from backtester.analysis.run_cache import CachedRun, RunCache
+from backtester.core.config import parse_run_plan
+from backtester.core.journal import EventJournal
+from backtester.data.bar_store import BarStore
+from backtester.data.synthetic import generate_bars
+from backtester.events import EventType
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = BarStore(tmp_path / "bars")
+    store.put(generate_bars("SPY", 12_000, seed=3))
+    return store
+
+
+def run(store, journal_path=None, fee=1.0):
+    plan = parse_run_plan(
+        {
+            "data": {"source": "store", "path": str(store.root)},
+            "universe": ["SPY"],
+            "strategy": {"params": {"fast": 10, "slow": 40}},
+            "costs": {"commission": {"model": "per_trade", "per_trade_fee": fee}},
+        }
+    )
+    if journal_path is None:
+        engine = plan.build()
+        engine.run(plan.market_events())
+    else:
+        with EventJournal(journal_path) as journal:
+            engine = plan.build(journal=journal)
+            engine.run(plan.market_events())
+    return CachedRun.from_engine(engine, periods_per_year=plan.periods_per_year)
+
+
+def put(cache, key, res):
+    cache.put(key, res.metrics, res.equity_curve, res.trades)
+
+
+def test_identical_runs_compare_by_fingerprint_alone(store, tmp_path):
+    cache = RunCache(tmp_path / "runs")
+    put(cache, "a", run(store))
+    put(cache, "b", run(store))
+    fp = cache.fingerprints("a")
+    assert fp["rows"] == 12_000 and len(fp["equity"]) == 3
+
+    for key in ("a", "b"):  # arrays are never read on a fingerprint match
+        (cache.root / key / "equity.npz").unlink()
+    diff = compare_cached(cache, "a", "b")
+    assert diff.identical and diff.chunks_skipped == diff.chunks_total == 3
+    assert diff.report().startswith("identical")
+
+
+def test_cost_change_reports_first_bar_and_cause(store, tmp_path):
+    a = run(store, tmp_path / "a.bin", fee=1.0)
+    b = run(store, tmp_path / "b.bin", fee=2.0)
+    diff = compare_runs(a, b, tmp_path / "a.bin", tmp_path / "b.bin")
+    assert not diff.identical and set(diff.metrics) >= {"total_return"}
+
+    # the fee estimate resizes the first order, so qty is the first field to move
+    first_fill = int(a.trades["ts"][0])
+    assert (
+        diff.trade.field == "qty"
+        and diff.trade.index == 0
+        and diff.trade.ts == first_fill
+    )
+    assert diff.equity.field == "equity" and diff.equity.ts > first_fill
+    cause = diff.cause
+    assert (
+        cause.kind == "event"
+        and cause.a.type == EventType.ORDER
+        and cause.ts == first_fill
+    )
+    assert cause.a.qty > cause.b.qty
+    assert "caused by" in diff.report()
+
+
+def test_late_divergence_skips_equal_chunks(store, tmp_path):
+    cache = RunCache(tmp_path / "runs")
+    a = run(store)
+    curve = a.equity_curve.copy()
+    curve.iloc[10_000, curve.columns.get_loc("equity")] += 0.01
+    put(cache, "a", a)
+    put(cache, "b", CachedRun(a.metrics, curve, a.trades))
+
+    diff = compare_cached(cache, "a", "b")
+    assert diff.chunks_skipped == 10_000 // 4_096 and diff.equity.index == 10_000
+    assert np.isclose(diff.equity.b - diff.equity.a, 0.01) and diff.trade is None
+
+    # a chunk hash covers every column: a realized/unrealized shift with equity
+    # unchanged is not skipped
+    moved = a.equity_curve.copy()
+    moved.iloc[10_000, moved.columns.get_loc("realized")] += 0.01
+    moved.iloc[10_000, moved.columns.get_loc("unrealized")] -= 0.01
+    put(cache, "c", CachedRun(a.metrics, moved, a.trades))
+    diff = compare_cached(cache, "a", "c")
+    assert not diff.identical and diff.chunks_skipped == 10_000 // 4_096
+    assert diff.equity.index == 10_000 and diff.equity.field in (
+        "realized",
+        "unrealized",
+    )
+
+    # aligned on timestamps: a run over a later window only differs by its missing rows
+    late = CachedRun(a.metrics, a.equity_curve.iloc[100:], a.trades)
+    diff = compare_runs(a, late)
+    assert (
+        diff.equity is None
+        and (diff.only_a, diff.only_b) == (100, 0)
+        and not diff.identical
+    )
+
+
+def test_cli_exit_status(store, tmp_path, monkeypatch, capsys):
+    cache = RunCache(tmp_path / "runs")
+    put(cache, "a", run(store))
+    put(cache, "same", run(store))
+    put(cache, "fee2", run(store, fee=2.0))
+
+    for key, code in (("same", 0), ("fee2", 1)):
+        monkeypatch.setattr(
+            sys, "argv", ["compare", str(cache.root / "a"), str(cache.root / key)]
+        )
+        with pytest.raises(SystemExit) as exit_info:
+            main()
+        assert exit_info.value.code == code
+    assert "first divergent bar" in capsys.readouterr().out
@@ -0,0 +1,112 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from backtester.core.config import load_run_plan, parse_run_plan
+from backtester.data.bar_store import Bars, BarStore
+from backtester.distributed import SweepJob, jobs_from_plan
+from backtester.distributed.jobs import _base_plan
+
+SPEC = {
+    "data": {"source": "store", "path": "bars"},
+    "universe": ["SPY"],
+    "strategy": {"params": {"fast": 5, "slow": 20}},
+    "costs": {"commission": {"model": "percent", "percent_rate": 0.0005}},
+    "portfolio": {"starting_cash": 50_000},
+    "window": {"start": "2024-01-02", "end": "2024-02-01"},
+}
+
+
+def test_flat_momentum_config_is_read():
+    plan = load_run_plan("configs/momentum_spy.yaml")
+    assert plan.universe == ("SPY",)
+    assert plan.data.path == "backtester/data/SPY.csv"
+    assert plan.data.ts_col == "ts"
+    assert plan.commission.per_trade_fee == 0.5
+    assert plan.slippage.bps == 1.0
+    assert plan.portfolio.target_qty == 10.0
+    assert plan.seed == 42
+
+
+def test_costs_only_config_overrides_base():
+    plan = load_run_plan("config.yaml", base=SPEC)
+    assert plan.commission.model == "percent"
+    assert plan.slippage.bps == 2.0
+    assert plan.portfolio.starting_cash == 50_000.0  # from base
+
+
+def test_plan_is_immutable_hashable_and_picklable():
+    plan = parse_run_plan(SPEC)
+    assert pickle.loads(pickle.dumps(plan)) == plan
+    assert plan.hash() == parse_run_plan(dict(SPEC)).hash()
+    assert plan.with_params(fast=6).hash() != plan.hash()
+    assert plan.with_params(fast=6).strategy.kwargs == {"fast": 6, "slow": 20}
+    with pytest.raises(AttributeError):
+        plan.seed = 1
+
+
+@pytest.mark.parametrize(
+    "patch,match",
+    [
+        ({"costs": {"commission": {"model": "flat"}}}, "commission.model"),
+        ({"costs": {"slippage": {"bpz": 1}}}, "unknown keys"),
+        ({"portfolio": {"starting_cash": -1}}, "starting_cash"),
+        ({"portfolio": {"target_qty": 500}}, "target_qty"),
+        ({"window": {"start": "2024-03-01", "end": "2024-02-01"}}, "before end"),
+        ({"strategy": {"class": "backtester.nope:Missing"}}, "cannot be imported"),
+        ({"universe": []}, "at least one symbol"),
+        ({"data": {"source": "csv", "path": None}}, "data.path"),
+        ({"bogus": 1}, "unknown keys"),
+        ({"seed": [1, 2]}, "seed"),
+        ({"seed": "abc"}, "seed"),
+    ],
+)
+def test_invalid_specs_are_rejected(patch, match):
+    with pytest.raises(ValueError, match=match):
+        parse_run_plan(patch, base=SPEC)
+
+
+def test_multi_symbol_plan_builds_and_runs(tmp_path):
+    rng = np.random.default_rng(0)
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(300) * np.timedelta64(
+        1, "m"
+    )
+    store = BarStore(tmp_path)
+    for sym in ("AAA", "BBB"):
+        close = 100.0 * np.cumprod(1.0 + rng.normal(0, 4e-3, 300))
+        store.put(
+            Bars(sym, ts.view(np.int64), close, close, close, close, np.ones(300))
+        )
+
+    plan = parse_run_plan(
+        {
+            **SPEC,
+            "data": {"source": "store", "path": str(tmp_path)},
+            "universe": ["AAA", "BBB"],
+        }
+    )
+    engine = plan.build()
+    assert engine.run(plan.market_events()) == 2 * 300
+    traded = {
+        engine.portfolio.ledger.symbols[i]
+        for i in engine.portfolio.ledger.to_arrays()["symbol_id"]
+    }
+    assert traded == {"AAA", "BBB"}
+
+
+def test_sweep_jobs_round_trip_through_plan():
+    plan = parse_run_plan(SPEC)
+    jobs = jobs_from_plan(plan, {"fast": [3, 5]})
+    assert [j.params["fast"] for j in jobs] == [3, 5]
+    assert all(j.start == plan.start for j in jobs)
+
+    back = SweepJob.from_json(jobs[1].to_json()).to_plan()
+    assert back.strategy == plan.strategy
+    assert back.commission == plan.commission
+    assert back.portfolio == plan.portfolio
+
+    # the shared part of the sweep is parsed once; each job only layers its params
+    assert jobs[0].to_plan().strategy == plan.with_params(fast=3).strategy
+    assert jobs[0].to_plan().hash() != back.hash()
+    assert _base_plan.cache_info().hits >= 2
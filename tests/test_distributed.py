@@ -0,0 +1,90 @@
+import time
+
+import numpy as np
+
+from backtester.data.bar_store import Bars, BarStore
+from backtester.distributed import (
+    FileQueueTransport,
+    SweepCoordinator,
+    SweepWorker,
+    make_sweep_jobs,
+    run_job,
+)
+
+
+def make_store(tmp_path, n=400):
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    close = 100.0 + np.cumsum(np.sin(np.arange(n) / 9.0))
+    store = BarStore(tmp_path / "bars")
+    store.put(
+        Bars(
+            symbol="SPY",
+            ts=ts.view(np.int64),
+            open=close,
+            high=close + 0.5,
+            low=close - 0.5,
+            close=close,
+            volume=np.full(n, 1000.0),
+        )
+    )
+    return store
+
+
+def test_dead_worker_job_is_retried(tmp_path):
+    store = make_store(tmp_path)
+    transport = FileQueueTransport(tmp_path / "queue")
+    jobs = make_sweep_jobs(
+        "SPY",
+        {"fast": [5, 10], "slow": [30]},
+        windows=[(None, "2024-01-02T13:00"), ("2024-01-02T13:00", None)],
+        costs={"commission": {"model": "percent", "percent_rate": 0.0005}},
+        equity_points=20,
+    )
+    coord = SweepCoordinator(transport, lease_timeout=0.0)
+    ids = coord.submit(jobs)
+    assert len(set(ids)) == 4
+
+    # a worker claims a job and dies without completing it
+    lease, _ = transport.claim("dead")
+    coord.poll()  # lease expired -> back to pending
+
+    assert SweepWorker(transport, store, worker_id="w1").serve(idle_timeout=0.0) == 4
+    results = coord.wait(timeout=1.0)
+    assert sorted(results) == sorted(ids)
+    assert all(r.error is None for r in results.values())
+
+    job = next(j for j in jobs if j.job_id == lease.job_id)
+    direct = run_job(job, store)
+    assert results[lease.job_id].metrics == direct.metrics
+    assert len(results[lease.job_id].equity) == 20
+
+
+def test_resubmitting_finished_jobs_is_idempotent(tmp_path):
+    store = make_store(tmp_path)
+    transport = FileQueueTransport(tmp_path / "queue")
+    # invalid params -> error result
+    jobs = make_sweep_jobs("SPY", {"fast": [5], "slow": [3]})
+
+    coord = SweepCoordinator(transport)
+    coord.submit(jobs)
+    SweepWorker(transport, store).serve(idle_timeout=0.0)
+    (res,) = coord.wait(timeout=1.0).values()
+    assert res.error.startswith("ValueError")
+
+    coord.submit(jobs)
+    assert transport.pending() == []
+
+
+def test_heartbeating_straggler_is_still_stolen(tmp_path):
+    transport = FileQueueTransport(tmp_path / "queue")
+    coord = SweepCoordinator(transport, lease_timeout=60.0, straggler_after=0.05)
+    (jid,) = coord.submit(make_sweep_jobs("SPY", {"fast": [5], "slow": [30]}))
+
+    lease, _ = transport.claim("slow")
+    time.sleep(0.1)
+    transport.heartbeat(lease)  # alive, but claimed longer ago than straggler_after
+    (seen,) = transport.leases()
+    assert seen.claimed_at == lease.claimed_at < seen.last_seen
+
+    coord.poll()
+    assert transport.pending() == [jid]  # duplicate ticket for an idle worker
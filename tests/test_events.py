@@ -0,0 +1,104 @@
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars, market_batches
+from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.events import (
+    MarketEvent,
+    OrderEvent,
+    Side,
+    ValidationLevel,
+    get_validation,
+    set_validation,
+    to_epoch_ns,
+    to_iso,
+    validation,
+)
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+
+def make_bars(n=200):
+    close = 100.0 + np.sin(np.arange(n) / 7.0)
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars("SPY", ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+def test_epoch_ns_round_trip():
+    ns = to_epoch_ns("2024-01-02T09:30:00")
+    assert ns == np.datetime64("2024-01-02T09:30", "ns").view(np.int64)
+    assert to_epoch_ns(ns) == ns
+    assert to_iso(ns) == "2024-01-02T09:30:00"
+    assert to_epoch_ns("2024-01-02T10:30:00+01:00") == ns
+
+
+def test_epoch_ns_accepts_numpy_scalars():
+    ns = to_epoch_ns("2024-01-02T09:30:00")
+    assert to_epoch_ns(np.int64(ns)) == ns
+    assert type(to_epoch_ns(np.int64(ns))) is int
+    assert to_epoch_ns(np.datetime64("2024-01-02T09:30", "m")) == ns
+    assert to_epoch_ns(np.datetime64(ns, "ns")) == ns
+    ev = MarketEvent(np.int64(ns), "SPY", 1.0, 1.0, 1.0, 1.0, 1.0)
+    assert to_iso(ev.ts) == "2024-01-02T09:30:00"
+
+
+def test_sources_emit_epoch_ns(tmp_path):
+    bars = make_bars(5)
+    assert [e.ts for e in bars.market_events()] == bars.ts.tolist()
+    assert [b.ts for b in market_batches([bars])] == bars.ts.tolist()
+
+    csv = tmp_path / "spy.csv"
+    csv.write_text("date,open,high,low,close,volume\n2024-01-02 09:30:00,1,1,1,1,1\n")
+    (event,) = CSVDataHandler(
+        csv_path=str(csv), symbol="SPY", ts_col="date"
+    ).stream_market_events()
+    assert event.ts == bars.ts[0]
+
+
+def test_validation_levels():
+    assert get_validation() == ValidationLevel.STRICT
+    with pytest.raises(ValueError):
+        MarketEvent("not a time", "SPY", 1, 1, 1, 1, 1)
+    with pytest.raises(ValueError):
+        MarketEvent(0, " ", 1, 1, 1, 1, 1)
+
+    with validation("trusted"):
+        assert get_validation() == ValidationLevel.TRUSTED
+        MarketEvent("not a time", " ", 1, 1, 1, 1, 1)
+        # non-market events keep their field checks, only the ts parse is skipped
+        OrderEvent("not a time", "SPY", Side.BUY, 1.0)
+        with pytest.raises(ValueError):
+            OrderEvent(0, "SPY", Side.BUY, 0.0)
+    assert get_validation() == ValidationLevel.STRICT
+
+    prev = set_validation(ValidationLevel.TRUSTED)
+    try:
+        assert prev == ValidationLevel.STRICT
+    finally:
+        set_validation(prev)
+    with pytest.raises(ValueError):
+        set_validation("lenient")
+
+
+def test_trusted_engine_run_matches_strict():
+    curves = []
+    for level in ("strict", "trusted"):
+        events = EventQueue()
+        portfolio = Portfolio(events=events, starting_cash=100_000.0)
+        engine = BacktestEngine(
+            events,
+            MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+            portfolio,
+            ExecutionHandler(events=events),
+            validation=level,
+        )
+        engine.run(make_bars().market_events())
+        assert get_validation() == ValidationLevel.STRICT
+        assert len(portfolio.ledger) > 0
+        curves.append(portfolio.equity_curve_df())
+
+    assert curves[0].equals(curves[1])
+    assert curves[0].index[0] == np.datetime64("2024-01-02T09:30", "ns")
@@ -0,0 +1,62 @@
+import numpy as np
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.core.journal import EventJournal, JournalReader, replay
+from backtester.data.bar_store import Bars
+from backtester.events import EventType, to_epoch_ns
+from backtester.execution.execution_handler import ExecutionHandler, SlippageModel
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+
+def make_bars(n=500):
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    close = 100.0 + np.cumsum(np.sin(np.arange(n) / 11.0))
+    return Bars(
+        "SPY", ts.view(np.int64), close, close + 0.5, close - 0.5, close, np.ones(n)
+    )
+
+
+def test_journal_replay_reproduces_portfolio(tmp_path):
+    bars = make_bars()
+    path = tmp_path / "run.bin"
+    events = EventQueue()
+    portfolio = Portfolio(events=events, starting_cash=100_000.0)
+    with EventJournal(path, buffer_records=64, index_every=16) as journal:
+        engine = BacktestEngine(
+            events,
+            MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+            portfolio,
+            ExecutionHandler(events=events, slippage=SlippageModel(bps=2.0)),
+            journal=journal,
+        )
+        engine.run(bars.market_events())
+
+    reader = JournalReader(path)
+    fills = reader.query(types=[EventType.FILL])
+    assert len(fills) == len(portfolio.ledger) > 0
+
+    replayed = Portfolio(events=EventQueue(), starting_cash=100_000.0)
+    replay(reader, portfolio=replayed)
+    assert replayed.cash == portfolio.cash
+    assert [r["equity"] for r in replayed.history] == [
+        r["equity"] for r in portfolio.history
+    ]
+
+
+def test_query_uses_time_window(tmp_path):
+    bars = make_bars(100)
+    path = tmp_path / "mkt.bin"
+    with EventJournal(path, index_every=8) as journal:
+        for me in bars.market_events():
+            journal.record(me)
+
+    reader = JournalReader(path)
+    recs = reader.query("2024-01-02T10:00", "2024-01-02T10:10")
+    assert len(recs) == 10
+    first = next(reader.events(recs))
+    assert (
+        first.ts == to_epoch_ns("2024-01-02T10:00:00") and first.close == bars.close[30]
+    )
+    assert len(reader.query(symbols=["QQQ"])) == 0
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from backtester.core import kernel
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars
+from backtester.execution.execution_handler import (
+    CommissionModel,
+    ExecutionHandler,
+    SlippageModel,
+)
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+COSTS = [
+    (CommissionModel(), SlippageModel()),
+    (CommissionModel(model="percent", percent_rate=0.0005), SlippageModel(bps=2.0)),
+    (
+        CommissionModel(model="per_share", per_share_fee=0.005),
+        SlippageModel("spread", half_spread=0.02),
+    ),
+]
+
+
+def make_bars(n=3_000, seed=1):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 2e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars("SPY", ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+def event_driven(bars, fast, slow, commission, slippage, cash):
+    events = EventQueue()
+    portfolio = Portfolio(events=events, starting_cash=cash, est_fee_per_trade=1.0)
+    engine = BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="SPY", fast=fast, slow=slow),
+        portfolio,
+        ExecutionHandler(events=events, slippage=slippage, commission=commission),
+    )
+    engine.run(bars.market_events())
+    return portfolio
+
+
+@pytest.fixture(params=["jit", "python"])
+def mode(request, monkeypatch):
+    if request.param == "python" and kernel.NUMBA_AVAILABLE:
+        monkeypatch.setattr(kernel, "NUMBA_AVAILABLE", False)
+        monkeypatch.setattr(kernel, "_fused_loop", kernel._fused_loop.py_func)
+        monkeypatch.setattr(kernel, "ma_cross_signal", kernel.ma_cross_signal.py_func)
+    return request.param
+
+
+@pytest.mark.parametrize("commission,slippage", COSTS)
+@pytest.mark.parametrize("cash", [10_000.0, 1_000_000.0])
+def test_kernel_matches_event_driven_engine(mode, commission, slippage, cash):
+    bars = make_bars()
+    expected = event_driven(bars, 5, 20, commission, slippage, cash)
+    got = kernel.run_ma_cross_kernel(
+        bars.close, 5, 20, starting_cash=cash, commission=commission, slippage=slippage
+    )
+
+    assert got.equity.tolist() == [r["equity"] for r in expected.history]
+    assert got.cash.tolist() == [r["cash"] for r in expected.history]
+    assert got.position[-1] == expected.positions.get("SPY", 0.0)
+
+    fills = expected.ledger.to_arrays()
+    assert len(got.fills["qty"]) == len(fills["qty"])
+    assert got.fills["qty"].tolist() == fills["qty"].tolist()
+    assert got.fills["price"].tolist() == fills["price"].tolist()
+    assert got.fills["fee"].tolist() == fills["fee"].tolist()
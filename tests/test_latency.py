@@ -0,0 +1,148 @@
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars
+from backtester.events import OrderEvent, OrderType, Side, to_epoch_ns
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.execution.latency import (
+    FixedLatency,
+    LatencyExecutionHandler,
+    RandomLatency,
+    TimerHeap,
+    VenueLatency,
+)
+from backtester.execution.order_book import BID, L2OrderBook, OrderBookExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+SEC = 10**9
+
+
+def make_bars(n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 2e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars("SPY", ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+def run(order_latency=None, ack_latency=None, seed=0, bars=None):
+    bars = bars if bars is not None else make_bars()
+    events = EventQueue()
+    execution = ExecutionHandler(events=events)
+    if order_latency is not None:
+        execution = LatencyExecutionHandler(
+            events,
+            ExecutionHandler(events=EventQueue()),
+            order_latency,
+            ack_latency,
+            seed=seed,
+        )
+    portfolio = Portfolio(events=events, starting_cash=100_000.0)
+    strategy = MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20)
+    BacktestEngine(events, strategy, portfolio, execution).run(bars.market_events())
+    return portfolio, execution
+
+
+def test_timer_heap_orders_by_due_then_fifo():
+    heap = TimerHeap()
+    for due, item in [(30, "c"), (10, "a1"), (20, "b"), (10, "a2"), (50, "late")]:
+        heap.push(due, 0, item)
+    assert heap.next_due() == 10
+    assert [item for _, _, item in heap.pop_due(30)] == ["a1", "a2", "b", "c"]
+    assert len(heap) == 1
+
+    rng = np.random.default_rng(0)
+    heap = TimerHeap()
+    dues = rng.integers(0, 10**9, 50_000)
+    for d in dues.tolist():
+        heap.push(d, 0, None)
+    popped = [d for d, _, _ in heap.pop_due(10**9)]
+    assert popped == sorted(dues.tolist())
+
+
+def test_zero_latency_matches_plain_execution():
+    base, _ = run()
+    delayed, handler = run(FixedLatency(0), FixedLatency(0))
+    a, b = base.ledger.to_arrays(), delayed.ledger.to_arrays()
+    assert len(a["ts"]) > 0
+    for k in ("ts", "side", "qty", "price"):
+        np.testing.assert_array_equal(a[k], b[k])
+    assert handler.in_flight == 0
+
+
+def test_fixed_latency_fills_on_first_bar_after_arrival():
+    bars = make_bars()
+    base, _ = run(bars=bars)
+    portfolio, handler = run(FixedLatency(30 * SEC), FixedLatency(5 * SEC), bars=bars)
+    base_fills, fills = base.ledger.to_arrays(), portfolio.ledger.to_arrays()
+    assert len(fills["ts"]) == len(base_fills["ts"])
+
+    # orders sent on bar i arrive 30s later and execute at bar i+1's close
+    np.testing.assert_array_equal(fills["ts"], base_fills["ts"] + 30 * SEC)
+    nxt = np.searchsorted(bars.ts, base_fills["ts"]) + 1
+    np.testing.assert_allclose(fills["price"], bars.close[nxt])
+
+    assert handler.in_flight == 0
+
+
+def test_seeded_random_latency_is_reproducible():
+    model = RandomLatency(base_ns=20 * SEC, scale_ns=60 * SEC, dist="exponential")
+    a, _ = run(model, model, seed=7)
+    b, _ = run(model, model, seed=7)
+    c, _ = run(model, model, seed=8)
+    fa, fb, fc = (p.ledger.to_arrays() for p in (a, b, c))
+    np.testing.assert_array_equal(fa["ts"], fb["ts"])
+    np.testing.assert_array_equal(fa["price"], fb["price"])
+    assert not np.array_equal(fa["ts"], fc["ts"])
+
+    draws = RandomLatency(scale_ns=1_000, dist="lognormal").sample(
+        np.random.default_rng(0), 200_000
+    )
+    assert np.isclose(np.median(draws), 1_000, rtol=0.02)
+    with pytest.raises(ValueError):
+        RandomLatency(dist="pareto")
+
+
+def test_venue_latency_routes_by_symbol():
+    fast, slow = FixedLatency(1), FixedLatency(1_000)
+    model = VenueLatency({"X": fast, "Y": slow}, {"AAA": "X", "BBB": "Y"})
+    assert model.route("AAA") is fast
+    assert model.route("BBB") is slow
+    assert model.route("CCC") is model.default
+    with pytest.raises(ValueError):
+        VenueLatency({"X": fast}, {"AAA": "Z"})
+
+    events = EventQueue()
+    with pytest.raises(ValueError):
+        LatencyExecutionHandler(events, ExecutionHandler(events=events))
+
+
+def test_order_joins_queue_as_of_arrival():
+    book = L2OrderBook("SPY", tick_size=0.01, base_price=90.0, n_levels=2_000)
+    book.update(BID, 99.99, 100.0)
+    events = EventQueue()
+    handler = LatencyExecutionHandler(
+        events,
+        OrderBookExecutionHandler(EventQueue(), {"SPY": book}),
+        order_latency=FixedLatency(2 * SEC),
+        ack_latency=FixedLatency(1 * SEC),
+    )
+    t0 = "2024-01-02T09:30:00"
+    handler.advance(to_epoch_ns(t0))
+    handler.on_order(
+        OrderEvent(t0, "SPY", Side.BUY, 10.0, OrderType.LMT, 99.99, id="a")
+    )
+    assert handler.in_flight == 1 and not book.resting
+
+    # the queue grows while the order is in flight: it rests behind 250, not 100
+    book.update(BID, 99.99, 250.0)
+    handler.advance(to_epoch_ns("2024-01-02T09:30:02"))
+    assert book.resting["a"].queue_ahead == 250.0
+
+    handler.on_trade("2024-01-02T09:30:03", "SPY", 99.99, 255.0)
+    assert events.empty() and handler.in_flight == 1
+    handler.advance(to_epoch_ns("2024-01-02T09:30:04"))
+    fill = events.get()
+    assert fill.qty == 5.0 and fill.ts == "2024-01-02T09:30:03"
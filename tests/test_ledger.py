@@ -0,0 +1,47 @@
+import numpy as np
+
+from backtester.core.event_queue import EventQueue
+from backtester.events import FillEvent, Side
+from backtester.portfolio.ledger import TradeLedger
+from backtester.portfolio.portfolio import Portfolio
+
+
+def test_fifo_realized_pnl_and_round_trips():
+    led = TradeLedger(capacity=1)  # forces growth
+    led.record("2024-01-02T09:30:00", "SPY", Side.BUY, 10, 100.0, fee=1.0)
+    led.record("2024-01-02T09:31:00", "SPY", Side.BUY, 10, 110.0, fee=1.0)
+    led.record("2024-01-02T09:31:00", "QQQ", Side.SELL, 5, 50.0)  # short
+    assert (
+        led.record("2024-01-02T09:32:00", "SPY", Side.SELL, 15, 120.0, fee=1.0) == 250.0
+    )
+    assert led.record("2024-01-02T09:33:00", "QQQ", Side.BUY, 5, 40.0) == 50.0
+    assert led.record("2024-01-02T09:34:00", "SPY", Side.SELL, 5, 100.0) == -50.0
+
+    trips = led.round_trips()
+    assert [led.symbols[i] for i in trips["symbol_id"]] == ["SPY", "QQQ"]
+    assert np.allclose(trips["pnl"], [197.0, 50.0])
+    assert trips["n_fills"].tolist() == [4, 2]
+
+
+def test_npz_round_trip(tmp_path):
+    led = TradeLedger()
+    led.record("2024-01-02T09:30:00", "SPY", Side.BUY, 10, 100.0)
+    led.to_npz(tmp_path / "fills.npz")
+    back = TradeLedger.from_npz(tmp_path / "fills.npz")
+    assert back.symbols == ["SPY"]
+    for k, v in led.to_arrays().items():
+        assert np.array_equal(back.to_arrays()[k], v)
+    assert back.to_frame()["symbol"].tolist() == ["SPY"]
+
+
+def test_portfolio_records_applied_fills_only():
+    p = Portfolio(events=EventQueue(), starting_cash=1_000.0)
+    p.on_fill(FillEvent("2024-01-02T09:30:00", "SPY", Side.BUY, 5, 100.0, 1.0))
+    # unaffordable
+    p.on_fill(FillEvent("2024-01-02T09:31:00", "SPY", Side.BUY, 50, 100.0, 1.0))
+    # clamped to 5
+    p.on_fill(FillEvent("2024-01-02T09:32:00", "SPY", Side.SELL, 8, 101.0, 1.0))
+
+    cols = p.ledger.to_arrays()
+    assert cols["qty"].tolist() == [5.0, 5.0]
+    assert cols["realized_pnl"].tolist() == [0.0, 5.0]
@@ -0,0 +1,109 @@
+import asyncio
+import itertools
+
+import numpy as np
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.core.live import (
+    LiveEngine,
+    ReplayServer,
+    async_feed,
+    coalesce,
+    format_bar,
+    paper_trade,
+    parse_bar,
+    socket_feed,
+)
+from backtester.data.bar_store import Bars
+from backtester.events import MarketEvent
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+
+def make_bars(symbol="SPY", n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 3e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars(
+        symbol, ts.view(np.int64), close, close + 0.1, close - 0.1, close, rng.random(n)
+    )
+
+
+def make_engine():
+    events = EventQueue()
+    return BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+        Portfolio(events=events, starting_cash=100_000.0),
+        ExecutionHandler(events=events),
+    )
+
+
+def test_wire_format_and_coalesce():
+    event = MarketEvent(1_704_187_800_000_000_000, "SPY", 0.1, 0.3, 0.05, 0.2, 1e-3)
+    assert parse_bar(format_bar(event)) == event
+
+    a = MarketEvent(1, "SPY", 10.0, 11.0, 9.0, 10.5, 100.0)
+    b = MarketEvent(2, "SPY", 10.5, 12.0, 9.5, 11.5, 50.0)
+    assert coalesce(a, b) == MarketEvent(2, "SPY", 10.0, 12.0, 9.0, 11.5, 150.0)
+
+
+def test_replay_matches_backtest_in_process_and_over_socket():
+    bars = make_bars()
+    backtest = make_engine()
+    backtest.run(bars.market_events())
+    expect = backtest.portfolio.history
+
+    engine = make_engine()
+    stats = asyncio.run(
+        LiveEngine(engine, coalesce=False).run(async_feed(bars.market_events()))
+    )
+    assert engine.portfolio.history == expect
+    assert stats.bars_processed == len(bars) and stats.bars_coalesced == 0
+
+    engine = make_engine()
+    stats = asyncio.run(paper_trade(engine, list(bars.market_events()), coalesce=False))
+    assert engine.portfolio.history == expect
+    assert stats.orders == len(stats.bar_to_order_ns) > 0
+    summary = stats.summary()
+    assert summary["bars_received"] == len(bars)
+    assert 0 < summary["bar_to_order_p50_us"] <= summary["bar_to_order_max_us"]
+
+
+def test_slow_consumer_coalesces_per_symbol():
+    feeds = [make_bars("SPY", 300, 1), make_bars("QQQ", 300, 2)]
+    events = sorted((e for b in feeds for e in b.market_events()), key=lambda e: e.ts)
+    seen = []
+
+    async def slow_bar(engine, bar):
+        seen.append(bar)
+        await asyncio.sleep(0.002)  # the strategy falls behind an unpaced feed
+
+    async def main():
+        async with ReplayServer(lambda: events) as server:
+            live = LiveEngine(make_engine(), on_bar=slow_bar)
+            return await live.run(socket_feed(server.host, server.port))
+
+    stats = asyncio.run(main())
+    assert stats.bars_received == len(events)
+    assert stats.bars_coalesced > 0
+    assert stats.bars_processed + stats.bars_coalesced == len(events)
+    for b in feeds:
+        mine = [e for e in seen if e.symbol == b.symbol]
+        # nothing lost: last close, total volume and the extremes survive coalescing
+        assert mine[-1].close == b.close[-1]
+        assert np.isclose(sum(e.volume for e in mine), b.volume.sum())
+        assert max(e.high for e in mine) == b.high.max()
+        assert all(x.ts < y.ts for x, y in itertools.pairwise(mine))
+
+
+def test_max_bars_stops_the_feed():
+    engine = make_engine()
+    stats = asyncio.run(
+        LiveEngine(engine).run(
+            async_feed(make_bars().market_events(), rate=2_000), max_bars=25
+        )
+    )
+    assert stats.bars_processed == 25 and engine.bars_seen == 25
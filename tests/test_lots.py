@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from backtester.core.config import parse_run_plan
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars, BarStore
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.lots import LotBook
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+
+def make_bars(symbol="SPY", n=600, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 4e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars(symbol, ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+@pytest.mark.parametrize(
+    "method,realized,unrealized",
+    [("fifo", 250.0, 5 * 130.0 - 550.0), ("average", 225.0, 5 * 130.0 - 525.0)],
+)
+def test_fifo_and_average_cost(method, realized, unrealized):
+    book = LotBook(method)
+    book.fill("SPY", 10, 100.0, fee=1.0)
+    book.fill("SPY", 10, 110.0, fee=1.0)
+    assert book.fill("SPY", -15, 120.0) == realized
+    book.mark("SPY", 130.0)
+    p = book.positions["SPY"]
+    assert p.qty == 5 and np.isclose(book.unrealized, unrealized)
+    assert np.isclose(book.pnl, 350.0 - 2.0)  # same total either way, split differently
+
+    # flip short through zero, then split: PnL is unchanged by the split
+    book.fill("SPY", -10, 140.0)
+    assert p.qty == -5 and np.isclose(p.avg_price, 140.0)
+    before = book.pnl
+    book.apply_split("SPY", 2.0)
+    assert p.qty == -10 and np.isclose(book.pnl, before)
+    assert np.isclose(book.fill("SPY", 10, 60.0), 10 * (70.0 - 60.0))
+    assert p.qty == 0 and book.unrealized == 0.0
+
+    with pytest.raises(ValueError):
+        LotBook("lifo")
+
+
+@pytest.mark.parametrize("method", ["fifo", "average"])
+def test_equity_rows_carry_incremental_pnl(method):
+    events = EventQueue()
+    portfolio = Portfolio(
+        events=events,
+        starting_cash=100_000.0,
+        lot_method=method,
+        allow_short=True,
+        pnl_attribution="symbol",
+    )
+    engine = BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+        portfolio,
+        ExecutionHandler(events=events),
+    )
+    engine.run(make_bars().market_events(), max_bars=None)
+    for row in portfolio.history:
+        assert np.isclose(
+            row["equity"], 100_000.0 + row["realized"] + row["unrealized"]
+        )
+    qty = portfolio.ledger.to_arrays()["side"] * portfolio.ledger.to_arrays()["qty"]
+    assert np.cumsum(qty).min() < 0  # SELL signals went short
+
+    pnl = portfolio.pnl_attribution_df()
+    assert list(pnl.columns) == ["SPY"] and len(pnl) == len(portfolio.history)
+    assert np.isclose(pnl["SPY"].iloc[-1], portfolio.total_value() - 100_000.0)
+    if method == "fifo":
+        assert np.isclose(
+            portfolio.ledger.to_arrays()["realized_pnl"].sum(), portfolio.lots.realized
+        )
+
+
+def test_v1_stays_long_only():
+    events = EventQueue()
+    portfolio = Portfolio(events=events, starting_cash=100_000.0)
+    engine = BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+        portfolio,
+        ExecutionHandler(events=events),
+    )
+    engine.run(make_bars().market_events())
+    cols = portfolio.ledger.to_arrays()
+    assert np.cumsum(cols["side"] * cols["qty"]).min() >= 0
+    with pytest.raises(ValueError):
+        portfolio.pnl_attribution_df()
+
+
+def test_run_plan_attribution_by_strategy(tmp_path):
+    store = BarStore(tmp_path)
+    for k, sym in enumerate(("AAA", "BBB")):
+        store.put(make_bars(sym, 400, k))
+    spec = {
+        "data": {"source": "store", "path": str(tmp_path)},
+        "universe": ["AAA", "BBB"],
+        "strategy": {"params": {"fast": 5, "slow": 20}},
+        "portfolio": {
+            "starting_cash": 100_000.0,
+            "lot_method": "average",
+            "pnl_attribution": "strategy",
+        },
+    }
+    plan = parse_run_plan(spec)
+    engine = plan.build()
+    engine.run(plan.market_events())
+    portfolio = engine.portfolio
+    pnl = portfolio.pnl_attribution_df()
+    assert list(pnl.columns) == ["MovingAverageCrossStrategy"]
+    assert np.isclose(pnl.iloc[-1].sum(), portfolio.total_value() - 100_000.0)
+    assert set(portfolio.lots.by_symbol()) == {"AAA", "BBB"}
+
+    with pytest.raises(ValueError):
+        parse_run_plan({**spec, "portfolio": {"lot_method": "lifo"}})
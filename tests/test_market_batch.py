@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars, market_batches
+from backtester.events import MarketBatchEvent
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+from backtester.strategy.router import StrategyRouter
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+
+
+def make_bars(symbol, n=300, seed=0, step=1):
+    rng = np.random.default_rng(seed)
+    close = 50.0 * np.cumprod(1.0 + rng.normal(0, 4e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * step * np.timedelta64(
+        1, "m"
+    )
+    return Bars(symbol, ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+def make_router():
+    events = EventQueue()
+    router = StrategyRouter(
+        events=events,
+        portfolio=Portfolio(events=events, starting_cash=1_000_000.0),
+        execution=ExecutionHandler(events=events),
+    )
+    for sym in SYMBOLS:
+        router.subscribe(
+            MovingAverageCrossStrategy(events=events, symbol=sym, fast=5, slow=20)
+        )
+    return router
+
+
+class PlainStrategy:
+    # on_market only: gets the engine's fan-out
+    def __init__(self):
+        self.seen = []
+
+    def on_market(self, event):
+        self.seen.append(event.symbol)
+
+
+def test_batch_validates_columns():
+    with pytest.raises(ValueError, match="close"):
+        MarketBatchEvent(
+            "2024-01-02T09:30:00", ("A", "B"), [1, 1], [1, 1], [1, 1], [1], [1, 1]
+        )
+
+
+def test_batches_group_by_timestamp_and_share_symbols():
+    bars = [make_bars("AAA", 4), make_bars("BBB", 2, step=2)]
+    batches = list(market_batches(bars))
+    assert [b.symbols for b in batches] == [
+        ("AAA", "BBB"),
+        ("AAA",),
+        ("AAA", "BBB"),
+        ("AAA",),
+    ]
+    assert batches[0].symbols is batches[2].symbols
+    assert batches[2].closes() == {"AAA": bars[0].close[2], "BBB": bars[1].close[1]}
+
+
+def test_batched_run_trades_like_per_symbol_run():
+    bars = [make_bars(s, seed=i) for i, s in enumerate(SYMBOLS)]
+
+    ref = make_router()
+    # stable: symbol order within a timestamp
+    per_event = sorted((e for b in bars for e in b.market_events()), key=lambda e: e.ts)
+    ref.run(per_event)
+
+    batched = make_router()
+    assert batched.run(market_batches(bars)) == 300
+
+    a, b = ref.engine.portfolio, batched.engine.portfolio
+    assert len(a.ledger) > 0
+    for k, v in a.ledger.to_arrays().items():
+        assert np.array_equal(b.ledger.to_arrays()[k], v)
+    assert a.cash == b.cash
+    assert a.positions == b.positions
+    assert len(b.history) == 300  # one equity row per timestamp
+
+
+def test_engine_fans_out_to_on_market_consumers():
+    events = EventQueue()
+    strategy = PlainStrategy()
+    engine = BacktestEngine(
+        events, strategy, Portfolio(events=events), ExecutionHandler(events=events)
+    )
+    engine.run(market_batches([make_bars("AAA", 3), make_bars("BBB", 3)]))
+    assert strategy.seen == ["AAA", "BBB"] * 3
+    assert engine.bars_seen == 3
@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from backtester.core.config import parse_run_plan
+from backtester.data.bar_store import Bars, BarStore
+from backtester.optimize import (
+    Choice,
+    FloatParam,
+    IntParam,
+    Observation,
+    Optimizer,
+    SearchSpace,
+    TPESampler,
+    TrialStep,
+    apply_params,
+    run_step,
+)
+
+N = 3_000
+
+
+@pytest.fixture
+def plan(tmp_path):
+    rng = np.random.default_rng(0)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 3e-3, N))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(N) * np.timedelta64(1, "m")
+    BarStore(tmp_path / "bars").put(
+        Bars("SPY", ts.view(np.int64), close, close, close, close, np.ones(N))
+    )
+    return parse_run_plan(
+        {
+            "data": {"source": "store", "path": str(tmp_path / "bars")},
+            "universe": ["SPY"],
+            "strategy": {"params": {"fast": 5, "slow": 20}},
+        }
+    )
+
+
+def space():
+    return SearchSpace(
+        {
+            "fast": IntParam(2, 20),
+            "slow": IntParam(10, 80),
+            "commission.per_trade_fee": FloatParam(0.0, 2.0),
+        },
+        constraint=lambda p: p["fast"] < p["slow"],
+    )
+
+
+def test_space_sampling_and_apply_params(plan):
+    rng = np.random.default_rng(1)
+    s = space()
+    for _ in range(200):
+        p = s.sample(rng)
+        assert (
+            2 <= p["fast"] < p["slow"] <= 80
+            and 0.0 <= p["commission.per_trade_fee"] <= 2.0
+        )
+    assert {IntParam(1, 3).from_unit(u) for u in np.linspace(0, 1, 50)} == {1, 2, 3}
+    assert Choice(("a", "b")).from_unit(0.99) == "b"
+
+    applied = apply_params(
+        plan, {"fast": 7, "commission.per_trade_fee": 0.5, "slippage.bps": 2.0}
+    )
+    assert applied.strategy.kwargs == {"fast": 7, "slow": 20}
+    assert applied.commission.per_trade_fee == 0.5 and applied.slippage.bps == 2.0
+    with pytest.raises(ValueError):
+        apply_params(plan, {"costs.fee": 1.0})
+    with pytest.raises(ValueError):
+        SearchSpace({"fast": IntParam(2, 5)}, constraint=lambda p: False).sample(rng)
+
+
+def test_resumed_trial_matches_a_full_run(plan, tmp_path):
+    ckpt = str(tmp_path / "t.pkl")
+    first = run_step(TrialStep(0, plan, 1_000, ckpt))
+    rest = run_step(TrialStep(0, plan, N, ckpt))
+    full = run_step(TrialStep(1, plan, N))
+    assert (first.bars, first.ran) == (1_000, 1_000)
+    assert (rest.bars, rest.ran) == (N, N - 1_000)
+    assert rest.metrics == full.metrics
+
+
+def test_halving_prunes_and_is_worker_independent(plan, tmp_path):
+    results = []
+    for workers in (1, 2):
+        opt = Optimizer(plan, space(), workers=workers, seed=3)
+        results.append(opt.successive_halving(9, min_bars=N // 9, eta=3))
+    one, two = results
+    assert one.max_bars == N
+    assert [(t.params, t.bars, t.score) for t in one.trials] == [
+        (t.params, t.bars, t.score) for t in two.trials
+    ]
+    assert (
+        sum(t.pruned for t in one.trials) == 8
+        and not one.best.pruned
+        and one.best.bars == N
+    )
+    # 9 x 333 + 3 x (1000 - 333) + 1 x (3000 - 1000) bars, instead of 9 full runs
+    assert one.bars_run == 9 * 333 + 3 * 667 + 2_000
+
+    hb = Optimizer(
+        plan, space(), sampler=TPESampler(space(), n_startup=5), seed=3
+    ).hyperband(min_bars=N // 9)
+    assert len(hb.trials) == 9 + 5 + 3 and hb.best.bars == N
+    assert len(hb.table()) == len(hb.trials)
+
+
+def test_tpe_concentrates_on_good_region():
+    s = SearchSpace({"x": IntParam(0, 100), "mode": Choice(("a", "b"))})
+    rng = np.random.default_rng(0)
+    obs = []
+    for _ in range(60):
+        p = s.sample(rng)
+        score = -abs(p["x"] - 20) + (5.0 if p["mode"] == "b" else 0.0)
+        obs.append(Observation(p, 100, score))
+    sampler = TPESampler(s, n_startup=10)
+    picks = [sampler.suggest(rng, obs) for _ in range(100)]
+    assert np.median([abs(p["x"] - 20) for p in picks]) < 10
+    assert sum(p["mode"] == "b" for p in picks) > 70
+    with pytest.raises(ValueError):
+        Optimizer(None, s, objective="profit", max_bars=10)
@@ -0,0 +1,150 @@
+import numpy as np
+
+from backtester.core.event_queue import EventQueue
+from backtester.events import OrderEvent, OrderType, Side
+from backtester.execution.execution_handler import CommissionModel
+from backtester.execution.order_book import (
+    ASK,
+    BID,
+    DEPTH_DTYPE,
+    L2OrderBook,
+    OrderBookExecutionHandler,
+)
+
+
+def make_book():
+    book = L2OrderBook("SPY", tick_size=0.01, base_price=90.0, n_levels=2_000)
+    book.apply_snapshot(
+        bid_prices=np.array([99.99, 99.98, 99.97]),
+        bid_sizes=np.array([100.0, 200.0, 300.0]),
+        ask_prices=np.array([100.01, 100.02, 100.03]),
+        ask_sizes=np.array([100.0, 200.0, 300.0]),
+    )
+    return book
+
+
+def test_snapshot_and_deltas_track_best_levels():
+    book = make_book()
+    assert np.isclose(book.best_bid_price(), 99.99)
+    assert np.isclose(book.best_ask_price(), 100.01)
+
+    # delete best ask, improve bid; last write per level wins
+    recs = np.array(
+        [(0, ASK, 100.01, 0.0), (0, BID, 100.00, 50.0), (0, BID, 100.00, 75.0)],
+        dtype=DEPTH_DTYPE,
+    )
+    book.apply_depth_records(recs)
+    assert np.isclose(book.best_ask_price(), 100.02)
+    assert np.isclose(book.best_bid_price(), 100.00)
+    assert book.bids[book.level_of(100.00)] == 75.0
+
+
+def test_market_order_walks_the_book():
+    book = make_book()
+    prices, qtys = book.walk(Side.BUY, 250.0)
+    assert np.allclose(prices, [100.01, 100.02])
+    assert np.allclose(qtys, [100.0, 150.0])
+    assert np.isclose(book.best_ask_price(), 100.02)
+    assert book.asks[book.level_of(100.02)] == 50.0
+
+
+def test_limit_order_queue_position():
+    book = make_book()
+    book.rest("a", Side.BUY, 99.99, 10.0)
+
+    # cancels shrink the queue ahead of us
+    book.update(BID, 99.99, 60.0)
+    assert book.resting["a"].queue_ahead == 60.0
+
+    assert book.on_trade(99.99, 60.0) == []
+    fills = book.on_trade(99.99, 4.0)
+    assert fills == [("a", book.price_of(book.level_of(99.99)), 4.0)]
+    assert "a" in book.resting
+
+
+def test_execution_handler_emits_partial_fills():
+    events = EventQueue()
+    book = make_book()
+    handler = OrderBookExecutionHandler(
+        events,
+        {"SPY": book},
+        commission=CommissionModel(model="per_trade", per_trade_fee=0.0),
+    )
+    handler.on_order(
+        OrderEvent(
+            ts="2024-01-02T09:30:00",
+            symbol="SPY",
+            side=Side.BUY,
+            qty=150.0,
+            order_type=OrderType.LMT,
+            limit_price=100.01,
+        )
+    )
+    fill = events.get()
+    assert fill.qty == 100.0 and np.isclose(fill.fill_price, 100.01)
+    assert events.empty()
+
+    # remainder rests at 100.01 behind nothing (level was consumed)
+    handler.on_trade("2024-01-02T09:31:00", "SPY", 100.01, 80.0)
+    fill = events.get()
+    assert fill.qty == 50.0
+
+
+def test_print_advances_every_order_at_the_level():
+    book = make_book()
+    book.rest("a", Side.BUY, 99.99, 10.0)
+    book.rest("b", Side.BUY, 99.99, 10.0)
+    assert book.resting["b"].queue_ahead == 110.0  # displayed 100 + our order a
+
+    assert book.on_trade(99.99, 100.0) == []
+    assert (
+        book.resting["a"].queue_ahead == 0.0 and book.resting["b"].queue_ahead == 10.0
+    )
+    assert book.bids[book.level_of(99.99)] == 0.0
+    assert np.isclose(book.best_bid_price(), 99.98)
+
+    px = book.price_of(book.level_of(99.99))
+    assert book.on_trade(99.99, 15.0) == [("a", px, 10.0), ("b", px, 5.0)]
+    assert list(book.resting) == ["b"]
+
+    # cancelling an order moves the ones behind it up
+    book.rest("c", Side.BUY, 99.99, 10.0)
+    book.cancel("b")
+    assert book.resting["c"].queue_ahead == 0.0
+
+
+def test_marketable_limit_outside_the_grid():
+    book = make_book()
+    prices, qtys = book.walk(Side.BUY, 150.0, limit_price=200.0)
+    assert np.allclose(prices, [100.01, 100.02]) and np.allclose(qtys, [100.0, 50.0])
+    prices, qtys = book.walk(Side.SELL, 50.0, limit_price=1.0)
+    assert np.allclose(prices, [99.99]) and np.allclose(qtys, [50.0])
+    assert book.walk(Side.BUY, 10.0, limit_price=1.0)[0].size == 0
+
+
+def test_handler_drops_off_grid_remainder_and_ignores_foreign_orders():
+    events = EventQueue()
+    book = make_book()
+    handler = OrderBookExecutionHandler(
+        events,
+        {"SPY": book},
+        commission=CommissionModel(model="per_trade", per_trade_fee=0.0),
+    )
+    handler.on_order(
+        OrderEvent(
+            ts="2024-01-02T09:30:00",
+            symbol="SPY",
+            side=Side.BUY,
+            qty=1_000.0,
+            order_type=OrderType.LMT,
+            limit_price=200.0,
+        )
+    )
+    fills = [events.get() for _ in range(3)]
+    assert sum(f.qty for f in fills) == 600.0 and events.empty()
+    assert not book.resting
+
+    # an order rested on the book directly fills there, but is not this handler's
+    book.rest("ext", Side.BUY, 99.99, 10.0)
+    handler.on_trade("2024-01-02T09:31:00", "SPY", 99.98, 5.0)
+    assert events.empty() and "ext" not in book.resting
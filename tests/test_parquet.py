@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from backtester.core.config import parse_run_plan
+from backtester.data.bar_store import Bars, bars_from_csv
+from backtester.data.csv_data_handler import CSVDataHandler
+from backtester.data.parquet_data_handler import (
+    ParquetDataHandler,
+    convert_csv,
+    write_bars,
+)
+
+
+def make_bars(symbol, n=60_000, seed=0):
+    # 30-minute bars spanning 2022..2025
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 1e-3, n))
+    ts = np.datetime64("2022-01-03T09:30", "ns") + np.arange(n) * np.timedelta64(
+        30, "m"
+    )
+    return Bars(
+        symbol,
+        ts.view(np.int64),
+        close,
+        close + 0.5,
+        close - 0.5,
+        close,
+        rng.random(n) * 1e3,
+    )
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    root = tmp_path / "bars"
+    bars = {s: make_bars(s, seed=k) for k, s in enumerate(("SPY", "QQQ", "IWM"))}
+    for b in bars.values():
+        write_bars(b, root, row_group_rows=2_000)
+    return root, bars
+
+
+def test_window_and_symbol_pushdown(dataset):
+    root, bars = dataset
+    handler = ParquetDataHandler(str(root), "QQQ", start="2023-03-01", end="2023-06-01")
+    got = handler.load()
+    expect = bars["QQQ"].window("2023-03-01", "2023-06-01")
+    assert len(got) == len(expect) > 0
+    for f in ("ts", "open", "high", "low", "close", "volume"):
+        np.testing.assert_array_equal(getattr(got, f), getattr(expect, f))
+
+    # ~3 months of one symbol touches its own few row groups, not the archive
+    kept, total = handler.row_groups()
+    assert total > 90
+    assert kept <= 3
+
+
+def test_full_symbol_and_batches(dataset):
+    root, bars = dataset
+    handler = ParquetDataHandler(str(root), "SPY", batch_rows=5_000)
+    chunks = list(handler.iter_batches())
+    assert all(len(c) <= 5_000 for c in chunks)
+    full = handler.load()
+    np.testing.assert_array_equal(full.ts, bars["SPY"].ts)
+    np.testing.assert_array_equal(full.close, bars["SPY"].close)
+    assert len(ParquetDataHandler(str(root), "DIA").load()) == 0
+
+
+def test_market_events_match_csv_handler(tmp_path):
+    csv = tmp_path / "spy.csv"
+    n = 500
+    ts = pd.date_range("2024-01-02 09:30", periods=n, freq="min")
+    px = np.linspace(100, 101, n)
+    pd.DataFrame(
+        {
+            "date": ts.strftime("%Y-%m-%d %H:%M:%S"),
+            "open": px,
+            "high": px,
+            "low": px,
+            "close": px,
+            "volume": 1.0,
+        }
+    ).to_csv(csv, index=False)
+    handler = CSVDataHandler(csv_path=str(csv), symbol="SPY", ts_col="date")
+
+    bars = convert_csv(handler, tmp_path / "pq", row_group_rows=100)
+    np.testing.assert_array_equal(bars.ts, bars_from_csv(handler).ts)
+    events = list(
+        ParquetDataHandler(str(tmp_path / "pq"), "SPY").stream_market_events()
+    )
+    expect = list(handler.stream_market_events())
+    assert [(e.ts, e.symbol) for e in events] == [(e.ts, e.symbol) for e in expect]
+    np.testing.assert_allclose(
+        [e.close for e in events], [e.close for e in expect], rtol=1e-15
+    )
+
+
+def test_run_plan_parquet_source(dataset):
+    root, bars = dataset
+    plan = parse_run_plan(
+        {
+            "data": {"source": "parquet", "path": str(root)},
+            "universe": ["SPY", "IWM"],
+            "window": {"start": "2024-01-02", "end": "2024-01-05"},
+        }
+    )
+    events = list(plan.market_events())
+    expect = len(bars["SPY"].window("2024-01-02", "2024-01-05")) * 2
+    assert len(events) == expect
+    assert {e.symbol for e in events} == {"SPY", "IWM"}
+    assert [e.ts for e in events] == sorted(e.ts for e in events)
+
+    with pytest.raises(ValueError):
+        parse_run_plan({"data": {"source": "parquet"}, "universe": ["SPY"]})
@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.analysis.downsample import (
+    downsample_series,
+    lttb_indices,
+    minmax_indices,
+)
+from backtester.analysis.metrics import compute_metrics
+from backtester.analysis.report import build_report, render_report, render_report_async
+from backtester.events import Side
+from backtester.portfolio.ledger import TradeLedger
+
+
+def equity_frame(n=20_000, seed=0):
+    rng = np.random.default_rng(seed)
+    equity = 100_000 * np.exp(np.cumsum(rng.normal(0, 1e-3, n)))
+    cash = np.where(np.arange(n) % 500 < 250, equity, equity * 0.4)
+    idx = pd.date_range("2024-01-02 09:30", periods=n, freq="min", name="ts")
+    return pd.DataFrame({"equity": equity, "cash": cash}, index=idx)
+
+
+def round_trip_ledger(df):
+    ledger = TradeLedger()
+    ts = df.index
+    for k in range(0, 8, 2):
+        ledger.record(ts[100 * k], "SPY", Side.BUY, 10, 100.0 + k, 1.0)
+        ledger.record(ts[100 * k + 50], "SPY", Side.SELL, 10, 101.0 + k * 0.5, 1.0)
+    return ledger
+
+
+def test_minmax_keeps_extremes_and_bounds():
+    y = np.random.default_rng(1).normal(size=100_003)
+    y[54_321] = 50.0
+    y[7] = -50.0
+    idx = minmax_indices(y, 1_000)
+    assert len(idx) <= 1_000
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert np.all(np.diff(idx) > 0)
+    assert {7, 54_321} <= set(idx.tolist())
+    assert np.array_equal(minmax_indices(y[:50], 1_000), np.arange(50))
+
+
+def test_lttb_length_and_endpoints():
+    x = np.arange(10_000, dtype=float)
+    y = np.sin(x / 100.0)
+    idx = lttb_indices(x, y, 500)
+    assert len(idx) == 500
+    assert idx[0] == 0 and idx[-1] == 9_999
+    assert np.all(np.diff(idx) > 0)
+
+    s = pd.Series(y, index=pd.date_range("2024-01-01", periods=len(y), freq="min"))
+    assert len(downsample_series(s, 500, "lttb")) == 500
+    with pytest.raises(ValueError):
+        downsample_series(s, 500, "every-nth")
+
+
+def test_build_report_matches_pandas():
+    df = equity_frame()
+    report = build_report(
+        df, periods_per_year=252 * 390, ledger=round_trip_ledger(df), sharpe_window=390
+    )
+
+    assert report.metrics == compute_metrics(df, periods_per_year=252 * 390)
+    dd = df["equity"] / df["equity"].cummax() - 1.0
+    np.testing.assert_allclose(report.drawdown, dd.to_numpy())
+    np.testing.assert_allclose(report.exposure, 1.0 - df["cash"] / df["equity"])
+
+    r = df["equity"].pct_change()
+    roll = r.rolling(390)
+    expected = (roll.mean() / roll.std() * np.sqrt(252 * 390)).to_numpy()
+    assert np.isnan(report.rolling_sharpe[:390]).all()
+    np.testing.assert_allclose(report.rolling_sharpe[390:], expected[390:], rtol=1e-6)
+
+    assert len(report.fill_ts) == 8
+    assert len(report.trade_pnl) == 4
+
+    with pytest.raises(ValueError):
+        build_report(df, price=np.ones(10))
+
+
+def test_downsampled_view_keeps_drawdown_trough():
+    df = equity_frame()
+    report = build_report(
+        df, periods_per_year=252 * 390, price=df["equity"].to_numpy() / 1_000
+    )
+    view = report.downsampled(2_000)
+    assert len(view) <= 2_000
+    assert view.drawdown.min() == report.drawdown.min()
+    assert view.equity.max() == report.equity.max()
+    assert len(view.price) == len(view)
+
+
+def test_render_report_writes_files(tmp_path):
+    df = equity_frame(5_000)
+    report = build_report(
+        df, ledger=round_trip_ledger(df), price=df["equity"].to_numpy()
+    )
+    written = render_report(report, tmp_path, max_points=1_000)
+    for name in (
+        "report.png",
+        "pnl_hist.png",
+        "report.html",
+        "equity_curve.png",
+        "drawdown_curve.png",
+    ):
+        assert tmp_path / name in written
+        assert (tmp_path / name).stat().st_size > 0
+    assert "data:image/png;base64," in (tmp_path / "report.html").read_text()
+
+
+def test_render_report_async(tmp_path):
+    report = build_report(equity_frame(2_000))
+    proc = render_report_async(report, tmp_path, formats=("html",), legacy_plots=False)
+    proc.join(timeout=120)
+    assert proc.exitcode == 0
+    assert (tmp_path / "report.html").exists()
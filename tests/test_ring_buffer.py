@@ -0,0 +1,163 @@
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars, market_batches
+from backtester.data.ring_buffer import BarHistory
+from backtester.events import ActionType, CorporateActionEvent, MarketEvent
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+from backtester.strategy.router import StrategyRouter
+
+SYMBOLS = ["AAA", "BBB", "CCC"]
+PARAMS = [(5, 20), (10, 30), (3, 12)]
+
+
+def make_bars(symbol, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 50.0 * np.cumprod(1.0 + rng.normal(0, 4e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars(
+        symbol,
+        ts.view(np.int64),
+        close,
+        close + 0.1,
+        close - 0.1,
+        close,
+        np.arange(n, dtype=float),
+    )
+
+
+def test_window_is_zero_copy_view_of_last_n():
+    h = BarHistory(capacity=8)
+    for i in range(21):
+        h.append("SPY", close=float(i), volume=10.0 * i)
+    w = h.closes("SPY", 5)
+    assert w.tolist() == [16.0, 17.0, 18.0, 19.0, 20.0]
+    assert h.window("SPY", "close").tolist() == [float(i) for i in range(13, 21)]
+    assert h.volumes("SPY", 2).tolist() == [190.0, 200.0]
+    assert np.shares_memory(w, h._data)
+    assert not w.flags.writeable
+    assert h.count("SPY") == 21
+    assert len(h.closes("QQQ", 5)) == 0
+
+    warm = BarHistory(capacity=8)
+    warm.append("SPY", close=1.0)
+    assert warm.closes("SPY", 5).tolist() == [1.0]
+    with pytest.raises(ValueError):
+        warm.closes("SPY", 9)
+
+
+def test_reserve_and_field_validation():
+    h = BarHistory()
+    h.reserve(10)
+    h.reserve(4)
+    assert h.capacity == 10
+    h.append("SPY", close=1.0)
+    with pytest.raises(ValueError):
+        h.reserve(11)
+    with pytest.raises(ValueError):
+        BarHistory(capacity=5, fields=("close", "vwap"))
+    with pytest.raises(ValueError):
+        BarHistory().append("SPY", close=1.0)
+
+
+def test_batch_writes_match_per_event_writes():
+    bars = {s: make_bars(s, n=50, seed=k) for k, s in enumerate(SYMBOLS)}
+    per_event = BarHistory(capacity=16)
+    batched = BarHistory(capacity=16)
+    for s in SYMBOLS:
+        for ev in bars[s].market_events():
+            per_event.on_market(ev)
+    for batch in market_batches(bars.values()):
+        batched.update(batch)
+    for s in SYMBOLS:
+        for f in ("open", "high", "low", "close", "volume"):
+            np.testing.assert_array_equal(batched.window(s, f), per_event.window(s, f))
+
+
+def test_split_rescales_history():
+    h = BarHistory(capacity=4, fields=("close", "volume"))
+    for px in (100.0, 102.0, 104.0):
+        h.on_market(MarketEvent("2024-01-02", "SPY", px, px, px, px, 10.0))
+    h.update(CorporateActionEvent("2024-01-03", "SPY", ActionType.SPLIT, ratio=2.0))
+    assert h.closes("SPY").tolist() == [50.0, 51.0, 52.0]
+    assert h.volumes("SPY").tolist() == [20.0, 20.0, 20.0]
+
+
+def run_router(history, batched):
+    events = EventQueue()
+    router = StrategyRouter(
+        events=events,
+        portfolio=Portfolio(events=events, starting_cash=1_000_000.0),
+        execution=ExecutionHandler(events=events),
+        history=history,
+    )
+    for sym in SYMBOLS:
+        for fast, slow in PARAMS:
+            router.subscribe(
+                MovingAverageCrossStrategy(
+                    events=events, symbol=sym, fast=fast, slow=slow, history=history
+                )
+            )
+    bars = {s: make_bars(s, seed=k) for k, s in enumerate(SYMBOLS)}
+    if batched:
+        router.run(market_batches(bars.values()))
+    else:
+        feed = sorted(
+            (ev for s in SYMBOLS for ev in bars[s].market_events()), key=lambda e: e.ts
+        )
+        router.run(feed)
+    return router.engine.portfolio.ledger.to_arrays()
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_shared_history_strategies_match_private_deques(batched):
+    history = BarHistory()
+    shared = run_router(history, batched)
+    private = run_router(None, batched)
+    assert len(shared["ts"]) > 0
+    for k in ("ts", "side", "qty", "price"):
+        np.testing.assert_array_equal(shared[k], private[k])
+    # sized by symbols x max lookback, not by the 9 strategy instances
+    assert history.capacity == 30
+    assert history.nbytes == len(SYMBOLS) * 5 * 2 * 30 * 8
+
+
+def test_engine_writes_history_before_strategy():
+    events = EventQueue()
+    history = BarHistory(capacity=30)
+    strategy = MovingAverageCrossStrategy(
+        events=events, symbol="SPY", fast=5, slow=20, history=history
+    )
+    engine = BacktestEngine(
+        events,
+        strategy,
+        Portfolio(events=events, starting_cash=100_000.0),
+        ExecutionHandler(events=events),
+        history=history,
+    )
+    bars = make_bars("SPY")
+    engine.run(bars.market_events())
+    assert history.count("SPY") == len(bars)
+    np.testing.assert_array_equal(history.closes("SPY", 30), bars.close[-30:])
+    assert strategy.last_side is not None
+    assert len(strategy.prices) == 0
+
+
+def test_unwritten_history_fails_on_the_first_bar():
+    events = EventQueue()
+    history = BarHistory(capacity=30)
+    strategy = MovingAverageCrossStrategy(
+        events=events, symbol="SPY", fast=5, slow=20, history=history
+    )
+    engine = BacktestEngine(
+        events,
+        strategy,
+        Portfolio(events=events, starting_cash=100_000.0),
+        ExecutionHandler(events=events),
+    )
+    with pytest.raises(ValueError, match="history"):
+        engine.run(make_bars("SPY").market_events())
@@ -0,0 +1,162 @@
+import numpy as np
+import pytest
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.data.bar_store import Bars, market_batches
+from backtester.events import EventType, MarketBatchEvent, OrderEvent, OrderType, Side
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.portfolio.risk import RiskEngine, RiskLimits
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+TS = "2024-01-02T09:30:00"
+
+
+def make_risk(limits, cash=100_000.0, positions=None, prices=None):
+    portfolio = Portfolio(events=EventQueue(), starting_cash=cash)
+    portfolio.positions.update(positions or {})
+    portfolio.last_price.update(prices or {})
+    risk = RiskEngine(limits)
+    risk.attach(portfolio)
+    return risk
+
+
+def order(symbol, side, qty, limit_price=None):
+    ot = OrderType.MKT if limit_price is None else OrderType.LMT
+    return OrderEvent(TS, symbol, side, qty, ot, limit_price)
+
+
+def test_limits_validation():
+    with pytest.raises(ValueError):
+        RiskLimits(max_gross=0.0)
+    with pytest.raises(ValueError):
+        RiskLimits(max_drawdown=-0.1)
+
+
+def test_incremental_aggregates_match_full_recompute():
+    rng = np.random.default_rng(0)
+    symbols = tuple(f"S{i:03d}" for i in range(500))
+    risk = make_risk(RiskLimits())
+    qty = {}
+    cash = 100_000.0
+    for step in range(200):
+        px = 50.0 + rng.random(len(symbols)) * 100
+        batch = MarketBatchEvent(TS, symbols, px, px, px, px, np.ones(len(symbols)))
+        risk.on_market_batch(batch)
+        for i in rng.integers(0, len(symbols), 20).tolist():
+            q = float(rng.integers(-100, 100))
+            qty[symbols[i]] = qty.get(symbols[i], 0.0) + q
+            cash -= q * px[i]
+            risk.on_position(symbols[i], qty[symbols[i]], cash)
+        if step % 50 == 0:
+            risk.on_price(symbols[0], 75.0)
+            px[0] = 75.0
+
+        value = np.array([qty.get(s, 0.0) for s in symbols]) * px
+        assert np.isclose(risk.gross, np.abs(value).sum())
+        assert np.isclose(risk.net, value.sum())
+        assert np.isclose(risk.equity, cash + value.sum())
+
+
+def test_each_rule_rejects_with_a_risk_event():
+    prices = {"AAA": 100.0, "BBB": 50.0}
+    cases = [
+        (RiskLimits(max_order_qty=50), order("AAA", Side.BUY, 60), "max_order_qty"),
+        (
+            RiskLimits(max_order_notional=1_000),
+            order("AAA", Side.BUY, 5, 250.0),
+            "max_order_notional",
+        ),
+        (
+            RiskLimits(max_position_notional=15_000),
+            order("AAA", Side.BUY, 60),
+            "max_position_notional",
+        ),
+        (
+            RiskLimits(max_concentration=0.1),
+            order("AAA", Side.BUY, 150),
+            "max_concentration",
+        ),
+        (RiskLimits(max_gross=20_000), order("BBB", Side.BUY, 250), "max_gross"),
+        (RiskLimits(max_net=5_000), order("BBB", Side.SELL, 400), "max_net"),
+        (RiskLimits(max_leverage=0.15), order("BBB", Side.BUY, 200), "max_leverage"),
+    ]
+    for limits, o, rule in cases:
+        risk = make_risk(limits, positions={"AAA": 100.0}, prices=prices)
+        breach = risk.check(o)
+        assert breach is not None and breach.rule == rule, rule
+        assert breach.type == EventType.RISK
+        assert breach.value > breach.limit
+        assert risk.breaches == [breach]
+
+    risk = make_risk(
+        RiskLimits(max_position_notional=15_000),
+        positions={"AAA": 100.0},
+        prices=prices,
+    )
+    assert risk.check(order("AAA", Side.BUY, 40)) is None
+
+
+def test_drawdown_blocks_only_risk_increasing_orders():
+    risk = make_risk(
+        RiskLimits(max_drawdown=0.05), positions={"AAA": 500.0}, prices={"AAA": 100.0}
+    )
+    risk.on_price("AAA", 80.0)  # equity 150k -> 140k
+    assert np.isclose(risk.drawdown(), 10_000 / 150_000)
+    assert risk.check(order("AAA", Side.BUY, 10)).rule == "max_drawdown"
+    assert risk.check(order("AAA", Side.SELL, 100)) is None
+    # flipping short is still an increase in |position|
+    assert risk.check(order("AAA", Side.SELL, 1_100)).rule == "max_drawdown"
+
+
+class RecordingStrategy(MovingAverageCrossStrategy):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rejections = []
+
+    def on_risk(self, event):
+        self.rejections.append(event)
+
+
+def make_bars(symbol, n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.cumprod(1.0 + rng.normal(0, 3e-3, n))
+    ts = np.datetime64("2024-01-02T09:30", "ns") + np.arange(n) * np.timedelta64(1, "m")
+    return Bars(symbol, ts.view(np.int64), close, close, close, close, np.ones(n))
+
+
+@pytest.mark.parametrize("batched", [False, True])
+def test_engine_routes_orders_through_risk(batched):
+    events = EventQueue()
+    portfolio = Portfolio(events=events, starting_cash=100_000.0, target_qty=100.0)
+    strategy = RecordingStrategy(events=events, symbol="SPY", fast=5, slow=20)
+    risk = RiskEngine(RiskLimits(max_position_notional=5_000.0))
+    engine = BacktestEngine(
+        events, strategy, portfolio, ExecutionHandler(events=events), risk=risk
+    )
+    bars = make_bars("SPY")
+    engine.run(market_batches([bars]) if batched else bars.market_events())
+
+    # every BUY of 100 shares (~$10k) breaches; SELLs from flat never reach execution
+    assert len(portfolio.ledger) == 0
+    assert strategy.rejections and all(
+        e.rule == "max_position_notional" for e in strategy.rejections
+    )
+    assert risk.breaches == strategy.rejections
+    assert np.isclose(risk.equity, portfolio.total_value())
+
+    events = EventQueue()
+    portfolio = Portfolio(events=events, starting_cash=100_000.0, target_qty=100.0)
+    risk = RiskEngine(RiskLimits(max_position_notional=50_000.0))
+    engine = BacktestEngine(
+        events,
+        MovingAverageCrossStrategy(events=events, symbol="SPY", fast=5, slow=20),
+        portfolio,
+        ExecutionHandler(events=events),
+        risk=risk,
+    )
+    engine.run(bars.market_events())
+    assert len(portfolio.ledger) > 0 and not risk.breaches
+    assert risk.position("SPY") == portfolio.positions["SPY"]
+    assert np.isclose(risk.equity, portfolio.total_value())
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+from backtester.analysis.metrics import compute_metrics
+from backtester.analysis.robustness import (
+    bootstrap_metrics,
+    path_metrics,
+    slippage_metrics,
+    timing_jitter_metrics,
+)
+from backtester.execution.execution_handler import SlippageModel
+
+
+def make_equity(n=2_000, seed=0):
+    rng = np.random.default_rng(seed)
+    return 10_000.0 * np.cumprod(1.0 + rng.normal(2e-5, 1e-3, n))
+
+
+def test_path_metrics_matches_compute_metrics():
+    eq = make_equity()
+    m = compute_metrics(pd.DataFrame({"equity": eq}), periods_per_year=252 * 390)
+    pm = path_metrics(eq[None, :], periods_per_year=252 * 390)
+    for name in ("total_return", "max_drawdown", "volatility", "sharpe"):
+        assert np.isclose(pm[name][0], getattr(m, name))
+
+
+def test_bootstrap_is_reproducible_for_any_worker_count():
+    eq = make_equity()
+    a = bootstrap_metrics(eq, n_paths=300, block=50, seed=42, chunk_paths=64, n_jobs=1)
+    b = bootstrap_metrics(eq, n_paths=300, block=50, seed=42, chunk_paths=64, n_jobs=2)
+    assert a.n_paths == 300
+    for name in a.metrics:
+        assert np.array_equal(a.metrics[name], b.metrics[name])
+    lo, hi = a.ci("total_return")
+    assert lo < hi
+
+
+def test_slippage_and_jitter_without_noise_reproduce_the_run():
+    n = 500
+    close = 100.0 + np.sin(np.arange(n) / 20.0)
+    positions = np.where(np.arange(n) % 100 < 50, 10.0, 0.0)
+    traded = np.abs(np.diff(positions, prepend=0.0))
+    pnl = np.r_[0.0, positions[:-1] * np.diff(close)]
+    eq = 10_000.0 + np.cumsum(pnl)
+    base = path_metrics(eq[None, :])
+
+    res = slippage_metrics(
+        eq, traded, close, SlippageModel(bps=2.0), spread_sd=0.0, n_paths=8
+    )
+    assert np.allclose(res.metrics["total_return"], base["total_return"][0])
+
+    res = timing_jitter_metrics(close, positions, 10_000.0, max_lag=0, n_paths=8)
+    assert np.allclose(res.metrics["sharpe"], base["sharpe"][0])
+
+    noisy = slippage_metrics(
+        eq, traded, close, SlippageModel(bps=2.0), spread_sd=1.0, n_paths=64
+    )
+    assert noisy.metrics["total_return"].std() > 0
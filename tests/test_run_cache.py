@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from backtester.analysis.metrics import BacktestMetrics
+from backtester.analysis.run_cache import CachedRun, RunCache, run_key
+from backtester.execution.execution_handler import CommissionModel, SlippageModel
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+
+
+def make_run(n=100):
+    idx = pd.date_range("2024-01-02 09:30", periods=n, freq="min", name="ts")
+    eq = pd.DataFrame(
+        {"equity": np.linspace(1e4, 1.1e4, n), "cash": np.full(n, 1e4)}, index=idx
+    )
+    return CachedRun(
+        BacktestMetrics(0.1, -0.02, 0.15, 1.3), eq, {"qty": np.arange(3.0)}
+    )
+
+
+def test_key_changes_with_any_input():
+    base = {
+        "data_fingerprint": "abc",
+        "strategy": MovingAverageCrossStrategy,
+        "params": {"fast": 10, "slow": 30},
+        "commission": CommissionModel(),
+        "slippage": SlippageModel(bps=1.0),
+    }
+    k = run_key(**base)
+    assert k == run_key(**{**base, "params": {"slow": 30, "fast": 10}})
+    assert k != run_key(**{**base, "slippage": SlippageModel(bps=2.0)})
+    assert k != run_key(**base, engine_version="0.0.0")
+
+
+def test_get_or_run_hits_cache(tmp_path):
+    cache = RunCache(tmp_path)
+    calls = []
+
+    def run():
+        calls.append(1)
+        return make_run()
+
+    first = cache.get_or_run("k1", run)
+    second = cache.get_or_run("k1", run)
+    assert len(calls) == 1
+    assert second.metrics == first.metrics
+    pd.testing.assert_frame_equal(
+        second.equity_curve, first.equity_curve, check_freq=False
+    )
+    assert np.array_equal(second.trades["qty"], first.trades["qty"])
+
+
+def test_lru_eviction_by_size(tmp_path):
+    cache = RunCache(tmp_path, max_bytes=1 << 40)
+    for k in ("a", "b", "c"):
+        cache.put(k, *vars(make_run()).values())
+        time.sleep(0.01)
+    one = cache.size_bytes() // 3
+
+    cache.get("a")  # a becomes most recently used
+    cache.max_bytes = 2 * one + one // 2
+    cache.evict()
+    assert "a" in cache and "c" in cache and "b" not in cache
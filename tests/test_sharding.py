@@ -0,0 +1,101 @@
+import heapq
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtester.core.config import parse_run_plan
+from backtester.core.event_queue import EventQueue
+from backtester.core.sharding import run_sharded, shard_symbols
+from backtester.data.bar_store import Bars, BarStore
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+from backtester.strategy.router import StrategyRouter
+
+SYMBOLS = ["AAA", "BBB", "CCC", "DDD", "EEE"]
+CASH = 100_000.0
+
+
+@pytest.fixture
+def plan(tmp_path):
+    store = BarStore(tmp_path / "bars")
+    for k, sym in enumerate(SYMBOLS):
+        rng = np.random.default_rng(k)
+        n = 300 + 40 * k
+        close = 50.0 * np.cumprod(1.0 + rng.normal(0, 4e-3, n))
+        # staggered starts and gaps, so sleeves have different timestamps
+        steps = np.cumsum(rng.integers(1, 3, n))
+        ts = np.datetime64("2024-01-02T09:30", "ns") + (steps + 7 * k) * np.timedelta64(
+            1, "m"
+        )
+        store.put(Bars(sym, ts.view(np.int64), close, close, close, close, np.ones(n)))
+    return parse_run_plan(
+        {
+            "data": {"source": "store", "path": str(tmp_path / "bars")},
+            "universe": SYMBOLS,
+            "strategy": {"params": {"fast": 5, "slow": 20}},
+            "portfolio": {"starting_cash": CASH},
+        }
+    )
+
+
+def test_shard_symbols():
+    assert shard_symbols(SYMBOLS, 2) == [("AAA", "CCC", "EEE"), ("BBB", "DDD")]
+    assert len(shard_symbols(SYMBOLS, 10)) == 5
+    with pytest.raises(ValueError):
+        shard_symbols(SYMBOLS, 0)
+
+
+def test_result_is_identical_for_any_worker_count(plan):
+    base = run_sharded(plan, workers=1)
+    assert len(base.fills["ts"]) > 0
+    for workers in (2, 3):
+        other = run_sharded(plan, workers=workers)
+        np.testing.assert_array_equal(other.ts, base.ts)
+        np.testing.assert_array_equal(other.equity, base.equity)
+        np.testing.assert_array_equal(other.cash, base.cash)
+        for k in base.fills:
+            np.testing.assert_array_equal(other.fills[k], base.fills[k])
+
+
+def test_matches_single_event_loop_with_isolated_sleeves(plan):
+    # reference: one process, one merged feed, one isolated sleeve per symbol
+    router = StrategyRouter()
+    portfolios = {}
+    for sym in SYMBOLS:
+        events = EventQueue()
+        portfolios[sym] = Portfolio(
+            events=events, starting_cash=CASH, target_qty=100.0, max_qty=200.0
+        )
+        router.add_isolated(
+            sym,
+            MovingAverageCrossStrategy(events=events, symbol=sym, fast=5, slow=20),
+            portfolios[sym],
+            ExecutionHandler(events=events),
+        )
+    store = BarStore(plan.data.path)
+    router.run(
+        heapq.merge(
+            *(store.get(s).market_events() for s in SYMBOLS), key=lambda e: e.ts
+        )
+    )
+
+    run = run_sharded(plan, workers=2)
+    curves = []
+    for sym in SYMBOLS:
+        ref = portfolios[sym].equity_curve_df()
+        sleeve = run.sleeves[sym]
+        np.testing.assert_array_equal(sleeve.equity, ref["equity"].to_numpy())
+        curves.append(ref["equity"].rename(sym))
+
+    total = pd.concat(curves, axis=1, sort=True).ffill().fillna(CASH).sum(axis=1)
+    np.testing.assert_allclose(run.equity, total.to_numpy())
+    np.testing.assert_array_equal(
+        run.equity_curve_df().index.as_unit("ns").asi8, total.index.as_unit("ns").asi8
+    )
+
+    ledger = run.ledger()
+    assert len(ledger) == sum(len(p.ledger) for p in portfolios.values())
+    assert np.all(np.diff(run.fills["ts"]) >= 0)
+    assert ledger.symbols == SYMBOLS
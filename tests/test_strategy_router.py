@@ -0,0 +1,77 @@
+import math
+from datetime import datetime, timedelta
+
+from backtester.core.engine import BacktestEngine
+from backtester.core.event_queue import EventQueue
+from backtester.events import MarketEvent
+from backtester.execution.execution_handler import ExecutionHandler
+from backtester.portfolio.portfolio import Portfolio
+from backtester.strategy.moving_average_crossover import MovingAverageCrossStrategy
+from backtester.strategy.router import StrategyRouter
+
+
+def make_bars(symbols=("SPY", "QQQ"), n=200):
+    t0 = datetime(2024, 1, 2, 9, 30)
+    out = []
+    for i in range(n):
+        ts = (t0 + timedelta(minutes=i)).isoformat()
+        for k, sym in enumerate(symbols):
+            px = 100.0 + 5.0 * math.sin(i / (7.0 + k))
+            out.append(MarketEvent(ts, sym, px, px + 0.5, px - 0.5, px, 1000.0))
+    return out
+
+
+def single_run(bars, symbol, fast, slow):
+    events = EventQueue()
+    strategy = MovingAverageCrossStrategy(
+        events=events, symbol=symbol, fast=fast, slow=slow
+    )
+    portfolio = Portfolio(events=events)
+    engine = BacktestEngine(
+        events, strategy, portfolio, ExecutionHandler(events=events)
+    )
+    engine.run(b for b in bars if b.symbol == symbol)
+    return portfolio
+
+
+def test_isolated_sleeves_match_single_strategy_runs():
+    bars = make_bars()
+    router = StrategyRouter()
+    params = [("SPY", 5, 20), ("SPY", 10, 30), ("QQQ", 5, 20)]
+    for i, (sym, fast, slow) in enumerate(params):
+        q = EventQueue()
+        router.add_isolated(
+            f"s{i}",
+            MovingAverageCrossStrategy(events=q, symbol=sym, fast=fast, slow=slow),
+            Portfolio(events=q),
+            ExecutionHandler(events=q),
+        )
+
+    assert router.run(bars) == len(bars)
+
+    for i, (sym, fast, slow) in enumerate(params):
+        expected = single_run(bars, sym, fast, slow)
+        got = router.sleeves[f"s{i}"].portfolio
+        assert got.history == expected.history
+        assert got.cash == expected.cash
+
+
+def test_netting_only_dispatches_subscribed_symbols():
+    seen = []
+
+    class Recorder(MovingAverageCrossStrategy):
+        def on_market(self, event):
+            seen.append(event.symbol)
+
+    router = StrategyRouter(portfolio=Portfolio(events=EventQueue()), execution=None)
+    assert router.engine is None
+
+    events = EventQueue()
+    router = StrategyRouter(
+        events, Portfolio(events=events), ExecutionHandler(events=events)
+    )
+    router.subscribe(Recorder(events=events, symbol="QQQ"))
+    router.run(make_bars(n=10))
+
+    assert seen == ["QQQ"] * 10
+    assert len(router.engine.portfolio.history) == 20
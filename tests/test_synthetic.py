@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from backtester.core.config import parse_run_plan
+from backtester.data.bar_store import BarStore
+from backtester.data.synthetic import (
+    BLOCK,
+    SyntheticSpec,
+    generate_bars,
+    iter_blocks,
+    synthetic_universe,
+    write_store,
+)
+
+
+def test_bars_are_seeded_and_well_formed():
+    a = generate_bars("AAA", 50_000, seed=1)
+    assert a.fingerprint() == generate_bars("AAA", 50_000, seed=1).fingerprint()
+    assert a.fingerprint() != generate_bars("AAA", 50_000, seed=2).fingerprint()
+    assert a.fingerprint() != generate_bars("BBB", 50_000, seed=1).fingerprint()
+
+    assert (np.diff(a.ts) == 60_000_000_000).all()
+    assert a.open[0] == 100.0 and (a.open[1:] == a.close[:-1]).all()
+    assert (a.high >= np.maximum(a.open, a.close)).all()
+    assert (0 < a.low).all() and (a.low <= np.minimum(a.open, a.close)).all()
+    assert (a.volume >= 0).all() and 9_000 < a.volume.mean() < 11_000
+
+    # a prefix of a longer series is the shorter series
+    head = generate_bars("AAA", 1_000, seed=1)
+    assert np.array_equal(head.close, a.close[:1_000])
+
+    with pytest.raises(ValueError):
+        SyntheticSpec(sigma=-0.1)
+
+
+def kurtosis(x):
+    return ((x - x.mean()) ** 4).mean() / x.var() ** 2
+
+
+def test_volatility_and_jumps():
+    spec = SyntheticSpec(sigma=0.3)
+    r = np.diff(np.log(generate_bars("AAA", 200_000, spec).close))
+    assert np.isclose(r.std() * np.sqrt(spec.bars_per_year), 0.3, rtol=0.02)
+
+    jumpy = SyntheticSpec(sigma=0.3, jump_intensity=500.0, jump_std=0.01)
+    rj = np.diff(np.log(generate_bars("AAA", 200_000, jumpy).close))
+    assert kurtosis(r) < 3.2 and kurtosis(rj) > 5.0
+
+
+def test_store_matches_in_memory_across_blocks(tmp_path):
+    n = BLOCK + 1_234
+    assert [len(b) for b in iter_blocks("AAA", n)] == [BLOCK, 1_234]
+    store = write_store(tmp_path, ["AAA"], n, seed=7)
+    assert (
+        store.get("AAA").fingerprint() == generate_bars("AAA", n, seed=7).fingerprint()
+    )
+
+
+def test_synthetic_store_drives_a_run(tmp_path):
+    symbols = synthetic_universe(3)
+    assert symbols == ["SYN0", "SYN1", "SYN2"]
+    write_store(tmp_path, symbols, 2_000)
+    assert all(len(BarStore(tmp_path).get(s)) == 2_000 for s in symbols)
+
+    plan = parse_run_plan(
+        {
+            "data": {"source": "store", "path": str(tmp_path)},
+            "universe": symbols,
+            "strategy": {"params": {"fast": 5, "slow": 20}},
+        }
+    )
+    engine = plan.build()
+    engine.run(plan.market_events())
+    assert engine.bars_seen == 3 * 2_000
+    assert len(engine.portfolio.ledger) > 0